@@ -2,11 +2,27 @@ from .chat_exporter import (
     AttachmentHandler,
     AttachmentToDiscordChannelHandler,
     AttachmentToLocalFileHostHandler,
+    BatchExport,
+    CacheInfo,
+    FileSink,
+    FragmentCache,
+    HTTPClient,
+    MemoryFragmentCache,
+    PersistentCache,
+    SQLiteFragmentCache,
+    StreamSink,
+    TranscriptSink,
+    cache_info,
     export,
+    export_guild,
+    export_many,
+    export_stream,
+    export_to,
     link,
     quick_export,
     quick_link,
     raw_export,
+    use_persistent_cache,
 )
 
 __version__ = "2.9.3"
@@ -1,15 +1,33 @@
 import discord
 
+import asyncio
 import datetime
 import io
+import os
+import pathlib
 
-from typing import List, Optional
+from typing import IO, AsyncIterator, Iterable, List, Optional, Union
 
 from .construct import (
     AttachmentHandler,
     AttachmentToDiscordChannelHandler,
     AttachmentToLocalFileHostHandler,
+    BatchExport,
+    FileSink,
+    FragmentCache,
+    MemoryFragmentCache,
+    SQLiteFragmentCache,
+    StreamSink,
     Transcript,
+    TranscriptSink,
+    export_transcripts,
+)
+from .ext import (
+    CacheInfo,
+    HTTPClient,
+    PersistentCache,
+    cache_info,
+    use_persistent_cache,
 )
 
 
@@ -33,6 +51,7 @@ async def quick_export(
         The Message of the Export if Successful
     """
 
+    buffer = io.BytesIO()
     transcript = (
         await Transcript(
             channel=channel,
@@ -43,10 +62,11 @@ async def quick_export(
             after=None,
             bot=bot,
             attachment_handler=None,
-        ).export()
+        ).export_to(FileSink(buffer))
     )
     if not transcript:
         return
+    buffer.seek(0)
 
     if isinstance(channel, (discord.Thread, discord.abc.GuildChannel)):
         channel_name = channel.name
@@ -59,9 +79,7 @@ async def quick_export(
     )
 
     transcript_file = discord.File(
-        io.BytesIO(
-            transcript.html.encode(),
-        ), filename=f"transcript-{channel_name}.html",
+        buffer, filename=f"transcript-{channel_name}.html",
     )
     return await channel.send(embed=transcript_embed, file=transcript_file)
 
@@ -74,6 +92,15 @@ async def export(
     before: Optional[datetime.datetime] = None,
     after: Optional[datetime.datetime] = None,
     attachment_handler: Optional[AttachmentHandler] = None,
+    pipeline: bool = False,
+    partitions: int = 1,
+    partition_concurrency: int = 4,
+    checkpoint: Optional[Union[str, pathlib.Path]] = None,
+    checkpoint_interval: int = 1000,
+    render_concurrency: int = 1,
+    render_processes: int = 0,
+    fragment_cache: Optional[FragmentCache] = None,
+    http_client: Optional[HTTPClient] = None,
 ) -> Optional[str]:
     """
     Creates a Custom Export of the Channel
@@ -94,6 +121,28 @@ async def export(
         The Time to Capture Messages After
     attachment_handler: Optional[:class:`AttachmentHandler`]
         The Attachment Handler to Use
+    pipeline: :class:`bool`
+        Whether to Render Messages While the History is Still Being Fetched
+    partitions: :class:`int`
+        The Number of Time Slices to Fetch the History In (Ignored if `limit` is Set)
+    partition_concurrency: :class:`int`
+        The Maximum Number of Time Slices Fetched at Once
+    checkpoint: Optional[Union[:class:`str`, :class:`pathlib.Path`]]
+        The File to Persist Progress To, so Later Exports Only Render New Messages
+    checkpoint_interval: :class:`int`
+        The Number of Messages Between Saving the Checkpoint
+    render_concurrency: :class:`int`
+        The Maximum Number of Messages Rendered at Once (e.g. While Fetching Members,
+        References or Attachments) - the Output is Identical Regardless
+    render_processes: :class:`int`
+        The Number of Worker Processes to Render Message Content & Embeds In, for Large
+        CPU-Bound Exports (0 Renders Everything in this Process) - the Output is Identical Regardless
+    fragment_cache: Optional[:class:`FragmentCache`]
+        A Cache of Rendered Message Bodies (e.g. :class:`SQLiteFragmentCache`), so Messages
+        Unchanged Since an Earlier Export Aren't Rendered Again
+    http_client: Optional[:class:`HTTPClient`]
+        The Pooled Client the Exporter's Own Requests are Made With (e.g. Emoji Checks Without
+        the Bundled Index), Kept Alive Until the Export is Done
 
     Returns
     -------
@@ -110,6 +159,15 @@ async def export(
         after=after,
         bot=bot,
         attachment_handler=attachment_handler,
+        pipeline=pipeline,
+        partitions=partitions,
+        partition_concurrency=partition_concurrency,
+        checkpoint=checkpoint,
+        checkpoint_interval=checkpoint_interval,
+        render_concurrency=render_concurrency,
+        render_processes=render_processes,
+        fragment_cache=fragment_cache,
+        http_client=http_client,
     ).export()
     if not transcript:
         return
@@ -117,6 +175,359 @@ async def export(
     return transcript.html
 
 
+async def export_to(
+    channel: discord.abc.Messageable,
+    fp: Union[str, "os.PathLike[str]", IO[bytes], TranscriptSink],
+    limit: Optional[int] = None,
+    bot: Optional[discord.Client] = None,
+    military_time: bool = True,
+    before: Optional[datetime.datetime] = None,
+    after: Optional[datetime.datetime] = None,
+    attachment_handler: Optional[AttachmentHandler] = None,
+    pipeline: bool = False,
+    partitions: int = 1,
+    partition_concurrency: int = 4,
+    checkpoint: Optional[Union[str, pathlib.Path]] = None,
+    checkpoint_interval: int = 1000,
+    render_concurrency: int = 1,
+    render_processes: int = 0,
+    fragment_cache: Optional[FragmentCache] = None,
+    http_client: Optional[HTTPClient] = None,
+) -> bool:
+    """
+    Creates a Custom Export of the Channel, Streaming it to a File as it's Rendered
+
+    Only the Messages Waiting to be Rendered are Held in Memory (Not the Whole Document)
+    when `pipeline` is Enabled, & No Checkpoint is Used.
+
+    Parameters
+    ----------
+    channel: :class:`discord.abc.Messageable`
+        The Channel to Export
+    fp: Union[:class:`str`, :class:`os.PathLike`, IO[:class:`bytes`], :class:`TranscriptSink`]
+        The Path to Write the Export To, a Binary File Object, or a Custom Sink
+    limit: Optional[:class:`int`]
+        The Limit of Messages to Capture
+    bot: Optional[:class:`discord.Client`]
+        The Bot Instance to Use for Fetching
+    military_time: Optional[:class:`bool`]
+        Whether to Use Military Time
+    before: Optional[:class:`datetime.datetime`]
+        The Time to Capture Messages Before
+    after: Optional[:class:`datetime.datetime`]
+        The Time to Capture Messages After
+    attachment_handler: Optional[:class:`AttachmentHandler`]
+        The Attachment Handler to Use
+    pipeline: :class:`bool`
+        Whether to Render Messages While the History is Still Being Fetched
+    partitions: :class:`int`
+        The Number of Time Slices to Fetch the History In (Ignored if `limit` is Set)
+    partition_concurrency: :class:`int`
+        The Maximum Number of Time Slices Fetched at Once
+    checkpoint: Optional[Union[:class:`str`, :class:`pathlib.Path`]]
+        The File to Persist Progress To, so Later Exports Only Render New Messages
+    checkpoint_interval: :class:`int`
+        The Number of Messages Between Saving the Checkpoint
+    render_concurrency: :class:`int`
+        The Maximum Number of Messages Rendered at Once (e.g. While Fetching Members,
+        References or Attachments) - the Output is Identical Regardless
+    render_processes: :class:`int`
+        The Number of Worker Processes to Render Message Content & Embeds In, for Large
+        CPU-Bound Exports (0 Renders Everything in this Process) - the Output is Identical Regardless
+    fragment_cache: Optional[:class:`FragmentCache`]
+        A Cache of Rendered Message Bodies (e.g. :class:`SQLiteFragmentCache`), so Messages
+        Unchanged Since an Earlier Export Aren't Rendered Again
+    http_client: Optional[:class:`HTTPClient`]
+        The Pooled Client the Exporter's Own Requests are Made With (e.g. Emoji Checks Without
+        the Bundled Index), Kept Alive Until the Export is Done
+
+    Returns
+    -------
+    :class:`bool`
+        Whether the Export was Successful
+    """
+
+    sink = fp if isinstance(fp, TranscriptSink) else FileSink(fp)
+
+    transcript = await Transcript(
+        channel=channel,
+        limit=limit,
+        messages=None,
+        military_time=military_time,
+        before=before,
+        after=after,
+        bot=bot,
+        attachment_handler=attachment_handler,
+        pipeline=pipeline,
+        partitions=partitions,
+        partition_concurrency=partition_concurrency,
+        checkpoint=checkpoint,
+        checkpoint_interval=checkpoint_interval,
+        render_concurrency=render_concurrency,
+        render_processes=render_processes,
+        fragment_cache=fragment_cache,
+        http_client=http_client,
+    ).export_to(sink)
+    return transcript is not None
+
+
+async def export_stream(
+    channel: discord.abc.Messageable,
+    limit: Optional[int] = None,
+    bot: Optional[discord.Client] = None,
+    military_time: bool = True,
+    before: Optional[datetime.datetime] = None,
+    after: Optional[datetime.datetime] = None,
+    attachment_handler: Optional[AttachmentHandler] = None,
+    pipeline: bool = True,
+    partitions: int = 1,
+    partition_concurrency: int = 4,
+    render_concurrency: int = 1,
+    render_processes: int = 0,
+    fragment_cache: Optional[FragmentCache] = None,
+    chunk_size: int = 65536,
+    http_client: Optional[HTTPClient] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Creates a Custom Export of the Channel as an Async Iterator of Bytes, e.g. for a
+    Streaming HTTP Response
+
+    Rendering Pauses While the Consumer Falls Behind, & Stops if it Stops Iterating.
+
+    Parameters
+    ----------
+    channel: :class:`discord.abc.Messageable`
+        The Channel to Export
+    limit: Optional[:class:`int`]
+        The Limit of Messages to Capture
+    bot: Optional[:class:`discord.Client`]
+        The Bot Instance to Use for Fetching
+    military_time: Optional[:class:`bool`]
+        Whether to Use Military Time
+    before: Optional[:class:`datetime.datetime`]
+        The Time to Capture Messages Before
+    after: Optional[:class:`datetime.datetime`]
+        The Time to Capture Messages After
+    attachment_handler: Optional[:class:`AttachmentHandler`]
+        The Attachment Handler to Use
+    pipeline: :class:`bool`
+        Whether to Render Messages While the History is Still Being Fetched
+    partitions: :class:`int`
+        The Number of Time Slices to Fetch the History In (Ignored if `limit` is Set)
+    partition_concurrency: :class:`int`
+        The Maximum Number of Time Slices Fetched at Once
+    render_concurrency: :class:`int`
+        The Maximum Number of Messages Rendered at Once (e.g. While Fetching Members,
+        References or Attachments) - the Output is Identical Regardless
+    render_processes: :class:`int`
+        The Number of Worker Processes to Render Message Content & Embeds In, for Large
+        CPU-Bound Exports (0 Renders Everything in this Process) - the Output is Identical Regardless
+    fragment_cache: Optional[:class:`FragmentCache`]
+        A Cache of Rendered Message Bodies (e.g. :class:`SQLiteFragmentCache`), so Messages
+        Unchanged Since an Earlier Export Aren't Rendered Again
+    chunk_size: :class:`int`
+        The Number of Bytes Buffered Before Each Chunk is Yielded
+    http_client: Optional[:class:`HTTPClient`]
+        The Pooled Client the Exporter's Own Requests are Made With (e.g. Emoji Checks Without
+        the Bundled Index), Kept Alive Until the Export is Done
+
+    Yields
+    ------
+    :class:`bytes`
+        The Next Chunk of the Export's HTML
+
+    Raises
+    ------
+    :class:`Exception`
+        The Error the Export Failed With (Also Printed to the Console)
+    """
+
+    sink = StreamSink(chunk_size)
+    task = asyncio.ensure_future(
+        Transcript(
+            channel=channel,
+            limit=limit,
+            messages=None,
+            military_time=military_time,
+            before=before,
+            after=after,
+            bot=bot,
+            attachment_handler=attachment_handler,
+            pipeline=pipeline,
+            partitions=partitions,
+            partition_concurrency=partition_concurrency,
+            render_concurrency=render_concurrency,
+            render_processes=render_processes,
+            fragment_cache=fragment_cache,
+            http_client=http_client,
+        ).export_to(sink),
+    )
+
+    try:
+        async for chunk in sink:
+            yield chunk
+    finally:
+        if not task.done():
+            task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+
+async def export_many(
+    channels: Iterable[Union[discord.abc.Messageable, discord.ForumChannel]],
+    concurrency: int = 4,
+    limit: Optional[int] = None,
+    bot: Optional[discord.Client] = None,
+    military_time: bool = True,
+    before: Optional[datetime.datetime] = None,
+    after: Optional[datetime.datetime] = None,
+    attachment_handler: Optional[AttachmentHandler] = None,
+    pipeline: bool = False,
+    partitions: int = 1,
+    partition_concurrency: int = 4,
+    checkpoint_dir: Optional[Union[str, pathlib.Path]] = None,
+    include_threads: bool = False,
+    thread_concurrency: int = 4,
+    render_concurrency: int = 1,
+    render_processes: int = 0,
+    fragment_cache: Optional[FragmentCache] = None,
+    http_client: Optional[HTTPClient] = None,
+) -> BatchExport:
+    """
+    Creates Custom Exports of Several Channels Concurrently
+
+    Member, Sticker & Emoji Lookups are Shared Between All the Exports, & are Only
+    Cleared Once Every Channel is Done.
+
+    Parameters
+    ----------
+    channels: Iterable[Union[:class:`discord.abc.Messageable`, :class:`discord.ForumChannel`]]
+        The Channels to Export
+    concurrency: :class:`int`
+        The Maximum Number of Channels Exported at Once
+    limit: Optional[:class:`int`]
+        The Limit of Messages to Capture per Channel
+    bot: Optional[:class:`discord.Client`]
+        The Bot Instance to Use for Fetching
+    military_time: Optional[:class:`bool`]
+        Whether to Use Military Time
+    before: Optional[:class:`datetime.datetime`]
+        The Time to Capture Messages Before
+    after: Optional[:class:`datetime.datetime`]
+        The Time to Capture Messages After
+    attachment_handler: Optional[:class:`AttachmentHandler`]
+        The Attachment Handler to Use
+    pipeline: :class:`bool`
+        Whether to Render Messages While the History is Still Being Fetched
+    partitions: :class:`int`
+        The Number of Time Slices to Fetch Each History In (Ignored if `limit` is Set)
+    partition_concurrency: :class:`int`
+        The Maximum Number of Time Slices Fetched at Once per Channel
+    checkpoint_dir: Optional[Union[:class:`str`, :class:`pathlib.Path`]]
+        The Directory to Persist Each Channel's Checkpoint To (as `<channel_id>.json`)
+    include_threads: :class:`bool`
+        Whether to Also Export the Active & Archived Threads of Each Channel (Linked from
+        the Channel's Transcript as `transcript-<thread_id>.html`)
+    thread_concurrency: :class:`int`
+        The Maximum Number of Threads Exported at Once per Channel
+    render_concurrency: :class:`int`
+        The Maximum Number of Messages Rendered at Once (e.g. While Fetching Members,
+        References or Attachments) - the Output is Identical Regardless
+    render_processes: :class:`int`
+        The Number of Worker Processes Each Channel Renders Message Content & Embeds In, for
+        Large CPU-Bound Exports (0 Renders Everything in this Process) - the Output is Identical Regardless
+    fragment_cache: Optional[:class:`FragmentCache`]
+        A Cache of Rendered Message Bodies (e.g. :class:`SQLiteFragmentCache`), so Messages
+        Unchanged Since an Earlier Export Aren't Rendered Again
+    http_client: Optional[:class:`HTTPClient`]
+        The Pooled Client the Exporter's Own Requests are Made With (e.g. Emoji Checks Without
+        the Bundled Index), Kept Alive Until the Export is Done
+
+    Returns
+    -------
+    :class:`BatchExport`
+        The Transcripts by Channel (or Thread) ID, & the Errors of Those that Failed
+    """
+
+    if isinstance(checkpoint_dir, str):
+        checkpoint_dir = pathlib.Path(checkpoint_dir)
+
+    transcripts = [
+        Transcript(
+            channel=channel,  # type: ignore
+            limit=limit,
+            messages=None,
+            military_time=military_time,
+            before=before,
+            after=after,
+            bot=bot,
+            attachment_handler=attachment_handler,
+            pipeline=pipeline,
+            partitions=partitions,
+            partition_concurrency=partition_concurrency,
+            checkpoint=(
+                checkpoint_dir / f"{channel.id}.json"  # type: ignore
+                if checkpoint_dir else None
+            ),
+            shared_cache=True,
+            include_threads=include_threads,
+            thread_concurrency=thread_concurrency,
+            render_concurrency=render_concurrency,
+            render_processes=render_processes,
+            fragment_cache=fragment_cache,
+            http_client=http_client,
+        )
+        for channel in channels
+    ]
+    return await export_transcripts(transcripts, concurrency)
+
+
+async def export_guild(
+    guild: discord.Guild,
+    concurrency: int = 4,
+    **kwargs,
+) -> BatchExport:
+    """
+    Creates Custom Exports of Every Channel in the Guild the Bot Can Read
+
+    Parameters
+    ----------
+    guild: :class:`discord.Guild`
+        The Guild to Export
+    concurrency: :class:`int`
+        The Maximum Number of Channels Exported at Once
+    **kwargs
+        Any Other Keyword Argument of :func:`export_many`
+
+    Returns
+    -------
+    :class:`BatchExport`
+        The Transcripts by Channel ID, & the Errors of the Channels that Failed
+    """
+
+    include_threads = kwargs.get("include_threads", False)
+
+    channels: List[Union[discord.abc.Messageable, discord.ForumChannel]] = []
+    for channel in guild.channels:
+        if isinstance(channel, discord.ForumChannel):
+            # Forums Only Have Posts (Threads) to Export
+            if not include_threads:
+                continue
+        elif not isinstance(channel, discord.abc.Messageable):
+            continue
+
+        if guild.me:
+            permissions = channel.permissions_for(guild.me)
+            if not (permissions.read_messages and permissions.read_message_history):
+                continue
+
+        channels.append(channel)
+
+    return await export_many(channels, concurrency, **kwargs)
+
+
 async def raw_export(
     channel: discord.abc.Messageable,
     messages: List[discord.Message],
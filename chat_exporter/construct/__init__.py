@@ -4,5 +4,23 @@ from .attachment_handler import (
     AttachmentToDiscordChannelHandler,
     AttachmentToLocalFileHostHandler,
 )
-from .message import gather_messages
-from .transcript import Transcript
+from .batch import BatchExport, export_transcripts
+from .checkpoint import ExportCheckpoint
+from .fragment_cache import (
+    CachedBody,
+    FragmentCache,
+    MemoryFragmentCache,
+    SQLiteFragmentCache,
+    fragment_key,
+)
+from .history import partitioned_history
+from .message import gather_messages, stream_messages
+from .render_pool import (
+    GuildSnapshot,
+    RenderJob,
+    RenderPool,
+    RenderedBody,
+    render_content,
+)
+from .sink import FileSink, StreamSink, TranscriptSink
+from .transcript import Transcript, TranscriptDAO
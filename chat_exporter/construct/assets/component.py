@@ -1,10 +1,11 @@
 import discord
 
-from typing import List, Optional
+from typing import Iterator, List, Optional, Sequence
 
 from ...ext import (
     DiscordIcons,
     ParseMode,
+    RenderContext,
     component_button,
     component_menu,
     component_menu_options,
@@ -28,21 +29,53 @@ class Component:
         discord.ButtonStyle.red: "#D83C3E",
         discord.ButtonStyle.link: "#4F545C",
     }
-    MENU_DIV_ID = 0
 
     @staticmethod
-    async def flow(guild: Optional[discord.Guild], *, component: discord.Component) -> str:
+    def reserve_menu_div_ids(components: Sequence[discord.Component]) -> range:
+        """
+        Reserves the IDs of the Select Menus Up-Front, so they Follow the Order of the
+        Messages Even when Several are Rendered at Once
+
+        Parameters
+        ----------
+        components: Sequence[:class:`discord.Component`]
+            The Components of the Message
+
+        Returns
+        -------
+        :class:`range`
+            The Reserved IDs
+        """
+
+        count = 0
+        for component in components:
+            is_row = isinstance(component, discord.ActionRow)
+            children = component.children if is_row else [component]
+            count += sum(isinstance(c, discord.SelectMenu) for c in children)
+
+        context = RenderContext.current()
+        first = context.menu_div_id + 1
+        context.menu_div_id += count
+        return range(first, first + count)
+
+    @staticmethod
+    async def flow(
+        guild: Optional[discord.Guild],
+        *,
+        component: discord.Component,
+        menu_div_ids: Optional[Iterator[int]] = None,
+    ) -> str:
         if isinstance(component, discord.ActionRow):
-            buttons = ""
-            menus = ""
+            buttons: List[str] = []
+            menus: List[str] = []
 
             for c in component.children:
                 if isinstance(c, discord.Button):
-                    buttons += await Component.flow(guild, component=c)
+                    buttons.append(await Component.flow(guild, component=c))
                 elif isinstance(c, discord.SelectMenu):
-                    menus += await Component.flow(guild, component=c)
+                    menus.append(await Component.flow(guild, component=c, menu_div_ids=menu_div_ids))
 
-            return f'<div class="chatlog__components">{buttons}{menus}</div>'
+            return f'<div class="chatlog__components">{"".join(buttons)}{"".join(menus)}</div>'
 
         elif isinstance(component, discord.Button):
             if component.url:
@@ -72,7 +105,12 @@ class Component:
             )
 
         elif isinstance(component, discord.SelectMenu):
-            Component.MENU_DIV_ID += 1
+            if menu_div_ids is None:
+                context = RenderContext.current()
+                context.menu_div_id += 1
+                menu_div_id = context.menu_div_id
+            else:
+                menu_div_id = next(menu_div_ids)
 
             disabled = "chatlog__component-disabled" if component.disabled else ""
             placeholder = component.placeholder or ""
@@ -109,11 +147,11 @@ class Component:
                         )
 
                 if contents:
-                    content = f'<div id="dropdownMenu{Component.MENU_DIV_ID}" class="dropdownContent">{"".join(contents)}</div>'
+                    content = f'<div id="dropdownMenu{menu_div_id}" class="dropdownContent">{"".join(contents)}</div>'
 
             return await fill_out(
                 guild, component_menu, [
-                    ("ID", str(Component.MENU_DIV_ID), ParseMode.NONE),
+                    ("ID", str(menu_div_id), ParseMode.NONE),
                     ("DISABLED", disabled, ParseMode.NONE),
                     ("PLACEHOLDER", placeholder, ParseMode.MARKDOWN),
                     ("CONTENT", content, ParseMode.NONE),
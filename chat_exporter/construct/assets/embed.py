@@ -1,11 +1,14 @@
 import discord
 
+import hashlib
 import html
+import json
 
-from typing import Optional
+from typing import List, Optional
 
 from ...ext import (
     ParseMode,
+    RenderContext,
     embed_author,
     embed_author_icon,
     embed_body,
@@ -24,8 +27,32 @@ from ...ext import (
 class Embed:
     """The Embed Converter"""
 
+    # Identical Embeds (e.g. Posted by Ticket or Moderation Bots) are Only Rendered Once per Export
+    RENDERED_MAXSIZE = 1024
+
     @staticmethod
     async def flow(guild: Optional[discord.Guild], *, embed: discord.Embed) -> str:
+        content = json.dumps(
+            [getattr(guild, "id", None), embed.to_dict()], sort_keys=True, default=str,
+        )
+        key = hashlib.sha1(content.encode()).hexdigest()
+        embeds = RenderContext.current().embeds
+
+        try:
+            rendered = embeds[key]
+        except KeyError:
+            pass
+        else:
+            embeds.move_to_end(key)
+            return rendered
+
+        rendered = embeds[key] = await Embed.render(guild, embed=embed)
+        if len(embeds) > Embed.RENDERED_MAXSIZE:
+            embeds.popitem(last=False)
+        return rendered
+
+    @staticmethod
+    async def render(guild: Optional[discord.Guild], *, embed: discord.Embed) -> str:
         if embed.colour:
             r, g, b = embed.colour.to_rgb()
         else:
@@ -47,24 +74,29 @@ class Embed:
                 ],
             )
 
-        fields = ""
+        field_parts: List[str] = []
         for field in embed.fields:
             name = html.escape(field.name)  # type: ignore
             value = html.escape(field.value)  # type: ignore
             if field.inline:
-                fields += await fill_out(
-                    guild, embed_field_inline, [
-                        ("FIELD_NAME", name, ParseMode.SPECIAL_EMBED),
-                        ("FIELD_VALUE", value, ParseMode.EMBED),
-                    ],
+                field_parts.append(
+                    await fill_out(
+                        guild, embed_field_inline, [
+                            ("FIELD_NAME", name, ParseMode.SPECIAL_EMBED),
+                            ("FIELD_VALUE", value, ParseMode.EMBED),
+                        ],
+                    ),
                 )
             else:
-                fields += await fill_out(
-                    guild, embed_field, [
-                        ("FIELD_NAME", name, ParseMode.SPECIAL_EMBED),
-                        ("FIELD_VALUE", value, ParseMode.EMBED),
-                    ],
+                field_parts.append(
+                    await fill_out(
+                        guild, embed_field, [
+                            ("FIELD_NAME", name, ParseMode.SPECIAL_EMBED),
+                            ("FIELD_VALUE", value, ParseMode.EMBED),
+                        ],
+                    ),
                 )
+        fields = "".join(field_parts)
 
         author = html.escape(
             embed.author.name,
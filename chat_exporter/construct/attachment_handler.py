@@ -1,14 +1,52 @@
 import discord
 
+import aiohttp
+import asyncio
+import io
 import pathlib
+import types
 import urllib.parse
 
-from typing import Union
+from typing import Dict, Optional, Tuple, Type, Union
+
+from ..ext import HTTPClient
+
+# The Errors discord.py Raises for a Failed Download, by Status
+_DOWNLOAD_ERRORS: Dict[int, Tuple[Type[discord.HTTPException], str]] = {
+    404: (discord.NotFound, "asset not found"),
+    403: (discord.Forbidden, "cannot retrieve asset"),
+}
+_DOWNLOAD_ERROR: Tuple[Type[discord.HTTPException], str] = (
+    discord.HTTPException, "failed to get asset",
+)
+
+
+async def _download(http_client: HTTPClient, url: str) -> bytes:
+    # Failures are Raised as discord.py Raises them, so Callers Only Handle discord.HTTPException
+    try:
+        return await http_client.read(url)
+    except aiohttp.ClientResponseError as e:
+        error, message = _DOWNLOAD_ERRORS.get(e.status, _DOWNLOAD_ERROR)
+        response = types.SimpleNamespace(status=e.status, reason=e.message)
+        raise error(response, message) from e  # type: ignore
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        error, message = _DOWNLOAD_ERROR
+        response = types.SimpleNamespace(status=0, reason=type(e).__name__)
+        raise error(response, message) from e  # type: ignore
 
 
 class AttachmentHandler:
     """Handles the Saving of Attachments"""
 
+    @property
+    def cache_key(self) -> str:
+        """
+        Identifies Where the Handler Puts Attachments, so Cached Message Bodies are Only Reused
+        with the Same Handler (Subclasses Taking Settings Should Add them)
+        """
+
+        return f"{type(self).__module__}.{type(self).__qualname__}"
+
     async def process_asset(self, attachment: discord.Attachment) -> discord.Attachment:
         """
         Returns the Attachment after Processing
@@ -22,6 +60,8 @@ class AttachmentHandler:
         ------
         :class:`NotImplementedError`
             This Method Must be Implemented in a Subclass
+        :class:`discord.HTTPException`
+            The Attachment Couldn't be Downloaded or Saved (the Only Error Implementations Raise)
 
         Returns
         -------
@@ -35,7 +75,12 @@ class AttachmentHandler:
 class AttachmentToLocalFileHostHandler(AttachmentHandler):
     """Saves the Attachment Locally"""
 
-    def __init__(self, base_path: Union[str, pathlib.Path], url_base: str) -> None:
+    def __init__(
+        self,
+        base_path: Union[str, pathlib.Path],
+        url_base: str,
+        http_client: Optional[HTTPClient] = None,
+    ) -> None:
         """
         Parameters
         ----------
@@ -43,6 +88,8 @@ class AttachmentToLocalFileHostHandler(AttachmentHandler):
             The Base Path to Save the Attachments
         url_base: :class:`str`
             The Base URL to Access the Attachments
+        http_client: Optional[:class:`HTTPClient`]
+            The Client to Download the Attachments With (Otherwise they're Downloaded by discord.py)
         """
 
         if isinstance(base_path, str):
@@ -50,13 +97,21 @@ class AttachmentToLocalFileHostHandler(AttachmentHandler):
 
         self.base_path = base_path
         self.url_base = url_base
+        self.http_client = http_client
+
+    @property
+    def cache_key(self) -> str:
+        return f"{super().cache_key}:{self.base_path}:{self.url_base}"
 
     async def process_asset(self, attachment: discord.Attachment) -> discord.Attachment:
         file_name = urllib.parse.quote_plus(
             f"{attachment.id}_{attachment.filename}", safe="",
         )
         asset_path = self.base_path / file_name
-        await attachment.save(asset_path)
+        if self.http_client is not None:
+            asset_path.write_bytes(await _download(self.http_client, attachment.url))
+        else:
+            await attachment.save(asset_path)
 
         file_url = f"{self.url_base}/{file_name}"
         attachment.url = file_url
@@ -67,19 +122,34 @@ class AttachmentToLocalFileHostHandler(AttachmentHandler):
 class AttachmentToDiscordChannelHandler(AttachmentHandler):
     """Save the Attachment to a Discord Channel"""
 
-    def __init__(self, channel: discord.abc.Messageable) -> None:
+    def __init__(self, channel: discord.abc.Messageable, http_client: Optional[HTTPClient] = None) -> None:
         """
         Parameters
         ----------
         channel: :class:`discord.abc.Messageable`
             The Channel to Save the Attachments
+        http_client: Optional[:class:`HTTPClient`]
+            The Client to Download the Attachments With (Otherwise they're Downloaded by discord.py)
         """
 
         self.channel = channel
+        self.http_client = http_client
+
+    @property
+    def cache_key(self) -> str:
+        return f"{super().cache_key}:{getattr(self.channel, 'id', None)}"
 
     async def process_asset(self, attachment: discord.Attachment) -> discord.Attachment:
         try:
-            file = await attachment.to_file()
+            if self.http_client is not None:
+                file = discord.File(
+                    io.BytesIO(await _download(self.http_client, attachment.url)),
+                    filename=attachment.filename,
+                    spoiler=attachment.is_spoiler(),
+                    description=attachment.description,
+                )
+            else:
+                file = await attachment.to_file()
             message = await self.channel.send(file=file)
         except discord.HTTPException as E:
             raise E
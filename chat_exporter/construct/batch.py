@@ -0,0 +1,73 @@
+import asyncio
+from contextlib import AsyncExitStack
+
+from typing import Any, Dict, List
+
+from .transcript import Transcript, TranscriptDAO
+
+
+class BatchExport:
+    """The Results of Exporting Several Channels at Once"""
+
+    def __init__(self) -> None:
+        self.transcripts: Dict[int, TranscriptDAO] = {}
+        self.failures: Dict[int, Exception] = {}
+
+    @property
+    def results(self) -> Dict[int, str]:
+        """The HTML of Each Successful Export, by Channel ID"""
+
+        return {
+            channel_id: transcript.html
+            for channel_id, transcript in self.transcripts.items()
+        }
+
+
+async def export_transcripts(transcripts: List[Transcript], concurrency: int) -> BatchExport:
+    """
+    Builds the Transcripts Concurrently, Sharing their Caches Until All are Done
+
+    Parameters
+    ----------
+    transcripts: List[:class:`Transcript`]
+        The Transcripts to Build (Created with `shared_cache=True`)
+    concurrency: :class:`int`
+        The Maximum Number of Transcripts Built at Once
+
+    Returns
+    -------
+    :class:`BatchExport`
+        The Built Transcripts (& those of their Threads) & the Errors of Those that Failed
+    """
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    batch = BatchExport()
+
+    # Each Transcript Renders with its Own Context, but the Users & Emoji Looked Up are Shared
+    lookups: Dict[str, Any] = {}
+    for transcript in transcripts:
+        transcript.context.cache = lookups
+
+    async def build(transcript: Transcript) -> None:
+        channel_id: int = transcript.channel.id  # type: ignore
+        async with semaphore:
+            try:
+                history = await transcript.prepare()
+                batch.transcripts[channel_id] = await transcript.build_transcript(history)
+            except Exception as e:
+                batch.failures[channel_id] = e
+            else:
+                batch.transcripts.update(transcript.threads)
+                batch.failures.update(transcript.thread_failures)
+
+    try:
+        async with AsyncExitStack() as stack:
+            # Connections are Kept Alive Until the Last Transcript is Done
+            for transcript in transcripts:
+                for client in transcript.http_clients:
+                    await stack.enter_async_context(client)
+            await asyncio.gather(*(build(transcript) for transcript in transcripts))
+    finally:
+        lookups.clear()
+
+    return batch
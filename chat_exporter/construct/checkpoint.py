@@ -0,0 +1,234 @@
+import discord
+
+import json
+import os
+import pathlib
+from datetime import datetime
+
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Union
+
+
+class CheckpointMessage:
+    """Stands in for the Last Exported Message when Continuing from a Checkpoint"""
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        self.id: int = data["id"]
+        self.type = discord.enums.try_enum(discord.MessageType, data["type"])
+        self.author = discord.Object(id=data["author_id"])
+        self.created_at = datetime.fromisoformat(data["created_at"])
+
+    @classmethod
+    def from_message(cls, message: Union[discord.Message, "CheckpointMessage"]) -> "CheckpointMessage":
+        return cls(
+            {
+                "id": message.id,
+                "type": message.type.value,
+                "author_id": message.author.id,
+                "created_at": message.created_at.isoformat(),
+            },
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "type": self.type.value,
+            "author_id": self.author.id,
+            "created_at": self.created_at.isoformat(),
+        }
+
+
+def _dump_meta_data(meta_data: Dict[int, List[Any]]) -> Dict[str, List[Any]]:
+    return {
+        str(user_id): [
+            name, created_at.isoformat(), bot, str(avatar), count,
+            joined_at.isoformat() if joined_at else None, display,
+        ]
+        for user_id, (name, created_at, bot, avatar, count, joined_at, display) in meta_data.items()
+    }
+
+
+def _load_meta_data(data: Dict[str, List[Any]]) -> Dict[int, List[Any]]:
+    return {
+        int(user_id): [
+            name, datetime.fromisoformat(created_at), bot, avatar, count,
+            datetime.fromisoformat(joined_at) if joined_at else None, display,
+        ]
+        for user_id, (name, created_at, bot, avatar, count, joined_at, display) in data.items()
+    }
+
+
+class ExportCheckpoint:
+    """
+    The Persisted Progress of an Export, to Continue it Incrementally or After an Interruption
+
+    The HTML Rendered so Far is Appended to a File Beside the Checkpoint (`<path>.html`),
+    & the Checkpoint Only Records How Much of it was Complete when it was Last Saved.
+    """
+
+    def __init__(self, path: Union[str, pathlib.Path], channel_id: int) -> None:
+        """
+        Parameters
+        ----------
+        path: Union[:class:`str`, :class:`pathlib.Path`]
+            The File to Persist the Checkpoint To
+        channel_id: :class:`int`
+            The ID of the Exported Channel
+        """
+
+        if isinstance(path, str):
+            path = pathlib.Path(path)
+
+        self.path = path
+        self.html_path = path.with_name(path.name + ".html")
+        self.channel_id = channel_id
+
+        self.last_message_id: Optional[int] = None
+        self.message_count: int = 0
+        # The Number of Bytes of the HTML File Written when the Checkpoint was Last Saved
+        self.html_offset: int = 0
+        self.meta_data: Dict[int, List[Any]] = {}
+        self.menu_div_id: int = 0
+        self.previous_message: Optional[CheckpointMessage] = None
+
+        self._html: Optional[BinaryIO] = None
+
+    @classmethod
+    def load(cls, path: Union[str, pathlib.Path], channel_id: int) -> "ExportCheckpoint":
+        """
+        Loads the Checkpoint of the Channel, or Starts a New One
+
+        Parameters
+        ----------
+        path: Union[:class:`str`, :class:`pathlib.Path`]
+            The File the Checkpoint is Persisted To
+        channel_id: :class:`int`
+            The ID of the Exported Channel
+
+        Returns
+        -------
+        :class:`ExportCheckpoint`
+            The Checkpoint (Empty if None was Saved for the Channel)
+        """
+
+        checkpoint = cls(path, channel_id)
+        try:
+            with open(checkpoint.path, "r") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return checkpoint
+
+        if data["channel_id"] != channel_id:
+            return checkpoint
+
+        checkpoint.last_message_id = data["last_message_id"]
+        checkpoint.message_count = data["message_count"]
+        checkpoint.html_offset = data["html_offset"]
+        checkpoint.meta_data = _load_meta_data(data["meta_data"])
+        checkpoint.menu_div_id = data["menu_div_id"]
+        if data["previous_message"]:
+            checkpoint.previous_message = CheckpointMessage(data["previous_message"])
+        return checkpoint
+
+    def read_html(self, chunk_size: int = 1 << 16) -> Iterator[str]:
+        """
+        Reads the HTML of the Messages Exported Before the Checkpoint was Saved, in Chunks
+
+        Parameters
+        ----------
+        chunk_size: :class:`int`
+            The Number of Characters Read at Once
+
+        Yields
+        ------
+        :class:`str`
+            The HTML, Excluding the Closing Tag of the Last Group
+        """
+
+        if not self.html_offset:
+            return
+
+        self._truncate()
+        with open(self.html_path, "r", encoding="utf-8", newline="") as f:
+            for chunk in iter(lambda: f.read(chunk_size), ""):
+                yield chunk
+
+    def append(self, content_html: str) -> None:
+        """
+        Appends the HTML of Newly Exported Messages to the HTML File (Without Saving the Checkpoint)
+
+        Parameters
+        ----------
+        content_html: :class:`str`
+            The HTML, with its Code Blocks Restored
+        """
+
+        if self._html is None:
+            self._truncate()
+            self._html = open(self.html_path, "ab")
+        self._html.write(content_html.encode("utf-8"))
+
+    def record(
+        self,
+        meta_data: Dict[int, List[Any]],
+        previous_message: Optional[discord.Message],
+        message_count: int,
+        menu_div_id: int,
+    ) -> None:
+        """
+        Records the Progress of the Export (Without Saving it)
+
+        Parameters
+        ----------
+        meta_data: Dict[:class:`int`, List[Any]]
+            The Meta Data of All Messages Rendered so Far
+        previous_message: Optional[:class:`discord.Message`]
+            The Last Message Rendered
+        message_count: :class:`int`
+            The Number of Messages Rendered so Far
+        menu_div_id: :class:`int`
+            The Last Select Menu ID Used
+        """
+
+        if previous_message is None:
+            return
+
+        self.meta_data = meta_data
+        self.message_count = message_count
+        self.menu_div_id = menu_div_id
+        self.last_message_id = previous_message.id
+        self.previous_message = CheckpointMessage.from_message(previous_message)
+
+    def save(self) -> None:
+        """Atomically Writes the Checkpoint to its File, Once the HTML it Covers is on Disk"""
+
+        if self._html is not None:
+            self._html.flush()
+            os.fsync(self._html.fileno())
+            self.html_offset = self._html.tell()
+
+        data = {
+            "channel_id": self.channel_id,
+            "last_message_id": self.last_message_id,
+            "message_count": self.message_count,
+            "html_offset": self.html_offset,
+            "meta_data": _dump_meta_data(self.meta_data),
+            "menu_div_id": self.menu_div_id,
+            "previous_message": self.previous_message.to_dict() if self.previous_message else None,
+        }
+
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(temp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(temp_path, self.path)
+
+    def close(self) -> None:
+        """Closes the HTML File"""
+
+        if self._html is not None:
+            self._html.close()
+            self._html = None
+
+    def _truncate(self) -> None:
+        # Discards Any HTML Appended After the Checkpoint was Last Saved (e.g. Before a Crash)
+        with open(self.html_path, "ab") as f:
+            f.truncate(self.html_offset)
@@ -0,0 +1,261 @@
+import discord
+
+import hashlib
+import json
+import pathlib
+import sqlite3
+from collections import OrderedDict
+
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .attachment_handler import AttachmentHandler
+from ..ext import Lookups
+from ..parse import MentionResolver, ParseMarkdown, ParseMention
+
+# Bump Whenever the Rendering of Message Bodies Changes, to Invalidate Every Cached Fragment
+FRAGMENT_VERSION = 2
+
+# The Rendered Parts of a Message Body (`components` is None if it Wasn't Cacheable)
+CachedBody = Dict[str, Any]
+
+
+def _mentioned_names(guild: Optional[discord.Guild], texts: List[str]) -> List[Any]:
+    # The Names of the Guild's Channels, Members & Roles Mentioned (Users Outside the Guild are
+    # Resolved by their ID, which is Already Part of the Content)
+    resolver = MentionResolver(guild, Lookups())
+    names: List[Any] = []
+    for text in texts:
+        for match in ParseMention.REGEX_MENTIONS.finditer(text):
+            kind = (match.lastgroup or "").replace("_2", "")
+            if kind not in ("channel", "member", "role"):
+                continue
+
+            object_id = int(match.group(match.lastgroup))  # type: ignore
+            if kind == "channel":
+                channel = resolver.find_channel(object_id)
+                names.append(channel.name if channel else None)
+            elif kind == "role":
+                role = resolver.find_role(object_id)
+                names.append([role.name, role.color.value] if role else None)
+            else:
+                member = guild.get_member(object_id) if guild else None
+                names.append(member.display_name if member else None)
+    return names
+
+
+def fragment_key(
+    message: discord.Message,
+    guild: Optional[discord.Guild] = None,
+    attachment_handler: Optional[AttachmentHandler] = None,
+) -> str:
+    """
+    The Key a Message's Body is Cached Under, which Changes Whenever the Body Could
+    (Taken Before the Message is Rendered)
+
+    Parameters
+    ----------
+    message: :class:`discord.Message`
+        The Message
+    guild: Optional[:class:`discord.Guild`]
+        The Guild its Mentions are Resolved Against
+    attachment_handler: Optional[:class:`AttachmentHandler`]
+        The Handler its Attachments are Saved With
+
+    Returns
+    -------
+    :class:`str`
+        The Edit Timestamp, a Fingerprint of the Content, Embeds, Attachments, Components,
+        Stickers, Reactions, the Names of the Mentioned Channels, Members & Roles & the
+        Attachment Handler, & the Renderer Version
+    """
+
+    embeds = [embed.to_dict() for embed in message.embeds]
+    texts = [message.content, json.dumps(embeds, default=str)]
+    handler = attachment_handler.cache_key if attachment_handler else None
+    fingerprint = json.dumps(
+        [
+            message.content,
+            embeds,
+            [[a.id, a.url] for a in message.attachments],
+            [c.to_dict() for c in message.components],  # type: ignore
+            [sticker.id for sticker in message.stickers],
+            [[str(r.emoji), r.count] for r in message.reactions],
+            _mentioned_names(guild, texts),
+            handler if message.attachments else None,
+        ],
+        sort_keys=True,
+        default=str,
+    )
+    edited_at = message.edited_at.isoformat() if message.edited_at else ""
+    digest = hashlib.sha1(fingerprint.encode()).hexdigest()
+    return f"{edited_at}:{digest}:{FRAGMENT_VERSION}"
+
+
+def pack_body(body: CachedBody) -> CachedBody:
+    """Adds the Code Blocks the Body Refers To, as they're Only Held in Memory"""
+
+    texts = (value for value in body.values() if isinstance(value, str))
+    code_blocks = ParseMarkdown.code_blocks_of("".join(texts))
+    return {**body, "code_blocks": code_blocks}
+
+
+def unpack_body(body: CachedBody) -> CachedBody:
+    """Stores the Code Blocks of a Cached Body Under New Placeholders, as they're Numbered Per Export"""
+
+    code_blocks: Dict[str, str] = body["code_blocks"]
+    if not code_blocks:
+        return body
+
+    renamed = ParseMarkdown.import_code_blocks(code_blocks)
+    return {
+        key: (
+            ParseMarkdown.rename_code_blocks(value, renamed)
+            if isinstance(value, str) else value
+        )
+        for key, value in body.items()
+    }
+
+
+class FragmentCache:
+    """The Rendered Bodies of Messages, Reused by Later Exports while the Messages are Unchanged"""
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, message_id: int, key: str) -> Optional[CachedBody]:
+        """
+        Looks Up the Cached Body of a Message
+
+        Parameters
+        ----------
+        message_id: :class:`int`
+            The ID of the Message
+        key: :class:`str`
+            The Current :func:`fragment_key` of the Message
+
+        Returns
+        -------
+        Optional[:class:`CachedBody`]
+            The Body, if it was Cached & the Message Hasn't Changed Since
+        """
+
+        entry = self._load(message_id)
+        body = unpack_body(entry[1]) if entry is not None and entry[0] == key else None
+
+        if body is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return body
+
+    def put(self, message_id: int, key: str, body: CachedBody) -> None:
+        """
+        Caches the Rendered Body of a Message
+
+        Parameters
+        ----------
+        message_id: :class:`int`
+            The ID of the Message
+        key: :class:`str`
+            The :func:`fragment_key` of the Message
+        body: :class:`CachedBody`
+            The Rendered Parts of its Body
+        """
+
+        self._store(message_id, key, pack_body(body))
+
+    def flush(self) -> None:
+        """Persists the Bodies Cached so Far"""
+
+    def _load(self, message_id: int) -> Optional[Tuple[str, CachedBody]]:
+        raise NotImplementedError
+
+    def _store(self, message_id: int, key: str, body: CachedBody) -> None:
+        raise NotImplementedError
+
+
+class MemoryFragmentCache(FragmentCache):
+    """Caches the Bodies of the Most Recently Rendered Messages in Memory"""
+
+    def __init__(self, maxsize: int = 100_000) -> None:
+        """
+        Parameters
+        ----------
+        maxsize: :class:`int`
+            The Maximum Number of Messages Cached, Evicting the Least Recently Used
+        """
+
+        super().__init__()
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[int, Tuple[str, CachedBody]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _load(self, message_id: int) -> Optional[Tuple[str, CachedBody]]:
+        entry = self._entries.get(message_id)
+        if entry is not None:
+            self._entries.move_to_end(message_id)
+        return entry
+
+    def _store(self, message_id: int, key: str, body: CachedBody) -> None:
+        self._entries[message_id] = (key, body)
+        self._entries.move_to_end(message_id)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+class SQLiteFragmentCache(FragmentCache):
+    """Caches the Bodies of Rendered Messages in an SQLite Database, Across Processes & Restarts"""
+
+    def __init__(self, path: Union[str, pathlib.Path], commit_interval: int = 1000) -> None:
+        """
+        Parameters
+        ----------
+        path: Union[:class:`str`, :class:`pathlib.Path`]
+            The Database File
+        commit_interval: :class:`int`
+            The Number of Bodies Cached Between Commits
+        """
+
+        super().__init__()
+        self.path = pathlib.Path(path)
+        self.commit_interval = commit_interval
+        self._uncommitted = 0
+
+        self._db = sqlite3.connect(self.path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS fragments (message_id INTEGER PRIMARY KEY, key TEXT NOT NULL, body TEXT NOT NULL)",
+        )
+        self._db.commit()
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM fragments").fetchone()[0]
+
+    def flush(self) -> None:
+        self._db.commit()
+        self._uncommitted = 0
+
+    def close(self) -> None:
+        """Commits & Closes the Database"""
+
+        self.flush()
+        self._db.close()
+
+    def _load(self, message_id: int) -> Optional[Tuple[str, CachedBody]]:
+        row = self._db.execute(
+            "SELECT key, body FROM fragments WHERE message_id = ?", (message_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def _store(self, message_id: int, key: str, body: CachedBody) -> None:
+        self._db.execute(
+            "INSERT OR REPLACE INTO fragments (message_id, key, body) VALUES (?, ?, ?)",
+            (message_id, key, json.dumps(body)),
+        )
+        self._uncommitted += 1
+        if self._uncommitted >= self.commit_interval:
+            self.flush()
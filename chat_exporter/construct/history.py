@@ -0,0 +1,156 @@
+import discord
+
+import asyncio
+from collections import deque
+from datetime import datetime, timezone
+
+from typing import AsyncGenerator, Deque, List, Optional, Tuple, Union
+
+
+def _snowflake_bounds(
+    channel: discord.abc.Messageable,
+    before: Optional[datetime],
+    after: Optional[Union[datetime, discord.abc.Snowflake]],
+) -> Tuple[int, int]:
+    if isinstance(after, datetime):
+        lower = discord.utils.time_snowflake(after, high=True)
+    elif after is not None:
+        lower = after.id
+    else:
+        # No Message in a Channel can be Older than the Channel Itself
+        lower = channel.id - 1  # type: ignore
+
+    if before is not None:
+        upper = discord.utils.time_snowflake(before, high=False)
+    else:
+        upper = discord.utils.time_snowflake(datetime.now(timezone.utc), high=True) + 1
+
+    return lower, upper
+
+
+def partition_window(lower: int, upper: int, partitions: int) -> List[Tuple[int, int]]:
+    """
+    Splits the Exclusive Snowflake Window `(lower, upper)` into Consecutive Slices
+
+    Parameters
+    ----------
+    lower: :class:`int`
+        The Exclusive Lower Snowflake
+    upper: :class:`int`
+        The Exclusive Upper Snowflake
+    partitions: :class:`int`
+        The Number of Slices to Create
+
+    Returns
+    -------
+    List[Tuple[:class:`int`, :class:`int`]]
+        The Exclusive `(after, before)` Bounds of Each Slice, Oldest First
+    """
+
+    span = upper - lower
+    partitions = max(1, min(partitions, span - 1))
+    step = span // partitions
+
+    bounds = [lower + step * i for i in range(partitions)] + [upper]
+    return [
+        (bounds[i], bounds[i + 1] + 1 if i < partitions - 1 else upper)
+        for i in range(partitions)
+    ]
+
+
+async def partitioned_history(
+    channel: discord.abc.Messageable,
+    *,
+    before: Optional[datetime] = None,
+    after: Optional[Union[datetime, discord.abc.Snowflake]] = None,
+    oldest_first: bool = True,
+    partitions: int = 4,
+    max_concurrency: int = 4,
+    buffer_size: int = 100,
+) -> AsyncGenerator[discord.Message, None]:
+    """
+    Fetches the History of a Channel as Several Snowflake-Time Slices in Parallel
+
+    The Requested Window is Split into `partitions` Slices & Up to `max_concurrency`
+    of them are Fetched at Once. Slices are Yielded Strictly in Order, & Each Streams
+    Through a Queue of `buffer_size` Messages, so a Slice Fetched Ahead Waits Once its
+    Queue is Full, & at Most `max_concurrency * buffer_size` Messages are Held in Memory.
+
+    Parameters
+    ----------
+    channel: :class:`discord.abc.Messageable`
+        The Channel to Fetch the History Of
+    before: Optional[:class:`datetime.datetime`]
+        The Time to Capture Messages Before
+    after: Optional[Union[:class:`datetime.datetime`, :class:`discord.abc.Snowflake`]]
+        The Time or Message to Capture Messages After
+    oldest_first: :class:`bool`
+        Whether to Yield the Messages in Chronological Order
+    partitions: :class:`int`
+        The Number of Slices to Split the Window Into
+    max_concurrency: :class:`int`
+        The Maximum Number of Slices Being Fetched at Once
+    buffer_size: :class:`int`
+        The Maximum Number of Messages Buffered for Each Slice
+
+    Yields
+    ------
+    :class:`discord.Message`
+        The Messages of the Window, in the Requested Order
+    """
+
+    lower, upper = _snowflake_bounds(channel, before, after)
+    slices = partition_window(lower, upper, partitions)
+    if not oldest_first:
+        slices.reverse()
+
+    async def fetch_slice(
+        bounds: Tuple[int, int],
+        queue: "asyncio.Queue[Optional[discord.Message]]",
+    ) -> None:
+        slice_after, slice_before = bounds
+        try:
+            async for message in channel.history(
+                limit=None,
+                before=discord.Object(id=slice_before),
+                after=discord.Object(id=slice_after),
+                oldest_first=oldest_first,
+            ):
+                await queue.put(message)
+        except Exception:
+            # Ends the Slice Early, so the Consumer Stops Waiting & Raises the Error
+            await queue.put(None)
+            raise
+        await queue.put(None)
+
+    pending = deque(slices)
+    running: Deque[
+        Tuple["asyncio.Task[None]", "asyncio.Queue[Optional[discord.Message]]"]
+    ] = deque()
+
+    def schedule() -> None:
+        while pending and len(running) < max(1, max_concurrency):
+            queue: "asyncio.Queue[Optional[discord.Message]]" = asyncio.Queue(
+                maxsize=max(1, buffer_size),
+            )
+            task = asyncio.create_task(fetch_slice(pending.popleft(), queue))
+            running.append((task, queue))
+
+    schedule()
+    try:
+        while running:
+            task, queue = running[0]
+            message = await queue.get()
+            while message is not None:
+                yield message
+                message = await queue.get()
+
+            running.popleft()
+            # Raises the Error the Slice Failed With, if Any
+            await task
+            schedule()
+    finally:
+        tasks = [task for task, _ in running]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
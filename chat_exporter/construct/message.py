@@ -1,14 +1,35 @@
 import discord
 
+import asyncio
 import html
+import json
+import re
+from collections import OrderedDict, deque
 from datetime import timedelta
 
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import (
+    Any,
+    AsyncIterator,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
+from .checkpoint import ExportCheckpoint
+from .fragment_cache import CachedBody, FragmentCache, fragment_key
+from .render_pool import RenderJob, RenderPool, RenderedBody, render_content
+from .sink import TranscriptSink
 from ..construct import Attachment, AttachmentHandler, Component, Embed, Reaction
 from ..ext import (
     DiscordIcons,
     ParseMode,
+    PlainText,
+    RenderContext,
     app_tag,
     app_tag_verified,
     cache,
@@ -17,7 +38,6 @@ from ..ext import (
     fill_out,
     img_attachment,
     message_body,
-    message_content,
     message_interaction,
     message_pin,
     message_reference,
@@ -27,6 +47,7 @@ from ..ext import (
     message_thread_remove,
     start_message,
 )
+from ..parse import ParseMarkdown, prefetch_users
 
 
 def _gather_user_bot(author: Union[discord.User, discord.Member]) -> str:
@@ -41,17 +62,166 @@ def _set_edit_at(message_edited_at: str) -> str:
     return f'<span class="chatlog__reference-edited-timestamp" data-timestamp="{message_edited_at}">(edited)</span>'
 
 
+def _render_job(message: discord.Message) -> RenderJob:
+    edited = _set_edit_at(message.edited_at.isoformat()) if message.edited_at else ""
+    embeds = [embed.to_dict() for embed in message.embeds]
+    return message.id, message.content, edited, embeds  # type: ignore
+
+
+@cache(
+    key=lambda guild, author: (getattr(guild, "id", None), author.id),
+    maxsize=10_000,
+    ttl=60 * 60,
+)
+async def _gather_member(guild: Optional[discord.Guild], author: discord.abc.User) -> Optional[discord.Member]:
+    if not guild:
+        return None
+
+    member = guild.get_member(author.id)
+    if member:
+        return member
+
+    try:
+        return await guild.fetch_member(author.id)
+    except Exception:
+        return None
+
+
+_USER_MENTION_REGEX = re.compile(r"<@!?([0-9]+)>")
+
+
+def _referenced_users(message: discord.Message) -> Iterator[discord.abc.User]:
+    yield message.author
+
+    if hasattr(message, 'interaction_metadata'):
+        interaction = message.interaction_metadata
+    else:
+        interaction = message.interaction
+    if interaction:
+        yield interaction.user
+
+    if message.type in (discord.MessageType.recipient_add, discord.MessageType.recipient_remove) and message.mentions:
+        yield message.mentions[0]
+
+    resolved = getattr(message.reference, "resolved", None)
+    if isinstance(resolved, discord.Message):
+        yield resolved.author
+
+
+class _MemberPrefetcher:
+    """Resolves the Members & Users Messages Refer To in Bulk, Before they're Rendered"""
+
+    def __init__(self, guild: Optional[discord.Guild], chunk_size: int = 100) -> None:
+        """
+        Parameters
+        ----------
+        guild: Optional[:class:`discord.Guild`]
+            The Guild the Messages are From
+        chunk_size: :class:`int`
+            The Number of Members Queried at Once (At Most 100)
+        """
+
+        self.guild = guild
+        self.chunk_size = chunk_size
+        # The IDs Already Resolved (or Found Not to be Members), Across Batches of Messages
+        self.seen: Set[int] = set()
+
+    async def prefetch(self, messages: List[discord.Message]) -> None:
+        """
+        Caches the Member of Every Author, Interaction User & Thread Recipient, & Every
+        Mentioned User, so Rendering Doesn't Fetch them One at a Time
+
+        Parameters
+        ----------
+        messages: List[:class:`discord.Message`]
+            The Messages About to be Rendered
+        """
+
+        # Indexed by ID, as Members are Cached by the Guild & User ID
+        users: Dict[int, discord.abc.User] = {}
+        mentioned: Set[int] = set()
+        for message in messages:
+            for user in _referenced_users(message):
+                if user.id not in self.seen:
+                    users.setdefault(user.id, user)
+
+            texts = [message.content]
+            texts.extend(json.dumps(embed.to_dict()) for embed in message.embeds)
+            for text in texts:
+                mentioned.update(map(int, _USER_MENTION_REGEX.findall(text)))
+        mentioned -= self.seen
+
+        user_ids = users.keys() | mentioned
+        self.seen |= user_ids
+
+        members: Dict[int, discord.Member] = {}
+        if self.guild:
+            missing = [
+                user_id for user_id in user_ids if self.guild.get_member(user_id) is None
+            ]
+            for i in range(0, len(missing), self.chunk_size):
+                chunk = set(missing[i:i + self.chunk_size])
+                try:
+                    # Cached in the Guild, so Mentions Resolve to them Too
+                    found = await self.guild.query_members(user_ids=list(chunk), limit=len(chunk), cache=True)
+                except Exception:
+                    # e.g. Without a Gateway Connection, so they're Fetched One at a Time
+                    fetches = [
+                        _gather_member(self.guild, users[user_id])
+                        for user_id in chunk if user_id in users
+                    ]
+                    await asyncio.gather(*fetches)
+                    continue
+
+                members.update((member.id, member) for member in found)
+                for user_id in chunk & users.keys():
+                    member, user = members.get(user_id), users[user_id]
+                    _gather_member.store(member, self.guild, user)  # type: ignore
+
+        # Mentioned Users Outside the Guild
+        await prefetch_users(self.guild, mentioned - members.keys())
+
+
+@cache(key=lambda sticker: sticker.id, maxsize=1_000)
+async def _fetch_sticker(sticker: discord.StickerItem) -> discord.Sticker:
+    return await sticker.fetch()
+
+
+_AUDIT_TYPES = (
+    discord.MessageType.pins_add,
+    discord.MessageType.thread_created,
+    discord.MessageType.recipient_remove,
+    discord.MessageType.recipient_add,
+)
+
+
+class _RecentMessages:
+    """A Bounded Lookup of the Most Recently Rendered Messages"""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._messages: "OrderedDict[int, discord.Message]" = OrderedDict()
+
+    def add(self, message: discord.Message) -> None:
+        self._messages[message.id] = message
+        if len(self._messages) > self.maxsize:
+            self._messages.popitem(last=False)
+
+    def get(self, message_id: int) -> Optional[discord.Message]:
+        return self._messages.get(message_id)
+
+
 class MessageConstruct:
     """Constructs the Message"""
 
-    message_html: str = ""
-
     embeds: str = ""
     reactions: str = ""
     components: str = ""
     attachments: str = ""
     reference: str = ""
     interaction: str = ""
+    content: str = ""
+    rendered: Optional[RenderedBody] = None
 
     def __init__(
         self,
@@ -61,8 +231,11 @@ class MessageConstruct:
         military_time: bool,
         guild: Optional[discord.Guild],
         meta_data: Dict[int, List[Any]],
-        message_dict: Dict[int, discord.Message],
+        message_dict: Union[Dict[int, discord.Message], _RecentMessages],
         attachment_handler: Optional[AttachmentHandler],
+        building: Optional[Dict[int, "MessageConstruct"]] = None,
+        render_pool: Optional[RenderPool] = None,
+        fragment_cache: Optional[FragmentCache] = None,
     ):
         self.message = message
         self.starter_message = starter_message
@@ -71,15 +244,90 @@ class MessageConstruct:
         self.guild = guild
         self.message_dict = message_dict
         self.attachment_handler = attachment_handler
+        self.building = building
+        self.render_pool = render_pool
+
+        # Set by the Renderer Laying the Message Out
+        self.position = 0
+        self.body: Optional["asyncio.Future[None]"] = None
+        # Rendering Replaces the Content, which Later Messages May Still Quote
+        self.source_content = message.content
 
         self.message_created_at, self.message_edited_at = self.set_time()
         self.meta_data = meta_data
 
+        self.fragments: List[str] = []
+
+        self.is_audit = self.message.type in _AUDIT_TYPES
+        self.menu_div_ids = Component.reserve_menu_div_ids(
+            [] if self.is_audit else self.message.components,
+        )
+
+        # The Key is Taken Before Rendering Replaces the Message's Content
+        self.fragment_cache = fragment_cache
+        self.fragment_key = ""
+        self.cached_body: Optional[CachedBody] = None
+        if self.fragment_cache is not None and not self.is_audit:
+            self.fragment_key = fragment_key(
+                self.message, self.guild, self.attachment_handler,
+            )
+            self.cached_body = self.fragment_cache.get(
+                self.message.id, self.fragment_key,
+            )
+
+    @property
+    def message_html(self) -> str:
+        return "".join(self.fragments)
+
     @property
     def time_format(self) -> str:
         return "%A, %d %B %Y %H:%M" if self.military_time else "%A, %d %B %Y %I:%M %p"
 
     async def construct_message(self) -> Tuple[str, Dict[int, List[Any]]]:
+        await self.build_body()
+        return await self.build_layout()
+
+    async def build_body(self) -> None:
+        """
+        Builds the Parts of the Message that Don't Depend on the Messages Before it, so the
+        Bodies of Several Messages can be Built at Once
+        """
+
+        if not self.is_audit:
+            if self.cached_body is not None:
+                self.message.content = self.cached_body["content"]
+            else:
+                if self.render_pool:
+                    self.rendered = await self.render_pool.rendered(self.message.id)
+                await self.build_content()
+
+            # References & Interactions Show Other Messages & Users, so they're Never Cached
+            await self.build_reference()
+            await self.build_interaction()
+
+            if self.cached_body is not None:
+                await self.load_cached_assets()
+            else:
+                await self.build_sticker()
+                await self.build_assets()
+                self.cache_body()
+
+        # Later Replies May Still Change the Message's Content Before it's Laid Out
+        self.content = self.message.content
+
+        # Warms the Cache for the Layout
+        await _gather_member(self.guild, self.message.author)
+
+    async def build_layout(self) -> Tuple[str, Dict[int, List[Any]]]:
+        """
+        Groups the Message with the Ones Before it & Lays it Out (Must be Called in Order)
+
+        Returns
+        -------
+        Tuple[:class:`str`, Dict[:class:`int`, List[Any]]]
+            The Message HTML & the Meta Data
+        """
+
         if discord.MessageType.pins_add == self.message.type:
             await self.build_pin()
         elif discord.MessageType.thread_created == self.message.type:
@@ -93,11 +341,6 @@ class MessageConstruct:
         return self.message_html, self.meta_data
 
     async def build_message(self) -> None:
-        await self.build_content()
-        await self.build_reference()
-        await self.build_interaction()
-        await self.build_sticker()
-        await self.build_assets()
         await self.build_message_template()
         await self.build_meta_data()
 
@@ -141,6 +384,14 @@ class MessageConstruct:
             ]
 
     async def build_content(self) -> None:
+        if self.message.content and PlainText.check(html.escape(self.message.content)):
+            # Rendered Without the Mention & Markdown Parsers (Wherever it's Rendered)
+            RenderContext.current().fast_path_messages += 1
+
+        if self.rendered is not None:
+            self.message.content = self.rendered[0]
+            return
+
         if not self.message.content:
             self.message.content = ""
             return
@@ -148,13 +399,7 @@ class MessageConstruct:
         if self.message_edited_at:
             self.message_edited_at = _set_edit_at(self.message_edited_at)
 
-        self.message.content = html.escape(self.message.content)
-        self.message.content = await fill_out(
-            self.guild, message_content, [
-                ("MESSAGE_CONTENT", self.message.content, ParseMode.MARKDOWN),
-                ("EDIT", self.message_edited_at, ParseMode.NONE),
-            ],
-        )
+        self.message.content = await render_content(self.guild, self.message.content, self.message_edited_at)
 
     async def build_reference(self) -> None:
         if not self.message.reference:
@@ -163,6 +408,14 @@ class MessageConstruct:
         referenced_message_id: int = self.message.reference.message_id  # type: ignore
 
         message = self.message_dict.get(referenced_message_id)
+        content: Optional[str] = None
+        referenced = self.building.get(referenced_message_id) if self.building else None
+        if referenced is not None and referenced.body is not None:
+            # Quoted as it Would be Rendering One Message at a Time, Whichever is Built First
+            if referenced.position < self.position:
+                await referenced.body
+            else:
+                content = referenced.source_content
         if not message:
             try:
                 message = await self.message.channel.fetch_message(referenced_message_id)
@@ -182,10 +435,12 @@ class MessageConstruct:
 
         interaction_status = get_interaction_status(message)
 
-        if not message.content and not interaction_status:
-            message.content = "Click to see attachment"
-        elif not message.content and interaction_status:
-            message.content = "Click to see command"
+        if content is None:
+            content = message.content
+        if not content and not interaction_status:
+            content = "Click to see attachment"
+        elif not content and interaction_status:
+            content = "Click to see command"
 
         icon = ""
         if not interaction_status and (message.embeds or message.attachments):
@@ -198,7 +453,7 @@ class MessageConstruct:
         if message_edited_at:
             message_edited_at = _set_edit_at(message_edited_at)
 
-        safe_content = message.content.replace("\n", "").replace("<br>", "")
+        safe_content = content.replace("\n", "").replace("<br>", "")
         avatar_url = message.author.display_avatar if message.author.display_avatar else DiscordIcons.default_avatar
 
         self.reference = await fill_out(
@@ -256,7 +511,7 @@ class MessageConstruct:
         if not self.message.stickers or not hasattr(self.message.stickers[0], "url"):
             return
 
-        sticker = await self.message.stickers[0].fetch()
+        sticker = await _fetch_sticker(self.message.stickers[0])
 
         if isinstance(sticker, discord.StandardSticker):
             sticker_image_url = (
@@ -273,47 +528,86 @@ class MessageConstruct:
         )
 
     async def build_assets(self) -> None:
-        for e in self.message.embeds:
-            self.embeds += await Embed.flow(
-                self.guild, embed=e,
-            )
+        if self.rendered is not None:
+            self.embeds = self.rendered[1]
+        else:
+            self.embeds = "".join([
+                await Embed.flow(self.guild, embed=e)
+                for e in self.message.embeds
+            ])
 
+        attachments: List[str] = []
         for a in self.message.attachments:
             if self.attachment_handler:
                 a = await self.attachment_handler.process_asset(a)
-            self.attachments += await Attachment.flow(
-                self.guild, attachment=a,
+            attachments.append(
+                await Attachment.flow(
+                    self.guild, attachment=a,
+                ),
             )
+        self.attachments = "".join(attachments)
 
-        for c in self.message.components:
-            self.components += await Component.flow(
-                self.guild, component=c,
-            )
+        await self.build_components()
 
-        for r in self.message.reactions:
-            self.reactions += await Reaction.flow(
-                self.guild, reaction=r,
-            )
+        self.reactions = "".join([
+            await Reaction.flow(self.guild, reaction=r)
+            for r in self.message.reactions
+        ])
 
         if self.reactions:
             self.reactions = f'<div class="chatlog__reactions">{self.reactions}</div>'
 
+    async def build_components(self) -> None:
+        menu_div_ids = iter(self.menu_div_ids)
+        self.components = "".join([
+            await Component.flow(self.guild, component=c, menu_div_ids=menu_div_ids)
+            for c in self.message.components
+        ])
+
+    async def load_cached_assets(self) -> None:
+        assert self.cached_body is not None
+        self.embeds = self.cached_body["embeds"]
+        self.attachments = self.cached_body["attachments"]
+        self.reactions = self.cached_body["reactions"]
+
+        # Select Menus are Numbered Across the Whole Transcript
+        if self.cached_body["components"] is None:
+            await self.build_components()
+        else:
+            self.components = self.cached_body["components"]
+
+    def cache_body(self) -> None:
+        if self.fragment_cache is None:
+            return
+
+        self.fragment_cache.put(
+            self.message.id, self.fragment_key, {
+                "content": self.message.content,
+                "embeds": self.embeds,
+                "attachments": self.attachments,
+                "components": None if self.menu_div_ids else self.components,
+                "reactions": self.reactions,
+            },
+        )
+
     async def build_message_template(self) -> str:
         started = await self.generate_message_divider()
 
         if started:
             return self.message_html
 
-        self.message_html += await fill_out(
-            self.guild, message_body, [
-                ("MESSAGE_ID", str(self.message.id)),
-                ("MESSAGE_CONTENT", self.message.content, ParseMode.NONE),
-                ("EMBEDS", self.embeds, ParseMode.NONE),
-                ("ATTACHMENTS", self.attachments, ParseMode.NONE),
-                ("COMPONENTS", self.components, ParseMode.NONE),
-                ("EMOJI", self.reactions, ParseMode.NONE),
-                ("TIMESTAMP", self.message_created_at, ParseMode.NONE),
-            ],
+        self.fragments.append(
+            await fill_out(
+                self.guild, message_body, [
+                    ("MESSAGE_ID", str(self.message.id)),
+                    ("MESSAGE_CONTENT", self.content, ParseMode.NONE),
+                    ("EMBEDS", self.embeds, ParseMode.NONE),
+                    ("ATTACHMENTS", self.attachments, ParseMode.NONE),
+                    ("COMPONENTS", self.components, ParseMode.NONE),
+                    ("EMOJI", self.reactions, ParseMode.NONE),
+                    ("TIMESTAMP", self.message_created_at, ParseMode.NONE),
+                ],
+            ),
         )
 
         return self.message_html
@@ -332,7 +626,7 @@ class MessageConstruct:
     async def generate_message_divider(self, channel_audit: bool = False) -> bool:
         if channel_audit or self._generate_message_divider_check():
             if self.previous_message is not None:
-                self.message_html += await fill_out(self.guild, end_message, [])
+                self.fragments.append(await fill_out(self.guild, end_message, []))
 
             if channel_audit:
                 self.audit = True
@@ -345,106 +639,102 @@ class MessageConstruct:
             if self.reference != "" or self.interaction:
                 followup_symbol = "<div class='chatlog__followup-symbol'></div>"
 
-            self.message_html += await fill_out(
-                self.guild, start_message, [
-                    ("REFERENCE_SYMBOL", followup_symbol, ParseMode.NONE),
-                    ("REFERENCE", self.reference if self.message.reference else self.interaction, ParseMode.NONE),
-                    ("AVATAR_URL", str(avatar_url), ParseMode.NONE),
-                    ("NAME_TAG", discriminator(self.message.author), ParseMode.NONE),
-                    ("USER_ID", str(self.message.author.id)),
-                    ("USER_COLOUR", await self._gather_user_colour(self.message.author)),
-                    ("USER_ICON", await self._gather_user_icon(self.message.author), ParseMode.NONE),
-                    ("NAME", html.escape(self.message.author.display_name)),
-                    ("APP_TAG", is_app, ParseMode.NONE),
-                    ("TIMESTAMP", self.message_created_at),
-                    ("MESSAGE_ID", str(self.message.id)),
-                    ("MESSAGE_CONTENT", self.message.content, ParseMode.NONE),
-                    ("EMBEDS", self.embeds, ParseMode.NONE),
-                    ("ATTACHMENTS", self.attachments, ParseMode.NONE),
-                    ("COMPONENTS", self.components, ParseMode.NONE),
-                    ("EMOJI", self.reactions, ParseMode.NONE),
-                ],
+            self.fragments.append(
+                await fill_out(
+                    self.guild, start_message, [
+                        ("REFERENCE_SYMBOL", followup_symbol, ParseMode.NONE),
+                        ("REFERENCE", self.reference if self.message.reference else self.interaction, ParseMode.NONE),
+                        ("AVATAR_URL", str(avatar_url), ParseMode.NONE),
+                        ("NAME_TAG", discriminator(self.message.author), ParseMode.NONE),
+                        ("USER_ID", str(self.message.author.id)),
+                        ("USER_COLOUR", await self._gather_user_colour(self.message.author)),
+                        ("USER_ICON", await self._gather_user_icon(self.message.author), ParseMode.NONE),
+                        ("NAME", html.escape(self.message.author.display_name)),
+                        ("APP_TAG", is_app, ParseMode.NONE),
+                        ("TIMESTAMP", self.message_created_at),
+                        ("MESSAGE_ID", str(self.message.id)),
+                        ("MESSAGE_CONTENT", self.content, ParseMode.NONE),
+                        ("EMBEDS", self.embeds, ParseMode.NONE),
+                        ("ATTACHMENTS", self.attachments, ParseMode.NONE),
+                        ("COMPONENTS", self.components, ParseMode.NONE),
+                        ("EMOJI", self.reactions, ParseMode.NONE),
+                    ],
+                ),
             )
             return True
 
         return False
 
     async def build_pin_template(self) -> None:
-        self.message_html += await fill_out(
-            self.guild, message_pin, [
-                ("PIN_URL", DiscordIcons.pinned_message_icon, ParseMode.NONE),
-                ("USER_COLOUR", await self._gather_user_colour(self.message.author)),
-                ("NAME", str(html.escape(self.message.author.display_name))),
-                ("NAME_TAG", discriminator(self.message.author), ParseMode.NONE),
-                ("MESSAGE_ID", str(self.message.id), ParseMode.NONE),
-                (
-                    "REF_MESSAGE_ID", str(self.message.reference.message_id)
-                    if self.message.reference else "", ParseMode.NONE,
-                ),
-            ],
+        self.fragments.append(
+            await fill_out(
+                self.guild, message_pin, [
+                    ("PIN_URL", DiscordIcons.pinned_message_icon, ParseMode.NONE),
+                    ("USER_COLOUR", await self._gather_user_colour(self.message.author)),
+                    ("NAME", str(html.escape(self.message.author.display_name))),
+                    ("NAME_TAG", discriminator(self.message.author), ParseMode.NONE),
+                    ("MESSAGE_ID", str(self.message.id), ParseMode.NONE),
+                    (
+                        "REF_MESSAGE_ID", str(self.message.reference.message_id)
+                        if self.message.reference else "", ParseMode.NONE,
+                    ),
+                ],
+            ),
         )
 
     async def build_thread_template(self):
-        self.message_html += await fill_out(
-            self.guild, message_thread, [
-                (
-                    "THREAD_URL", DiscordIcons.thread_channel_icon,
-                    ParseMode.NONE,
-                ),
-                ("THREAD_NAME", self.message.content, ParseMode.NONE),
-                ("USER_COLOUR", await self._gather_user_colour(self.message.author)),
-                ("NAME", str(html.escape(self.message.author.display_name))),
-                ("NAME_TAG", discriminator(self.message.author), ParseMode.NONE),
-                ("MESSAGE_ID", str(self.message.id), ParseMode.NONE),
-            ],
+        self.fragments.append(
+            await fill_out(
+                self.guild, message_thread, [
+                    (
+                        "THREAD_URL", DiscordIcons.thread_channel_icon,
+                        ParseMode.NONE,
+                    ),
+                    ("THREAD_NAME", self.content, ParseMode.NONE),
+                    ("USER_COLOUR", await self._gather_user_colour(self.message.author)),
+                    ("NAME", str(html.escape(self.message.author.display_name))),
+                    ("NAME_TAG", discriminator(self.message.author), ParseMode.NONE),
+                    ("MESSAGE_ID", str(self.message.id), ParseMode.NONE),
+                ],
+            ),
         )
 
     async def build_remove(self) -> None:
         removed_member = self.message.mentions[0]
-        self.message_html += await fill_out(
-            self.guild, message_thread_remove, [
-                ("THREAD_URL", DiscordIcons.thread_remove_recipient, ParseMode.NONE),
-                ("USER_COLOUR", await self._gather_user_colour(self.message.author)),
-                ("NAME", str(html.escape(self.message.author.display_name))),
-                ("NAME_TAG", discriminator(self.message.author), ParseMode.NONE),
-                ("RECIPIENT_USER_COLOUR", await self._gather_user_colour(removed_member)),
-                ("RECIPIENT_NAME", str(html.escape(removed_member.display_name))),
-                ("RECIPIENT_NAME_TAG", discriminator(removed_member), ParseMode.NONE),
-                ("MESSAGE_ID", str(self.message.id), ParseMode.NONE),
-            ],
+        self.fragments.append(
+            await fill_out(
+                self.guild, message_thread_remove, [
+                    ("THREAD_URL", DiscordIcons.thread_remove_recipient, ParseMode.NONE),
+                    ("USER_COLOUR", await self._gather_user_colour(self.message.author)),
+                    ("NAME", str(html.escape(self.message.author.display_name))),
+                    ("NAME_TAG", discriminator(self.message.author), ParseMode.NONE),
+                    ("RECIPIENT_USER_COLOUR", await self._gather_user_colour(removed_member)),
+                    ("RECIPIENT_NAME", str(html.escape(removed_member.display_name))),
+                    ("RECIPIENT_NAME_TAG", discriminator(removed_member), ParseMode.NONE),
+                    ("MESSAGE_ID", str(self.message.id), ParseMode.NONE),
+                ],
+            ),
         )
 
     async def build_add(self) -> None:
         removed_member = self.message.mentions[0]
-        self.message_html += await fill_out(
-            self.guild, message_thread_add, [
-                ("THREAD_URL", DiscordIcons.thread_add_recipient, ParseMode.NONE),
-                ("USER_COLOUR", await self._gather_user_colour(self.message.author)),
-                ("NAME", str(html.escape(self.message.author.display_name))),
-                ("NAME_TAG", discriminator(self.message.author), ParseMode.NONE),
-                ("RECIPIENT_USER_COLOUR", await self._gather_user_colour(removed_member)),
-                ("RECIPIENT_NAME", str(html.escape(removed_member.display_name))),
-                ("RECIPIENT_NAME_TAG", discriminator(removed_member), ParseMode.NONE),
-                ("MESSAGE_ID", str(self.message.id), ParseMode.NONE),
-            ],
+        self.fragments.append(
+            await fill_out(
+                self.guild, message_thread_add, [
+                    ("THREAD_URL", DiscordIcons.thread_add_recipient, ParseMode.NONE),
+                    ("USER_COLOUR", await self._gather_user_colour(self.message.author)),
+                    ("NAME", str(html.escape(self.message.author.display_name))),
+                    ("NAME_TAG", discriminator(self.message.author), ParseMode.NONE),
+                    ("RECIPIENT_USER_COLOUR", await self._gather_user_colour(removed_member)),
+                    ("RECIPIENT_NAME", str(html.escape(removed_member.display_name))),
+                    ("RECIPIENT_NAME_TAG", discriminator(removed_member), ParseMode.NONE),
+                    ("MESSAGE_ID", str(self.message.id), ParseMode.NONE),
+                ],
+            ),
         )
 
-    @cache()
-    async def _gather_member(self, author: discord.abc.User) -> Optional[discord.Member]:
-        if not self.guild:
-            return None
-
-        member = self.guild.get_member(author.id)
-        if member:
-            return member
-
-        try:
-            return await self.guild.fetch_member(author.id)
-        except Exception:
-            return None
-
     async def _gather_user_colour(self, author: discord.abc.User) -> str:
-        member = await self._gather_member(author)
+        member = await _gather_member(self.guild, author)
         user_colour = member.colour if member and str(
             member.colour,
         ) != "#000000" else "#FFFFFF"
@@ -452,7 +742,7 @@ class MessageConstruct:
 
     async def _gather_user_icon(self, author: discord.abc.User) -> str:
         url = ""
-        member = await self._gather_member(author)
+        member = await _gather_member(self.guild, author)
         if not member:
             return url
 
@@ -474,55 +764,380 @@ class MessageConstruct:
         return created_at_str, edited_at_str
 
 
-async def gather_messages(messages: List[discord.Message], guild: Optional[discord.Guild], military_time: bool, attachment_handler: Optional[AttachmentHandler]) -> Tuple[str, Dict[int, List[Any]]]:
-    message_html: str = ""
-    meta_data: Dict[int, List[Any]] = {}
-    previous_message: Optional[discord.Message] = None
+class _OrderedRenderer:
+    """Builds the Bodies of Up to `concurrency` Messages at Once, & Lays them Out in Order"""
+
+    def __init__(
+        self,
+        guild: Optional[discord.Guild],
+        sink: Optional[TranscriptSink],
+        checkpoint: Optional[ExportCheckpoint],
+        checkpoint_interval: int,
+        concurrency: int,
+        render_pool: Optional[RenderPool],
+    ) -> None:
+        self.guild = guild
+        self.sink = sink
+        self.checkpoint = checkpoint
+        self.checkpoint_interval = checkpoint_interval
+        self.concurrency = max(1, concurrency)
+        self.render_pool = render_pool
+
+        # Streamed HTML isn't Kept (a Checkpoint Appends it to its Own File)
+        self.fragments: List[str] = []
+
+        self.meta_data: Dict[int, List[Any]] = {}
+        self.previous_message: Optional[discord.Message] = None
+        self.message_count = 0
+        self.menu_div_id = RenderContext.current().menu_div_id
+
+        # The Messages whose Bodies are Being Built (or Waiting to be Laid Out), & How Many were Added
+        self.building: Dict[int, MessageConstruct] = {}
+        self._added = 0
+        self._pending: Deque[Tuple[MessageConstruct, "asyncio.Future[None]"]] = deque()
+
+        # Messages Held Back while their Batch is Rendered by the Render Pool
+        self._held: Deque[MessageConstruct] = deque()
+        self._jobs: List[RenderJob] = []
+
+    async def begin(self) -> None:
+        if not self.checkpoint:
+            return
+
+        for content_html in self.checkpoint.read_html():
+            await self._write(content_html, checkpoint=False)
+        self.meta_data = self.checkpoint.meta_data
+        self.previous_message = self.checkpoint.previous_message  # type: ignore
+        self.message_count = self.checkpoint.message_count
+
+    async def add(self, construct: MessageConstruct) -> None:
+        construct.position = self._added
+        self._added += 1
+        if self.render_pool is None:
+            await self._build(construct)
+            return
+
+        self._held.append(construct)
+        if not construct.is_audit and construct.cached_body is None:
+            self._jobs.append(_render_job(construct.message))
+
+        # A Batch is Submitted Once Full, or Once as Many Messages Again are Held Back Behind it
+        batch_size = self.render_pool.batch_size
+        if len(self._jobs) >= batch_size or len(self._held) >= batch_size * 2:
+            self._submit()
+
+        while self._held and self._releasable(self._held[0]):
+            await self._build(self._held.popleft())
+
+    async def finish(self) -> str:
+        self._submit()
+        while self._held:
+            await self._build(self._held.popleft())
+
+        while self._pending:
+            await self._lay_out_next()
+
+        if self.checkpoint:
+            self._record()
+
+        await self._write("</div>", checkpoint=False)
+        return "".join(self.fragments)
+
+    def _releasable(self, construct: MessageConstruct) -> bool:
+        assert self.render_pool is not None
+        if construct.is_audit or construct.cached_body is not None:
+            # Needs Nothing from the Workers
+            return True
+
+        # Keeps the Next Batch Rendering in the Workers while this One is Laid Out
+        submitted = not self._jobs or self._jobs[0][0] != construct.message.id
+        return submitted and len(self._held) > self.render_pool.batch_size
+
+    def _submit(self) -> None:
+        if self.render_pool and self._jobs:
+            self.render_pool.submit(self.guild, self._jobs)
+            self._jobs = []
+
+    async def _build(self, construct: MessageConstruct) -> None:
+        if self.concurrency == 1:
+            await construct.build_body()
+            await self._lay_out(construct)
+            return
+
+        body = construct.body = asyncio.ensure_future(construct.build_body())
+        self.building[construct.message.id] = construct
+        self._pending.append((construct, body))
+
+        while len(self._pending) > self.concurrency:
+            await self._lay_out_next()
+
+    async def close(self) -> None:
+        """Cancels the Bodies Still Being Built, After an Error"""
+
+        bodies = [body for _, body in self._pending]
+        self._pending.clear()
+        for body in bodies:
+            body.cancel()
+        await asyncio.gather(*bodies, return_exceptions=True)
+
+    async def _lay_out_next(self) -> None:
+        construct, body = self._pending.popleft()
+        try:
+            await body
+        finally:
+            self.building.pop(construct.message.id, None)
+        await self._lay_out(construct)
+
+    async def _lay_out(self, construct: MessageConstruct) -> None:
+        content_html, self.meta_data = await construct.build_layout()
+        await self._write(content_html)
+
+        self.previous_message = construct.message
+        self.menu_div_id = construct.menu_div_ids.stop - 1
+        self.message_count += 1
+
+        if self.checkpoint and self.message_count % self.checkpoint_interval == 0:
+            self._record()
+            self.checkpoint.save()
+
+    async def _write(self, content_html: str, checkpoint: bool = True) -> None:
+        if self.sink is None:
+            self.fragments.append(content_html)
+        if self.sink is None and not (checkpoint and self.checkpoint):
+            return
+
+        content_html = ParseMarkdown.reverse_code_block_markdown(content_html)
+        if self.sink:
+            await self.sink.write(content_html)
+        if checkpoint and self.checkpoint:
+            self.checkpoint.append(content_html)
+
+    def _record(self) -> None:
+        assert self.checkpoint is not None
+        self.checkpoint.record(
+            self.meta_data, self.previous_message, self.message_count, self.menu_div_id,
+        )
+
+
+async def _gather_starter_message(first_message: discord.Message, guild: Optional[discord.Guild]) -> Optional[discord.Message]:
+    if not isinstance(first_message.channel, discord.Thread) or not first_message.reference:
+        return None
+
+    starter_message = first_message.channel.starter_message
+    if not starter_message:
+        assert guild is not None
+        channel: Optional[discord.TextChannel] = first_message.channel.parent or guild.get_channel(  # type: ignore
+            first_message.channel.parent_id,
+        )
+        if not channel:
+            try:
+                channel = await guild.fetch_channel(
+                    first_message.channel.parent_id,  # type: ignore
+                )
+            except discord.NotFound:
+                pass
+
+        if channel:
+            try:
+                starter_message = await channel.fetch_message(
+                    first_message.channel.id,
+                )
+            except discord.NotFound:
+                pass
+
+    if starter_message:
+        starter_message.reference = None
+    return starter_message
+
+
+async def gather_messages(
+    messages: List[discord.Message],
+    guild: Optional[discord.Guild],
+    military_time: bool,
+    attachment_handler: Optional[AttachmentHandler],
+    *,
+    checkpoint: Optional[ExportCheckpoint] = None,
+    checkpoint_interval: int = 1000,
+    sink: Optional[TranscriptSink] = None,
+    concurrency: int = 1,
+    render_pool: Optional[RenderPool] = None,
+    fragment_cache: Optional[FragmentCache] = None,
+) -> Tuple[str, Dict[int, List[Any]]]:
+    renderer = _OrderedRenderer(
+        guild, sink, checkpoint, checkpoint_interval, concurrency, render_pool,
+    )
+    await renderer.begin()
+
+    previous_message = renderer.previous_message
     starter_message: Optional[discord.Message] = None
 
     message_dict = {message.id: message for message in messages}
 
-    if messages and isinstance(messages[0].channel, discord.Thread) and messages[0].reference:
-        starter_message = messages[0].channel.starter_message
-        if not starter_message:
-            assert guild is not None
-            channel: Optional[discord.TextChannel] = messages[0].channel.parent or guild.get_channel(  # type: ignore
-                messages[0].channel.parent_id,
+    if messages and previous_message is None:
+        starter_message = await _gather_starter_message(messages[0], guild)
+        if starter_message:
+            messages[0] = starter_message
+
+    await _MemberPrefetcher(guild).prefetch(messages)
+
+    try:
+        for message in messages:
+            await renderer.add(
+                MessageConstruct(
+                    message,
+                    starter_message,
+                    previous_message,
+                    military_time,
+                    guild,
+                    renderer.meta_data,
+                    message_dict,
+                    attachment_handler,
+                    renderer.building,
+                    render_pool,
+                    fragment_cache,
+                ),
             )
-            if not channel:
-                try:
-                    channel = await guild.fetch_channel(
-                        messages[0].channel.parent_id,  # type: ignore
-                    )
-                except discord.NotFound:
-                    pass
+            previous_message = message
+
+        message_html = await renderer.finish()
+    finally:
+        await renderer.close()
+
+    return message_html, renderer.meta_data
+
+
+async def stream_messages(
+    history: AsyncIterator[discord.Message],
+    guild: Optional[discord.Guild],
+    military_time: bool,
+    attachment_handler: Optional[AttachmentHandler],
+    *,
+    queue_size: int = 500,
+    checkpoint: Optional[ExportCheckpoint] = None,
+    checkpoint_interval: int = 1000,
+    sink: Optional[TranscriptSink] = None,
+    concurrency: int = 1,
+    render_pool: Optional[RenderPool] = None,
+    fragment_cache: Optional[FragmentCache] = None,
+) -> Tuple[str, Dict[int, List[Any]], int]:
+    """
+    Renders the Messages while they are Still Being Fetched
+
+    A Producer Task Pulls the History into a Bounded Queue, so Fetching & Rendering Overlap
+    & Only `queue_size` Un-Rendered Messages are Held at Once. References are Resolved
+    Against a Window of Recent Messages, Falling Back to Fetching. The Members the Messages
+    Refer To are Prefetched in Bulk, 100 Messages at a Time.
+
+    Parameters
+    ----------
+    history: AsyncIterator[:class:`discord.Message`]
+        The Messages to Render, Oldest First
+    guild: Optional[:class:`discord.Guild`]
+        The Guild the Messages are From
+    military_time: :class:`bool`
+        Whether to Use Military Time
+    attachment_handler: Optional[:class:`AttachmentHandler`]
+        The Attachment Handler to Use
+    queue_size: :class:`int`
+        The Maximum Number of Fetched Messages Waiting to be Rendered
+    checkpoint: Optional[:class:`ExportCheckpoint`]
+        The Checkpoint to Continue From & Record Progress To
+    checkpoint_interval: :class:`int`
+        The Number of Messages Between Saving the Checkpoint
+    sink: Optional[:class:`TranscriptSink`]
+        The Sink to Write Each Message To as it's Rendered, Instead of Returning the HTML
+        (Which is then Only Kept if Checkpointed)
+    concurrency: :class:`int`
+        The Maximum Number of Message Bodies Built at Once (Laid Out in Order)
+    render_pool: Optional[:class:`RenderPool`]
+        The Worker Processes to Render the Content & Embeds of the Messages In
+    fragment_cache: Optional[:class:`FragmentCache`]
+        The Cache of Message Bodies Rendered by Earlier Exports
+
+    Returns
+    -------
+    Tuple[:class:`str`, Dict[:class:`int`, List[Any]], :class:`int`]
+        The Message HTML, the Meta Data & the Number of Messages Rendered (Including Those
+        of the Checkpoint)
+    """
+
+    queue: "asyncio.Queue[Optional[discord.Message]]" = asyncio.Queue(
+        maxsize=queue_size,
+    )
+    prefetcher = _MemberPrefetcher(guild)
+
+    async def put(batch: List[discord.Message]) -> None:
+        await prefetcher.prefetch(batch)
+        for message in batch:
+            await queue.put(message)
+
+    async def producer() -> None:
+        batch: List[discord.Message] = []
+        try:
+            async for message in history:
+                batch.append(message)
+                if len(batch) >= prefetcher.chunk_size:
+                    await put(batch)
+                    batch = []
+            await put(batch)
+        except Exception:
+            await queue.put(None)
+            raise
+        await queue.put(None)
+
+    renderer = _OrderedRenderer(
+        guild, sink, checkpoint, checkpoint_interval, concurrency, render_pool,
+    )
+    await renderer.begin()
+
+    previous_message = renderer.previous_message
+    starter_message: Optional[discord.Message] = None
+    held = render_pool.batch_size * 2 if render_pool else 0
+    recent_messages = _RecentMessages(queue_size + renderer.concurrency + held)
 
-            if channel:
+    producer_task = asyncio.create_task(producer())
+    try:
+        try:
+            while True:
+                message = await queue.get()
+                if message is None:
+                    break
+
+                if previous_message is None:
+                    starter_message = await _gather_starter_message(message, guild)
+                    if starter_message:
+                        message = starter_message
+
+                recent_messages.add(message)
+                await renderer.add(
+                    MessageConstruct(
+                        message,
+                        starter_message,
+                        previous_message,
+                        military_time,
+                        guild,
+                        renderer.meta_data,
+                        recent_messages,
+                        attachment_handler,
+                        renderer.building,
+                        render_pool,
+                        fragment_cache,
+                    ),
+                )
+                previous_message = message
+        finally:
+            if not producer_task.done():
+                producer_task.cancel()
                 try:
-                    starter_message = await channel.fetch_message(
-                        messages[0].channel.id,
-                    )
-                except discord.NotFound:
+                    await producer_task
+                except asyncio.CancelledError:
                     pass
 
-        if starter_message:
-            messages[0] = starter_message
-            messages[0].reference = None
-
-    for message in messages:
-        content_html, meta_data = await MessageConstruct(
-            message,
-            starter_message,
-            previous_message,
-            military_time,
-            guild,
-            meta_data,
-            message_dict,
-            attachment_handler,
-        ).construct_message()
-
-        message_html += content_html
-        previous_message = message
-
-    message_html += "</div>"
-    return message_html, meta_data
+        # Re-Raise Any Error from Fetching the History
+        await producer_task
+
+        message_html = await renderer.finish()
+    finally:
+        await renderer.close()
+
+    return message_html, renderer.meta_data, renderer.message_count
@@ -0,0 +1,285 @@
+import discord
+
+import asyncio
+import html
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from ..construct import Embed
+from ..ext import (
+    Lookups,
+    ParseMode,
+    RenderContext,
+    check_emoji,
+    fill_out,
+    message_content,
+    store_valid_srcs,
+)
+from ..parse import MentionResolver, ParseMarkdown, ParseMention, prefetch_users
+
+# The ID, Raw Content, Edited Tag & Embeds (as Dicts) of a Message
+RenderJob = Tuple[int, str, str, List[Dict[str, Any]]]
+# The Content & Embeds HTML of a Message
+RenderedBody = Tuple[str, str]
+
+
+async def render_content(guild: Optional[discord.Guild], content: str, edited: str) -> str:
+    """
+    Renders the Content of a Message
+
+    Parameters
+    ----------
+    guild: Optional[:class:`discord.Guild`]
+        The Guild to Resolve Mentions Against
+    content: :class:`str`
+        The Raw Content of the Message
+    edited: :class:`str`
+        The Edited Tag of the Message (Empty if it was Never Edited)
+
+    Returns
+    -------
+    :class:`str`
+        The Content HTML
+    """
+
+    return await fill_out(
+        guild, message_content, [
+            ("MESSAGE_CONTENT", html.escape(content), ParseMode.MARKDOWN),
+            ("EDIT", edited, ParseMode.NONE),
+        ],
+    )
+
+
+def _strings(obj: Any) -> Iterator[str]:
+    if isinstance(obj, str):
+        yield obj
+    elif isinstance(obj, dict):
+        for value in obj.values():
+            yield from _strings(value)
+    elif isinstance(obj, (list, tuple)):
+        for value in obj:
+            yield from _strings(value)
+
+
+class GuildSnapshot:
+    """A Picklable Stand-In for a Guild, Holding Only What the Mentions of Some Messages Resolve To"""
+
+    def __init__(self) -> None:
+        self.channels: Dict[int, SimpleNamespace] = {}
+        self.members: Dict[int, SimpleNamespace] = {}
+        self.roles: Dict[int, SimpleNamespace] = {}
+
+    def get_channel(self, channel_id: int) -> Optional[SimpleNamespace]:
+        return self.channels.get(channel_id)
+
+    def get_member(self, member_id: int) -> Optional[SimpleNamespace]:
+        return self.members.get(member_id)
+
+    def get_role(self, role_id: int) -> Optional[SimpleNamespace]:
+        return self.roles.get(role_id)
+
+    @property
+    def names(self) -> List[str]:
+        """The Names Mentions are Replaced With, which May Themselves Hold Emoji"""
+
+        return [
+            *(channel.name for channel in self.channels.values()),
+            *(member.display_name for member in self.members.values()),
+            *(role.name for role in self.roles.values()),
+        ]
+
+    @classmethod
+    async def resolve(cls, guild: Optional[discord.Guild], texts: List[str]) -> "GuildSnapshot":
+        """
+        Resolves Every Mention in the Texts with the Parser's Resolver, Fetching Unknown
+        Users Through its Cached Lookup
+
+        Parameters
+        ----------
+        guild: Optional[:class:`discord.Guild`]
+            The Guild to Resolve Mentions Against
+        texts: List[:class:`str`]
+            The Texts to Find Mentions In
+
+        Returns
+        -------
+        :class:`GuildSnapshot`
+            The Resolved Channels, Members & Roles
+        """
+
+        snapshot = cls()
+        found: Set[Tuple[str, int]] = set()
+        for text in texts:
+            for match in ParseMention.REGEX_MENTIONS.finditer(text):
+                kind = (match.lastgroup or "").replace("_2", "")
+                if kind in ("channel", "member", "role"):
+                    found.add((kind, int(match.group(match.lastgroup))))  # type: ignore
+
+        # Resolved Like the Parser Would, Through the Same (Cached) User Lookup
+        await prefetch_users(guild, (i for kind, i in found if kind == "member"))
+        resolver = MentionResolver(guild, Lookups())
+
+        for kind, object_id in found:
+            if kind == "channel":
+                channel = resolver.find_channel(object_id)
+                if channel is not None:
+                    snapshot.channels[object_id] = SimpleNamespace(
+                        id=channel.id, name=channel.name,
+                    )
+            elif kind == "role":
+                role = resolver.find_role(object_id)
+                if role is not None:
+                    snapshot.roles[object_id] = SimpleNamespace(
+                        name=role.name, color=discord.Colour(role.color.value),
+                    )
+            else:
+                member = resolver.find_member(object_id)
+                if member:
+                    snapshot.members[object_id] = SimpleNamespace(
+                        display_name=member.display_name,
+                    )
+
+        return snapshot
+
+
+async def _render_jobs(
+    jobs: List[RenderJob],
+    snapshot: GuildSnapshot,
+    valid_srcs: Dict[str, Optional[bool]],
+) -> Tuple[Dict[int, RenderedBody], Dict[str, str]]:
+    # Each Chunk Numbers its Code Blocks (& Memoizes Embeds Referring to them) Afresh
+    context = RenderContext()
+    with context.activate():
+        store_valid_srcs(valid_srcs)
+
+        rendered: Dict[int, RenderedBody] = {}
+        for message_id, content, edited, embeds in jobs:
+            content_html = ""
+            if content:
+                content_html = await render_content(
+                    snapshot, content, edited,  # type: ignore
+                )
+            embeds_html = "".join([
+                await Embed.flow(
+                    snapshot, embed=discord.Embed.from_dict(e),  # type: ignore
+                )
+                for e in embeds
+            ])
+            rendered[message_id] = (content_html, embeds_html)
+
+    # Code Blocks are Restored Only Once the Document is Complete, so they're Handed Back
+    return rendered, context.code_blocks
+
+
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _render_chunk(
+    jobs: List[RenderJob],
+    snapshot: GuildSnapshot,
+    valid_srcs: Dict[str, Optional[bool]],
+) -> Tuple[Dict[int, RenderedBody], Dict[str, str]]:
+    global _worker_loop
+    if _worker_loop is None:
+        _worker_loop = asyncio.new_event_loop()
+    return _worker_loop.run_until_complete(_render_jobs(jobs, snapshot, valid_srcs))
+
+
+class RenderPool:
+    """Renders the Content & Embeds of Messages in Worker Processes, for Large (CPU-Bound) Exports"""
+
+    def __init__(self, processes: int, chunk_size: int = 200) -> None:
+        """
+        Parameters
+        ----------
+        processes: :class:`int`
+            The Number of Worker Processes
+        chunk_size: :class:`int`
+            The Number of Messages Sent to a Worker at Once
+        """
+
+        self.processes = max(1, processes)
+        self.chunk_size = max(1, chunk_size)
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._chunks: Dict[int, "asyncio.Future[Dict[int, RenderedBody]]"] = {}
+
+    @property
+    def batch_size(self) -> int:
+        """The Number of Messages that Keeps Every Worker Busy"""
+
+        return self.processes * self.chunk_size
+
+    def submit(self, guild: Optional[discord.Guild], jobs: List[RenderJob]) -> None:
+        """
+        Starts Rendering the Messages in the Workers, a Chunk at a Time
+
+        Parameters
+        ----------
+        guild: Optional[:class:`discord.Guild`]
+            The Guild the Messages are From
+        jobs: List[:class:`RenderJob`]
+            The Messages to Render
+        """
+
+        for i in range(0, len(jobs), self.chunk_size):
+            chunk = jobs[i:i + self.chunk_size]
+            future = asyncio.ensure_future(self._render(guild, chunk))
+            for job in chunk:
+                self._chunks[job[0]] = future
+
+    async def rendered(self, message_id: int) -> Optional[RenderedBody]:
+        """
+        Waits for the Message to be Rendered
+
+        Parameters
+        ----------
+        message_id: :class:`int`
+            The ID of the Message
+
+        Returns
+        -------
+        Optional[:class:`RenderedBody`]
+            The Content & Embeds HTML, or None if the Message was Never Submitted
+        """
+
+        future = self._chunks.pop(message_id, None)
+        if future is None:
+            return None
+        return (await future)[message_id]
+
+    async def close(self) -> None:
+        """Cancels the Chunks Still Being Rendered & Stops the Workers"""
+
+        futures = set(self._chunks.values())
+        self._chunks.clear()
+        for future in futures:
+            future.cancel()
+        await asyncio.gather(*futures, return_exceptions=True)
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def _render(self, guild: Optional[discord.Guild], jobs: List[RenderJob]) -> Dict[int, RenderedBody]:
+        # The Workers Can't Reach the Client, so Mentions & Emoji are Resolved Up-Front
+        texts = [text for job in jobs for text in _strings(job[1:])]
+        snapshot = await GuildSnapshot.resolve(guild, texts)
+        valid_srcs = await check_emoji(texts + snapshot.names)
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.processes)
+
+        rendered, code_blocks = await asyncio.get_running_loop().run_in_executor(
+            self._executor, _render_chunk, jobs, snapshot, valid_srcs,
+        )
+        renamed = ParseMarkdown.import_code_blocks(code_blocks)
+        return {
+            message_id: (
+                ParseMarkdown.rename_code_blocks(content_html, renamed),
+                ParseMarkdown.rename_code_blocks(embeds_html, renamed),
+            )
+            for message_id, (content_html, embeds_html) in rendered.items()
+        }
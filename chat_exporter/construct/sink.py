@@ -0,0 +1,186 @@
+import asyncio
+import os
+import pathlib
+
+from typing import IO, AsyncIterator, List, Optional, Union
+
+
+class TranscriptSink:
+    """The Destination a Transcript is Streamed To, as it's Rendered"""
+
+    def __init__(self, chunk_size: int = 65536) -> None:
+        """
+        Parameters
+        ----------
+        chunk_size: :class:`int`
+            The Number of Bytes Buffered Before Each Write
+        """
+
+        self.chunk_size = chunk_size
+        self._buffer: List[bytes] = []
+        self._buffered = 0
+
+    async def write(self, html: str) -> None:
+        """
+        Buffers the Next Part of the Transcript, Writing it Once the Buffer is Full
+
+        Parameters
+        ----------
+        html: :class:`str`
+            The Next Part of the Transcript
+        """
+
+        data = html.encode()
+        self._buffer.append(data)
+        self._buffered += len(data)
+        if self._buffered >= self.chunk_size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Writes Everything Buffered so Far"""
+
+        if not self._buffer:
+            return
+
+        data = b"".join(self._buffer)
+        self._buffer = []
+        self._buffered = 0
+        await self.write_chunk(data)
+
+    async def write_chunk(self, data: bytes) -> None:
+        """
+        Writes a Chunk of the Encoded Transcript
+
+        Parameters
+        ----------
+        data: :class:`bytes`
+            The Chunk to Write
+
+        Raises
+        ------
+        :class:`NotImplementedError`
+            This Method Must be Implemented in a Subclass
+        """
+
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        """Flushes the Buffer Once the Transcript is Complete"""
+
+        await self.flush()
+
+    async def abort(self, error: BaseException) -> None:
+        """
+        Discards the Buffer of a Transcript that Failed
+
+        Parameters
+        ----------
+        error: :class:`BaseException`
+            The Error the Export Failed With
+        """
+
+        self._buffer = []
+        self._buffered = 0
+
+
+class FileSink(TranscriptSink):
+    """Streams the Transcript to a File Path or a Binary File Object"""
+
+    def __init__(self, fp: Union[str, "os.PathLike[str]", IO[bytes]], chunk_size: int = 65536) -> None:
+        """
+        Parameters
+        ----------
+        fp: Union[:class:`str`, :class:`os.PathLike`, IO[:class:`bytes`]]
+            The Path to Write the Transcript To (Replaced Only Once the Transcript is Complete),
+            or a Binary File Object (Left Open)
+        chunk_size: :class:`int`
+            The Number of Bytes Buffered Before Each Write
+        """
+
+        super().__init__(chunk_size)
+
+        self.path: Optional[pathlib.Path] = None
+        self._file: Optional[IO[bytes]] = None
+        if isinstance(fp, (str, os.PathLike)):
+            self.path = pathlib.Path(fp)
+        else:
+            self._file = fp
+
+    @property
+    def _temp_path(self) -> pathlib.Path:
+        assert self.path is not None
+        return self.path.with_name(self.path.name + ".tmp")
+
+    async def write_chunk(self, data: bytes) -> None:
+        if self._file is None:
+            self._file = open(self._temp_path, "wb")
+        self._file.write(data)
+
+    async def close(self) -> None:
+        await super().close()
+        if self.path is None:
+            return
+
+        if self._file is None:
+            self._file = open(self._temp_path, "wb")
+        self._file.close()
+        os.replace(self._temp_path, self.path)
+
+    async def abort(self, error: BaseException) -> None:
+        await super().abort(error)
+        if self.path is None or self._file is None:
+            return
+
+        self._file.close()
+        os.remove(self._temp_path)
+
+
+class StreamSink(TranscriptSink):
+    """Streams the Transcript as an Async Iterator of Bytes, e.g. for a Streaming HTTP Response"""
+
+    def __init__(self, chunk_size: int = 65536, max_chunks: int = 8) -> None:
+        """
+        Parameters
+        ----------
+        chunk_size: :class:`int`
+            The Number of Bytes Buffered Before Each Chunk is Yielded
+        max_chunks: :class:`int`
+            The Maximum Number of Chunks Waiting to be Consumed, Before Rendering Pauses
+        """
+
+        super().__init__(chunk_size)
+
+        self._chunks: "asyncio.Queue[Optional[bytes]]" = asyncio.Queue(
+            maxsize=max_chunks,
+        )
+        self._error: Optional[BaseException] = None
+
+    async def write_chunk(self, data: bytes) -> None:
+        await self._chunks.put(data)
+
+    async def close(self) -> None:
+        await super().close()
+        await self._chunks.put(None)
+
+    async def abort(self, error: BaseException) -> None:
+        await super().abort(error)
+        self._error = error
+
+        # The Consumer May Have Stopped Reading, so Never Wait for Room in the Queue
+        while True:
+            try:
+                self._chunks.put_nowait(None)
+            except asyncio.QueueFull:
+                self._chunks.get_nowait()
+            else:
+                break
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        while True:
+            data = await self._chunks.get()
+            if data is None:
+                break
+            yield data
+
+        if self._error is not None:
+            raise self._error
@@ -1,31 +1,56 @@
 import discord
 
+import asyncio
 import html
+import pathlib
 import pytz
 import re
 import traceback
+from contextlib import AsyncExitStack
 from datetime import datetime
 
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
 
-from ..construct import AttachmentHandler, Component, gather_messages
+from .checkpoint import ExportCheckpoint
+from .fragment_cache import FragmentCache
+from .history import partitioned_history
+from .message import gather_messages, stream_messages
+from .render_pool import RenderPool
+from .sink import TranscriptSink
+from ..construct import AttachmentHandler
 from ..ext import (
     DiscordIcons,
+    HTTPClient,
     ParseMode,
+    RenderContext,
     channel_subject,
+    channel_thread,
+    channel_threads,
     channel_topic,
-    clear_cache,
+    default_client,
     fill_out,
     meta_data_temp,
     total,
 )
-from ..parse import ParseMarkdown, pass_bot
+
+
+def _generation_summary(date_time: str, message_count: Optional[int]) -> str:
+    if message_count is None:
+        # The Count isn't Known Yet when Streaming a Pipelined Export
+        return f"This was Generated on {date_time}."
+    return f"This was Generated on {date_time} with {message_count} Messages."
+
+
+_total_before_messages, _total_after_messages = total.split("{{MESSAGES}}", 1)
 
 
 class TranscriptDAO:
     """The Transcript Data Access Object"""
 
     html: str
+    message_count: int
+    # The Messages whose Content Skipped the Mention & Markdown Parsers
+    fast_path_messages: int = 0
 
     def __init__(
         self,
@@ -37,6 +62,19 @@ class TranscriptDAO:
         after: Optional[datetime],
         bot: Optional[discord.Client],
         attachment_handler: Optional[Any],
+        pipeline: bool = False,
+        partitions: int = 1,
+        partition_concurrency: int = 4,
+        checkpoint: Optional[Union[str, pathlib.Path]] = None,
+        checkpoint_interval: int = 1000,
+        shared_cache: bool = False,
+        include_threads: bool = False,
+        thread_concurrency: int = 4,
+        thread_url: str = "transcript-{id}.html",
+        render_concurrency: int = 1,
+        render_processes: int = 0,
+        fragment_cache: Optional[FragmentCache] = None,
+        http_client: Optional[HTTPClient] = None,
     ):
         self.channel = channel
         self.messages = messages
@@ -45,6 +83,27 @@ class TranscriptDAO:
         self.before = before
         self.after = after
         self.bot = bot
+        self.pipeline = pipeline
+        self.partitions = partitions
+        self.partition_concurrency = partition_concurrency
+        self.checkpoint_path = checkpoint
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoint: Optional[ExportCheckpoint] = None
+        self.shared_cache = shared_cache
+        self.include_threads = include_threads
+        self.thread_concurrency = thread_concurrency
+        self.thread_url = thread_url
+        self.render_concurrency = render_concurrency
+        self.render_processes = render_processes
+        self.render_pool: Optional[RenderPool] = (
+            RenderPool(render_processes) if render_processes > 0 else None
+        )
+        self.fragment_cache = fragment_cache
+        self.http_client = http_client or default_client
+        # Everything the Transcript is Rendered With, Apart from Any Other Export
+        self.context = RenderContext(bot=bot, http_client=self.http_client)
+        self.threads: Dict[int, TranscriptDAO] = {}
+        self.thread_failures: Dict[int, Exception] = {}
 
         if attachment_handler and not isinstance(attachment_handler, AttachmentHandler):
             raise TypeError(
@@ -52,13 +111,20 @@ class TranscriptDAO:
             )
         self.attachment_handler = attachment_handler
 
-        if self.bot:
-            pass_bot(self.bot)
-
     @property
     def time_format(self) -> str:
         return "%A, %d %B %Y %H:%M" if self.military_time else "%A, %d %B %Y %I:%M %p"
 
+    @property
+    def http_clients(self) -> List[HTTPClient]:
+        """The Clients the Export Makes Requests With (Including its Attachment Handler's)"""
+
+        clients = [self.http_client]
+        handler_client = getattr(self.attachment_handler, "http_client", None)
+        if isinstance(handler_client, HTTPClient) and handler_client is not self.http_client:
+            clients.append(handler_client)
+        return clients
+
     @property
     def guild(self) -> Optional[discord.Guild]:
         if isinstance(self.channel, (discord.Thread, discord.abc.GuildChannel)):
@@ -96,25 +162,175 @@ class TranscriptDAO:
                     return self.channel.recipient.avatar.url
         return DiscordIcons.default_avatar
 
-    async def build_transcript(self):
-        assert self.messages is not None
+    async def export_threads(self) -> None:
+        return
 
-        message_html, meta_data = await gather_messages(
-            self.messages,
-            self.guild,
-            self.military_time,
-            self.attachment_handler,
-        )
-        await self.export_transcript(message_html, meta_data)
-        clear_cache()
-        Component.MENU_DIV_ID = 0
-        ParseMarkdown.CODE_BLOCK_CONTENT = {}
+    async def build_transcript(self, history: Optional[AsyncIterator[discord.Message]] = None):
+        with self.context.activate():
+            return await self._build_transcript(history)
+
+    async def _build_transcript(self, history: Optional[AsyncIterator[discord.Message]]):
+        threads_task: Optional["asyncio.Future[None]"] = None
+        if self.include_threads:
+            threads_task = asyncio.ensure_future(self.export_threads())
+
+        try:
+            try:
+                message_html, meta_data = await self.build_messages(history)
+            except BaseException:
+                if threads_task:
+                    threads_task.cancel()
+                raise
+
+            if threads_task:
+                await threads_task
+
+            await self.export_transcript(message_html, meta_data)
+            if self.checkpoint:
+                self.checkpoint.save()
+        finally:
+            await self.close_render_pool()
+            if self.fragment_cache is not None:
+                self.fragment_cache.flush()
+            if self.checkpoint:
+                self.checkpoint.close()
+            self.fast_path_messages = self.context.fast_path_messages
+            # Shared Lookups are Cleared Once Every Transcript Sharing them is Done
+            self.context.reset(cache=not self.shared_cache)
         return self
 
-    async def export_transcript(self, message_html: str, meta_data: Dict[int, List[Any]]) -> None:
-        assert self.messages is not None
+    async def stream_transcript(
+        self,
+        sink: TranscriptSink,
+        history: Optional[AsyncIterator[discord.Message]] = None,
+    ):
+        """
+        Builds the Transcript Straight into the Sink, Without Holding the Whole Document
+
+        The Thread List Precedes the Messages, so Any Threads are Exported First.
 
-        meta_data_html: str = ""
+        Parameters
+        ----------
+        sink: :class:`TranscriptSink`
+            The Sink to Write the Transcript To
+        history: Optional[AsyncIterator[:class:`discord.Message`]]
+            The History to Render in Pipeline Mode
+        """
+
+        with self.context.activate():
+            return await self._stream_transcript(sink, history)
+
+    async def _stream_transcript(
+        self,
+        sink: TranscriptSink,
+        history: Optional[AsyncIterator[discord.Message]],
+    ):
+        try:
+            if self.include_threads:
+                await self.export_threads()
+
+            # Only a Pipelined History Doesn't Know its Length Up-Front
+            message_count: Optional[int] = None
+            if history is None:
+                assert self.messages is not None
+                message_count = len(self.messages)
+                if self.checkpoint:
+                    message_count += self.checkpoint.message_count
+
+            date_time = datetime.now(pytz.timezone("UTC")).isoformat()
+            document = await self.build_document(date_time)
+
+            await sink.write(
+                await fill_out(
+                    self.guild, _total_before_messages, [
+                        *document,
+                        (
+                            "GENERATION_SUMMARY",
+                            _generation_summary(date_time, message_count),
+                            ParseMode.NONE,
+                        ),
+                    ],
+                    finalise=True,
+                ),
+            )
+
+            _, meta_data = await self.build_messages(history, sink)
+
+            await sink.write(
+                await fill_out(
+                    self.guild, _total_after_messages, [
+                        *document,
+                        ("MESSAGE_COUNT", str(self.message_count)),
+                        ("META_DATA", await self.build_meta_data(meta_data), ParseMode.NONE),
+                        ("MESSAGE_PARTICIPANTS", str(len(meta_data)), ParseMode.NONE),
+                    ],
+                    finalise=True,
+                ),
+            )
+            if self.checkpoint:
+                self.checkpoint.save()
+        except BaseException as e:
+            await sink.abort(e)
+            raise
+        finally:
+            await self.close_render_pool()
+            if self.fragment_cache is not None:
+                self.fragment_cache.flush()
+            if self.checkpoint:
+                self.checkpoint.close()
+            self.fast_path_messages = self.context.fast_path_messages
+            self.context.reset(cache=not self.shared_cache)
+
+        await sink.close()
+        return self
+
+    async def build_messages(
+        self,
+        history: Optional[AsyncIterator[discord.Message]],
+        sink: Optional[TranscriptSink] = None,
+    ) -> Tuple[str, Dict[int, List[Any]]]:
+        if history is not None:
+            message_html, meta_data, self.message_count = await stream_messages(
+                history,
+                self.guild,
+                self.military_time,
+                self.attachment_handler,
+                checkpoint=self.checkpoint,
+                checkpoint_interval=self.checkpoint_interval,
+                sink=sink,
+                concurrency=self.render_concurrency,
+                render_pool=self.render_pool,
+                fragment_cache=self.fragment_cache,
+            )
+        else:
+            assert self.messages is not None
+
+            message_html, meta_data = await gather_messages(
+                self.messages,
+                self.guild,
+                self.military_time,
+                self.attachment_handler,
+                checkpoint=self.checkpoint,
+                checkpoint_interval=self.checkpoint_interval,
+                sink=sink,
+                concurrency=self.render_concurrency,
+                render_pool=self.render_pool,
+                fragment_cache=self.fragment_cache,
+            )
+            self.message_count = len(self.messages)
+            if self.checkpoint:
+                self.message_count = self.checkpoint.message_count
+
+        return message_html, meta_data
+
+    async def close_render_pool(self) -> None:
+        """Stops the Render Pool's Workers, if the Transcript Started Them (Threads Share Their Parent's)"""
+
+        if self.render_processes and self.render_pool:
+            await self.render_pool.close()
+
+    async def build_meta_data(self, meta_data: Dict[int, List[Any]]) -> str:
+        meta_data_html: List[str] = []
         for data in meta_data:
             creation_time: str = meta_data[int(data)][1].isoformat()
             joined_time: str = (
@@ -131,26 +347,45 @@ class TranscriptDAO:
             else:
                 guild_data = ""
 
-            meta_data_html += await fill_out(
-                self.guild, meta_data_temp, [
-                    ("USER_ID", str(data), ParseMode.NONE),
-                    (
-                        "USERNAME", user[:-5] if re.match(pattern, discrim)
-                        else user, ParseMode.NONE,
-                    ),
-                    ("DISCRIMINATOR", discrim if re.match(pattern, discrim) else ""),
-                    ("BOT", str(meta_data[int(data)][2]), ParseMode.NONE),
-                    ("CREATED_AT", str(creation_time), ParseMode.NONE),
-                    ("JOINED_AT", str(joined_time), ParseMode.NONE),
-                    ("GUILD_JOINED_AT", str(guild_data), ParseMode.NONE),
-                    ("DISCORD_ICON", str(DiscordIcons.logo), ParseMode.NONE),
-                    ("MEMBER_ID", str(data), ParseMode.NONE),
-                    ("USER_AVATAR", str(meta_data[int(data)][3]), ParseMode.NONE),
-                    ("DISPLAY", str(meta_data[int(data)][6]), ParseMode.NONE),
-                    ("MESSAGE_COUNT", str(meta_data[int(data)][4])),
-                ],
+            meta_data_html.append(
+                await fill_out(
+                    self.guild, meta_data_temp, [
+                        ("USER_ID", str(data), ParseMode.NONE),
+                        (
+                            "USERNAME", user[:-5] if re.match(pattern, discrim)
+                            else user, ParseMode.NONE,
+                        ),
+                        ("DISCRIMINATOR", discrim if re.match(pattern, discrim) else ""),
+                        ("BOT", str(meta_data[int(data)][2]), ParseMode.NONE),
+                        ("CREATED_AT", str(creation_time), ParseMode.NONE),
+                        ("JOINED_AT", str(joined_time), ParseMode.NONE),
+                        ("GUILD_JOINED_AT", str(guild_data), ParseMode.NONE),
+                        ("DISCORD_ICON", str(DiscordIcons.logo), ParseMode.NONE),
+                        ("MEMBER_ID", str(data), ParseMode.NONE),
+                        ("USER_AVATAR", str(meta_data[int(data)][3]), ParseMode.NONE),
+                        ("DISPLAY", str(meta_data[int(data)][6]), ParseMode.NONE),
+                        ("MESSAGE_COUNT", str(meta_data[int(data)][4])),
+                    ],
+                ),
             )
 
+        return "".join(meta_data_html)
+
+    async def build_document(self, date_time: str) -> List[Tuple[str, str, ParseMode]]:
+        """
+        Renders the Parts of the Document that Don't Depend on the Messages
+
+        Parameters
+        ----------
+        date_time: :class:`str`
+            The Time the Transcript was Generated
+
+        Returns
+        -------
+        List[Tuple[:class:`str`, :class:`str`, :class:`ParseMode`]]
+            The Replacements of the Document's Placeholders
+        """
+
         channel_creation_time = self.channel.created_at.isoformat()  # type: ignore
 
         raw_channel_topic = (
@@ -166,6 +401,29 @@ class TranscriptDAO:
                 ],
             )
 
+        channel_threads_html = ""
+        if self.threads:
+            threads_html = [
+                await fill_out(
+                    self.guild, channel_thread, [
+                        (
+                            "THREAD_URL",
+                            html.escape(self.thread_url.format(id=thread_id)),
+                            ParseMode.NONE,
+                        ),
+                        ("THREAD_ICON", DiscordIcons.thread_channel_icon, ParseMode.NONE),
+                        ("THREAD_NAME", thread.channel_name, ParseMode.NONE),
+                        ("MESSAGE_COUNT", str(thread.message_count), ParseMode.NONE),
+                    ],
+                )
+                for thread_id, thread in sorted(self.threads.items())
+            ]
+            channel_threads_html = await fill_out(
+                self.guild, channel_threads, [
+                    ("THREADS", "".join(threads_html), ParseMode.NONE),
+                ],
+            )
+
         if self.limit:
             limit = f"latest {self.limit} messages"
         else:
@@ -222,27 +480,40 @@ class TranscriptDAO:
                 # type: ignore
                 context = f"DM with {self.channel_name} ({self.channel.id})"
 
+        return [
+            ("TITLE", title, ParseMode.NONE),
+            ("CONTEXT", context, ParseMode.NONE),
+            ("SERVER_NAME", server_name, ParseMode.NONE),
+            ("GUILD_ID", str(guild_id), ParseMode.NONE),
+            ("SERVER_AVATAR_URL", str(self.channel_icon), ParseMode.NONE),
+            ("DATE_TIME", date_time, ParseMode.NONE),
+            ("SUBJECT", subject, ParseMode.NONE),
+            ("CHANNEL_TITLE", intro, ParseMode.NONE),
+            ("CHANNEL_NAME", self.channel_name, ParseMode.NONE),
+            ("CHANNEL_CREATED_AT", str(channel_creation_time), ParseMode.NONE),
+            ("CHANNEL_TOPIC", str(channel_topic_html), ParseMode.NONE),
+            ("CHANNEL_THREADS", channel_threads_html, ParseMode.NONE),
+            ("CHANNEL_ID", str(self.channel.id), ParseMode.NONE),  # type: ignore
+            ("CHANNEL_ICON", channel_icon, ParseMode.NONE),
+            ("CHANNEL_TYPE", channel_type, ParseMode.NONE),
+            ("TIME_FORMAT", time_format, ParseMode.NONE),
+        ]
+
+    async def export_transcript(self, message_html: str, meta_data: Dict[int, List[Any]]) -> None:
+        date_time = datetime.now(pytz.timezone("UTC")).isoformat()
+
         self.html = await fill_out(
             self.guild, total, [
-                ("TITLE", title, ParseMode.NONE),
-                ("CONTEXT", context, ParseMode.NONE),
-                ("SERVER_NAME", server_name, ParseMode.NONE),
-                ("GUILD_ID", str(guild_id), ParseMode.NONE),
-                ("SERVER_AVATAR_URL", str(self.channel_icon), ParseMode.NONE),
-                ("MESSAGE_COUNT", str(len(self.messages))),
+                *await self.build_document(date_time),
+                (
+                    "GENERATION_SUMMARY",
+                    _generation_summary(date_time, self.message_count),
+                    ParseMode.NONE,
+                ),
+                ("MESSAGE_COUNT", str(self.message_count)),
                 ("MESSAGES", message_html, ParseMode.NONE),
-                ("META_DATA", meta_data_html, ParseMode.NONE),
-                ("DATE_TIME", datetime.now(pytz.timezone("UTC")).isoformat(), ParseMode.NONE),
-                ("SUBJECT", subject, ParseMode.NONE),
-                ("CHANNEL_TITLE", intro, ParseMode.NONE),
-                ("CHANNEL_NAME", self.channel_name, ParseMode.NONE),
-                ("CHANNEL_CREATED_AT", str(channel_creation_time), ParseMode.NONE),
-                ("CHANNEL_TOPIC", str(channel_topic_html), ParseMode.NONE),
-                ("CHANNEL_ID", str(self.channel.id), ParseMode.NONE),  # type: ignore
-                ("CHANNEL_ICON", channel_icon, ParseMode.NONE),
-                ("CHANNEL_TYPE", channel_type, ParseMode.NONE),
+                ("META_DATA", await self.build_meta_data(meta_data), ParseMode.NONE),
                 ("MESSAGE_PARTICIPANTS", str(len(meta_data)), ParseMode.NONE),
-                ("TIME_FORMAT", time_format, ParseMode.NONE),
             ],
             finalise=True,
         )
@@ -251,16 +522,61 @@ class TranscriptDAO:
 class Transcript(TranscriptDAO):
     """The Transcript Builder"""
 
-    async def export(self) -> Optional[TranscriptDAO]:
-        if not self.messages:
-            self.messages = [
-                message async for message in self.channel.history(
-                    limit=self.limit,
-                    before=self.before,
-                    after=self.after,
-                    oldest_first=True if self.after is None else False,
-                )
-            ]
+    def history(self) -> AsyncIterator[discord.Message]:
+        after: Optional[Union[datetime, discord.abc.Snowflake]] = self.after
+        oldest_first = True if self.after is None else False
+        if self.checkpoint and self.checkpoint.last_message_id:
+            after = discord.Object(id=self.checkpoint.last_message_id)
+            oldest_first = True
+
+        if self.partitions > 1 and self.limit is None:
+            return partitioned_history(
+                self.channel,
+                before=self.before,
+                after=after,
+                oldest_first=oldest_first,
+                partitions=self.partitions,
+                max_concurrency=self.partition_concurrency,
+            )
+
+        return self.channel.history(
+            limit=self.limit,
+            before=self.before,
+            after=after,
+            oldest_first=oldest_first,
+        )
+
+    async def prepare(self) -> Optional[AsyncIterator[discord.Message]]:
+        """
+        Loads the Checkpoint & Fetches the Messages (or Channel) Needed for the Export
+
+        Returns
+        -------
+        Optional[AsyncIterator[:class:`discord.Message`]]
+            The History to Render in Pipeline Mode
+        """
+
+        if self.checkpoint_path:
+            self.checkpoint = ExportCheckpoint.load(
+                self.checkpoint_path, self.channel.id,  # type: ignore
+            )
+            self.context.menu_div_id = max(
+                self.context.menu_div_id, self.checkpoint.menu_div_id,
+            )
+
+            last_message_id = self.checkpoint.last_message_id
+            if self.messages and last_message_id:
+                self.messages = [
+                    message for message in self.messages if message.id > last_message_id
+                ]
+
+        if isinstance(self.channel, discord.ForumChannel):
+            # Forums Have No Messages of their Own, Only Posts (Threads)
+            self.messages = []
+            return None
+
+        if not self.messages and not self.pipeline:
+            self.messages = [message async for message in self.history()]
 
         fetch = False
         if isinstance(self.channel, discord.abc.PrivateChannel):
@@ -281,8 +597,122 @@ class Transcript(TranscriptDAO):
             else:
                 self.channel = channel
 
+        if not self.messages and self.pipeline:
+            return self.history()
+        return None
+
+    async def discover_threads(self) -> List[discord.Thread]:
+        """
+        Finds the Active & Archived (Public & Private) Threads of the Channel
+
+        Returns
+        -------
+        List[:class:`discord.Thread`]
+            The Threads, Oldest First
+        """
+
+        if not isinstance(self.channel, (discord.TextChannel, discord.ForumChannel)):
+            return []
+
+        threads: Dict[int, discord.Thread] = {
+            thread.id: thread for thread in self.channel.threads
+        }
+
+        try:
+            for thread in await self.channel.guild.active_threads():
+                if thread.parent_id == self.channel.id:
+                    threads[thread.id] = thread
+        except discord.HTTPException:
+            pass
+
+        archived = [self.channel.archived_threads(limit=None)]
+        if isinstance(self.channel, discord.TextChannel):
+            archived.append(self.channel.archived_threads(private=True, limit=None))
+
+        for iterator in archived:
+            try:
+                async for thread in iterator:
+                    threads[thread.id] = thread
+            except (discord.Forbidden, discord.NotFound):
+                pass
+
+        return [threads[thread_id] for thread_id in sorted(threads)]
+
+    async def export_threads(self) -> None:
+        semaphore = asyncio.Semaphore(max(1, self.thread_concurrency))
+
+        async def build(thread: discord.Thread) -> None:
+            transcript = Transcript(
+                channel=thread,
+                limit=None,
+                messages=None,
+                military_time=self.military_time,
+                before=None,
+                after=None,
+                bot=self.bot,
+                attachment_handler=self.attachment_handler,
+                pipeline=self.pipeline,
+                shared_cache=True,
+                render_concurrency=self.render_concurrency,
+                fragment_cache=self.fragment_cache,
+                http_client=self.http_client,
+            )
+            transcript.render_pool = self.render_pool
+            transcript.context.cache = self.context.cache
+            async with semaphore:
+                try:
+                    history = await transcript.prepare()
+                    self.threads[thread.id] = await transcript.build_transcript(history)
+                except Exception as e:
+                    self.thread_failures[thread.id] = e
+
+        await asyncio.gather(*(build(thread) for thread in await self.discover_threads()))
+
+    async def export(self) -> Optional[TranscriptDAO]:
+        async with AsyncExitStack() as stack:
+            for client in self.http_clients:
+                await stack.enter_async_context(client)
+            return await self._export()
+
+    async def _export(self) -> Optional[TranscriptDAO]:
+        history = await self.prepare()
+
+        try:
+            return await super().build_transcript(history)
+        except Exception:
+            traceback.print_exc()
+            print("An Un-Expected Error has Occurred!\nPlease Create a Bug Report & Send the Above Here: https://github.com/1337Syntax/DiscordChatExporterPy/issues")
+            return None
+
+    async def export_to(self, sink: TranscriptSink) -> Optional[TranscriptDAO]:
+        """
+        Exports the Transcript Straight into the Sink
+
+        Parameters
+        ----------
+        sink: :class:`TranscriptSink`
+            The Sink to Write the Transcript To
+
+        Returns
+        -------
+        Optional[:class:`TranscriptDAO`]
+            The Transcript (Without its HTML) if Successful
+        """
+
+        async with AsyncExitStack() as stack:
+            for client in self.http_clients:
+                await stack.enter_async_context(client)
+            return await self._export_to(sink)
+
+    async def _export_to(self, sink: TranscriptSink) -> Optional[TranscriptDAO]:
+        try:
+            history = await self.prepare()
+        except BaseException as e:
+            await sink.abort(e)
+            raise
+
         try:
-            return await super().build_transcript()
+            return await super().stream_transcript(sink, history)
         except Exception:
             traceback.print_exc()
             print("An Un-Expected Error has Occurred!\nPlease Create a Bug Report & Send the Above Here: https://github.com/1337Syntax/DiscordChatExporterPy/issues")
@@ -1,13 +1,25 @@
-from .cache import cache, clear_cache
+from .cache import (
+    CacheInfo,
+    CacheNamespace,
+    Lookups,
+    PersistentCache,
+    cache,
+    cache_info,
+    clear_cache,
+    use_persistent_cache,
+)
 from .discord_icons import DiscordIcons
 from .discriminator import discriminator
-from .emoji_convert import convert_emoji
+from .emoji_convert import check_emoji, convert_emoji, emojify, store_valid_srcs
 from .html_generator import (
     ParseMode,
+    PlainText,
     app_tag,
     app_tag_verified,
     audio_attachment,
     channel_subject,
+    channel_thread,
+    channel_threads,
     channel_topic,
     component_button,
     component_menu,
@@ -40,7 +52,10 @@ from .html_generator import (
     message_thread_remove,
     meta_data_temp,
     msg_attachment,
+    render,
     start_message,
     total,
     video_attachment,
 )
+from .http_client import HTTPClient, default_client
+from .render_context import RenderContext
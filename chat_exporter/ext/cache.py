@@ -1,61 +1,536 @@
+import asyncio
+import json
+import pathlib
+import sqlite3
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from functools import wraps
 
-from typing import Any, Awaitable, Callable, Dict, Tuple, TypeVar
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from .render_context import RenderContext
 
 F = TypeVar('F', bound=Callable[..., Awaitable[Any]])
 
 
-_internal_cache: Dict[str, Any] = {}
+class PersistentCache:
+    """
+    Results of Cached Coroutines Kept in an SQLite Database, so they're Shared Across
+    Exports, Processes (e.g. Bot Shards) & Restarts Until they Expire
 
+    Only Functions Cached with `persist=True` are Stored, & their Results Must be JSON-Serialisable.
 
-def _wrap_and_store_coroutine(cache: Dict[str, Any], key: str, coro: Awaitable[Any]) -> Awaitable[Any]:
-    async def func() -> Any:
-        value = await coro
-        cache[key] = value
-        return value
-    return func()
+    The Database is Only Used from a Thread of its Own, so the Event Loop Never Waits on it.
+    Results are Written in Batches - Once `commit_interval` are Held, & After Every Render Pass's
+    Lookups are Resolved - so Call :meth:`close` to Write the Rest.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, pathlib.Path],
+        ttl: float = 7 * 24 * 60 * 60,
+        commit_interval: int = 100,
+        busy_timeout: float = 5.0,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        path: Union[:class:`str`, :class:`pathlib.Path`]
+            The Database File (Safe to Share Between Processes)
+        ttl: :class:`float`
+            The Number of Seconds a Result is Kept For, Unless its Function Sets its Own
+        commit_interval: :class:`int`
+            The Number of Results Held Before they're Written
+        busy_timeout: :class:`float`
+            The Number of Seconds the Database Waits on a Lock Held by Another Process, Before a
+            Read Counts as a Miss & a Write is Skipped
+        """
+
+        self.path = pathlib.Path(path)
+        self.ttl = ttl
+        self.commit_interval = commit_interval
+        self.hits = 0
+        self.misses = 0
+        self.skipped_writes = 0
+
+        # The Results Not Yet Written, as (JSON, Expiry) by Key, & the Last Batch Sent to be Written
+        self._unwritten: Dict[str, Tuple[str, float]] = {}
+        self._writing: Optional["Future[None]"] = None
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+        # Readers Never Block the Writer of Another Process
+        self._db = sqlite3.connect(
+            self.path, timeout=busy_timeout, isolation_level=None, check_same_thread=False,
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS lookups (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)",
+        )
+        self.purge()
+
+    def __len__(self) -> int:
+        return self._executor.submit(self._count).result() + len(self._unwritten)
+
+    async def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        Looks Up a Result
+
+        Parameters
+        ----------
+        key: :class:`str`
+            The Key of the Call (See `make_key`)
+
+        Returns
+        -------
+        Tuple[:class:`bool`, Any]
+            Whether an Unexpired Result was Found, & the Result
+        """
+
+        unwritten = self._unwritten.get(key)
+        if unwritten is not None and unwritten[1] > time.time():
+            row: Optional[Tuple[str]] = (unwritten[0],)
+        else:
+            row = await asyncio.get_running_loop().run_in_executor(self._executor, self._read, key)
+
+        if row is None:
+            self.misses += 1
+            return False, None
+
+        self.hits += 1
+        return True, json.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Holds a Result to be Written with the Next Batch
+
+        Parameters
+        ----------
+        key: :class:`str`
+            The Key of the Call (See `make_key`)
+        value: Any
+            The JSON-Serialisable Result
+        ttl: Optional[:class:`float`]
+            The Number of Seconds the Result is Kept For (Otherwise the Cache's Own)
+        """
+
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        self._unwritten[key] = (json.dumps(value), expires_at)
+        if len(self._unwritten) >= self.commit_interval:
+            # Written in the Background, as the Caller Has the Result Already
+            self._write_unwritten()
+
+    async def flush(self) -> None:
+        """Writes the Results Held, in One Transaction, & Waits for Every Batch to be Written"""
+
+        if self._unwritten:
+            self._write_unwritten()
+        if self._writing is not None and not self._writing.done():
+            await asyncio.wrap_future(self._writing)
+
+    def purge(self) -> None:
+        """Deletes the Expired Results"""
+
+        self._db.execute("DELETE FROM lookups WHERE expires_at <= ?", (time.time(),))
+
+    def close(self) -> None:
+        """Writes the Results Held & Closes the Database"""
+
+        if self._unwritten:
+            self._write_unwritten()
+        self._executor.shutdown(wait=True)
+        self._db.close()
+
+    def _write_unwritten(self) -> None:
+        rows = [(key, *entry) for key, entry in self._unwritten.items()]
+        self._unwritten = {}
+        # The Thread Runs One Call at a Time, in Order, so Later Reads See the Results
+        self._writing = self._executor.submit(self._write, rows)
+
+    def _count(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM lookups WHERE expires_at > ?", (time.time(),)).fetchone()[0]
+
+    def _read(self, key: str) -> Optional[Tuple[str]]:
+        try:
+            return self._db.execute(
+                "SELECT value FROM lookups WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            ).fetchone()
+        except sqlite3.OperationalError:
+            # Locked by Another Process, so the Result is Looked Up Again Instead
+            return None
+
+    def _write(self, rows: List[Tuple[str, str, float]]) -> None:
+        try:
+            self._db.execute("BEGIN IMMEDIATE")
+            self._db.executemany(
+                "INSERT OR REPLACE INTO lookups (key, value, expires_at) VALUES (?, ?, ?)", rows,
+            )
+            self._db.execute("COMMIT")
+        except sqlite3.OperationalError:
+            # Locked by Another Process; the Results are Still Held in Memory for the Export
+            if self._db.in_transaction:
+                self._db.execute("ROLLBACK")
+            self.skipped_writes += len(rows)
+
+
+_persistent_cache: Optional[PersistentCache] = None
+
+
+def use_persistent_cache(persistent_cache: Optional[PersistentCache]) -> None:
+    """
+    Sets (or Unsets) the Persistent Cache Every Export of this Process Shares
+
+    Parameters
+    ----------
+    persistent_cache: Optional[:class:`PersistentCache`]
+        The Cache, or None to Only Cache Results in Memory
+    """
+
+    global _persistent_cache
+    _persistent_cache = persistent_cache
+
+
+class CacheInfo(NamedTuple):
+    """The Counters & Bounds of a Cached Function, Added Up Across Every Export of the Process"""
+
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    maxsize: Optional[int]
+    ttl: Optional[float]
+
+
+def _in_flight(value: Any) -> bool:
+    # A Call Another Caller is Still Waiting on (Unless its Event Loop was Closed Mid-Call)
+    return isinstance(value, asyncio.Future) and not value.done() and not value.get_loop().is_closed()
+
+
+class CacheNamespace:
+    """
+    The Results of One Cached Function, Kept Apart from Every Other's & Bounded by Number & Age
+
+    The Results are Held by the Current :class:`RenderContext`, while the Bounds & Counters
+    Belong to the Function.
+    """
+
+    def __init__(self, name: str, maxsize: Optional[int] = None, ttl: Optional[float] = None) -> None:
+        """
+        Parameters
+        ----------
+        name: :class:`str`
+            The Name of the Namespace (the Module & Name of the Function)
+        maxsize: Optional[:class:`int`]
+            The Maximum Number of Results Kept, Evicting the Least Recently Used (Calls Still
+            Being Made are Never Evicted, Nor Expire)
+        ttl: Optional[:class:`float`]
+            The Number of Seconds a Result is Kept For
+        """
+
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+
+        # Calls Answered Without Calling the Function, Calls Made, Results Evicted to Stay
+        # Within `maxsize` & Results Dropped for Being Older than `ttl`
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def entries(self) -> "OrderedDict[Hashable, Tuple[Any, Optional[float]]]":
+        """The Results (& When they Expire) Held by the Current Render Context, Oldest First"""
+
+        store = RenderContext.current().cache
+        try:
+            return store[self.name]
+        except KeyError:
+            entries = store[self.name] = OrderedDict()
+            return entries
 
+    def __len__(self) -> int:
+        return len(self.entries)
 
-def _wrap_new_coroutine(value: Any) -> Awaitable[Any]:
-    async def new_coroutine() -> Any:
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.evictions, self.expirations, self.maxsize, self.ttl)
+
+    def get(self, key: Hashable) -> Any:
+        """
+        Looks Up a Result
+
+        Parameters
+        ----------
+        key: :class:`Hashable`
+            The Key of the Call (See `make_key`)
+
+        Raises
+        ------
+        :class:`KeyError`
+            The Result isn't Held (or has Expired)
+
+        Returns
+        -------
+        Any
+            The Result
+        """
+
+        entries = self.entries
+        value, expires_at = entries[key]
+        if expires_at is not None and expires_at <= time.monotonic() and not _in_flight(value):
+            del entries[key]
+            self.expirations += 1
+            raise KeyError(key)
+
+        entries.move_to_end(key)
         return value
-    return new_coroutine()
+
+    def peek(self, key: Hashable) -> Any:
+        """The Result Held Under the Key (Even if it's Expired), or None"""
+
+        entry = self.entries.get(key)
+        return entry[0] if entry is not None else None
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Holds a Result, Evicting the Least Recently Used if the Namespace is Full
+
+        Parameters
+        ----------
+        key: :class:`Hashable`
+            The Key of the Call (See `make_key`)
+        value: Any
+            The Result
+        """
+
+        entries = self.entries
+        expires_at = None if self.ttl is None else time.monotonic() + self.ttl
+        entries[key] = (value, expires_at)
+        entries.move_to_end(key)
+        if self.maxsize is not None and len(entries) > self.maxsize:
+            # Calls Still Being Made are Kept, so their Callers Share them Rather than Calling Again
+            excess, evicted = len(entries) - self.maxsize, []
+            for held_key, (held, _) in entries.items():
+                if len(evicted) == excess:
+                    break
+                if not _in_flight(held):
+                    evicted.append(held_key)
+            for held_key in evicted:
+                del entries[held_key]
+                self.evictions += 1
+
+    def discard(self, key: Hashable) -> None:
+        self.entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drops the Results Held by the Current Render Context"""
+
+        RenderContext.current().cache.pop(self.name, None)
+
+
+# Every Cached Function's Namespace, by Name
+_namespaces: Dict[str, CacheNamespace] = {}
+
+
+def cache_info() -> Dict[str, CacheInfo]:
+    """
+    The Counters of Every Cached Function, e.g. to Export as Metrics
+
+    Returns
+    -------
+    Dict[:class:`str`, :class:`CacheInfo`]
+        The Counters & Bounds, by Namespace
+    """
+
+    return {name: namespace.info() for name, namespace in _namespaces.items()}
+
+
+async def _store_coroutine(
+    namespace: CacheNamespace,
+    key: Hashable,
+    coro: Awaitable[Any],
+) -> Any:
+    # Callers Asking for the Key Meanwhile Wait on the Same Result, Rather than Calling Again
+    pending: "asyncio.Future[Any]" = asyncio.get_running_loop().create_future()
+    namespace.set(key, pending)
+    try:
+        value = await coro
+    except BaseException as e:
+        # Failures Aren't Cached, so the Next Caller Tries Again
+        if namespace.peek(key) is pending:
+            namespace.discard(key)
+        if isinstance(e, asyncio.CancelledError):
+            pending.cancel()
+        else:
+            pending.set_exception(e)
+            # Only Raised Again for Callers that were Waiting
+            pending.exception()
+        raise
+
+    if namespace.peek(key) is pending:
+        namespace.set(key, value)
+    pending.set_result(value)
+    return value
 
 
 def clear_cache() -> None:
-    _internal_cache.clear()
+    RenderContext.current().cache.clear()
+
+
+class Lookups:
+    """
+    The Cached Coroutines a Synchronous Render Pass Needed but Found No Result For
+
+    The Pass Renders Around the Gaps, so the Caller Resolves Them & Renders Again.
+    """
+
+    def __init__(self) -> None:
+        self._pending: Dict[
+            Tuple[str, Hashable],
+            Tuple[Callable[..., Awaitable[Any]], Tuple[Any, ...]],
+        ] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self._pending)
+
+    def add(self, func: Callable[..., Awaitable[Any]], *args: Any) -> None:
+        key = (func.namespace.name, func.make_key(args, {}))  # type: ignore
+        self._pending[key] = (func, args)
+
+    async def resolve(self) -> None:
+        """Runs Every Missing Coroutine at Once, Caching the Results (& Writing the Persisted Ones)"""
+
+        await asyncio.gather(*(func(*args) for func, args in self._pending.values()))
+        if _persistent_cache is not None:
+            await _persistent_cache.flush()
+
+
+def cache(
+    persist: bool = False,
+    ttl: Optional[float] = None,
+    maxsize: Optional[int] = None,
+    key: Optional[Callable[..., Hashable]] = None,
+) -> Callable[[F], F]:
+    """
+    Caches the Result of a Coroutine Function
 
+    Concurrent Calls with the Same Arguments Share a Single Call, & a Call that Fails Isn't Cached.
 
-def cache() -> Callable[[F], F]:
-    """Caches the Result of a Coroutine Function"""
+    Parameters
+    ----------
+    persist: :class:`bool`
+        Whether Results are Also Kept in the :class:`PersistentCache`, if One is Used (they Must be
+        JSON-Serialisable, & None is Never Persisted)
+    ttl: Optional[:class:`float`]
+        The Number of Seconds Results are Kept For (Persisted Ones Otherwise Last as Long as the
+        Persistent Cache's Own)
+    maxsize: Optional[:class:`int`]
+        The Maximum Number of Results an Export Keeps, Evicting the Least Recently Used
+    key: Optional[Callable[..., :class:`Hashable`]]
+        Makes the Key of a Call from its Arguments (Otherwise the `repr` of Each is Joined)
+    """
 
     def decorator(func: F) -> F:
-        def _make_key(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> str:
+        namespace = _namespaces[f'{func.__module__}.{func.__name__}'] = CacheNamespace(
+            f'{func.__module__}.{func.__name__}', maxsize, ttl,
+        )
+
+        def _make_key(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Hashable:
+            if key is not None:
+                return key(*args, **kwargs)
+
             def _true_repr(o: Any) -> str:
                 if o.__class__.__repr__ is object.__repr__:
                     return f'<{o.__class__.__module__}.{o.__class__.__name__}>'
                 return repr(o)
 
-            key = [f'{func.__module__}.{func.__name__}']
-            key.extend(_true_repr(o) for o in args)
+            parts = [_true_repr(o) for o in args]
             for k, v in kwargs.items():
-                key.append(_true_repr(k))
-                key.append(_true_repr(v))
+                parts.append(_true_repr(k))
+                parts.append(_true_repr(v))
+
+            return ':'.join(parts)
+
+        def _lookup(call_key: Hashable) -> Any:
+            # A Pending Future if Another Caller is Still Waiting on the Result
+            value = namespace.get(call_key)
+            namespace.hits += 1
+            return value
+
+        async def _load_or_call(call_key: Hashable, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
+            # Read from the Persistent Cache While the Call is Pending, so Callers Meanwhile Share it
+            persistent_cache = _persistent_cache if persist else None
+            persist_key = f"{namespace.name}:{call_key}"
+            if persistent_cache is not None:
+                found, value = await persistent_cache.get(persist_key)
+                if found:
+                    namespace.hits += 1
+                    return value
+
+            namespace.misses += 1
+            value = await func(*args, **kwargs)
+            # None Stands for a Lookup that Couldn't be Made (e.g. Offline), so it's Tried Again Later
+            if persistent_cache is not None and value is not None:
+                persistent_cache.set(persist_key, value, namespace.ttl)
+            return value
 
-            return ':'.join(key)
+        async def _call(call_key: Hashable, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
+            while True:
+                try:
+                    value = _lookup(call_key)
+                except KeyError:
+                    break
+
+                if not isinstance(value, asyncio.Future):
+                    return value
+                if value.get_loop() is not asyncio.get_running_loop():
+                    # Left Behind by an Event Loop that was Closed Mid-Call
+                    break
+                try:
+                    # Shielded, so One Caller Being Cancelled Doesn't Cancel the Rest
+                    return await asyncio.shield(value)
+                except asyncio.CancelledError:
+                    # The Caller that Made the Call was Cancelled, so it's Made Again
+                    if not value.cancelled():
+                        raise
+
+            return await _store_coroutine(namespace, call_key, _load_or_call(call_key, args, kwargs))
 
         @wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Awaitable[Any]:
-            key = _make_key(args, kwargs)
-            try:
-                value = _internal_cache[key]
-            except KeyError:
-                value = func(*args, **kwargs)
-                return _wrap_and_store_coroutine(_internal_cache, key, value)
-            else:
-                return _wrap_new_coroutine(value)
-
-        wrapper.cache = _internal_cache  # type: ignore
-        wrapper.clear_cache = _internal_cache.clear  # type: ignore
+            return _call(_make_key(args, kwargs), args, kwargs)
+
+        def store(value: Any, *args: Any, **kwargs: Any) -> None:
+            # Only in Memory, e.g. Results Handed to a Render Worker Process
+            namespace.set(_make_key(args, kwargs), value)
+
+        def cached(*args: Any, **kwargs: Any) -> Any:
+            # Raises KeyError if the Result isn't Cached (Yet)
+            call_key = _make_key(args, kwargs)
+            value = namespace.peek(call_key)
+            if isinstance(value, asyncio.Future):
+                raise KeyError(call_key)
+            return _lookup(call_key)
+
+        wrapper.namespace = namespace  # type: ignore
+        wrapper.cache_info = namespace.info  # type: ignore
+        wrapper.clear_cache = namespace.clear  # type: ignore
+        wrapper.store = store  # type: ignore
+        wrapper.cached = cached  # type: ignore
+        wrapper.make_key = _make_key  # type: ignore
         return wrapper  # type: ignore
     return decorator
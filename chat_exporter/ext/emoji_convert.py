@@ -30,25 +30,56 @@
 # Github: https://github.com/glasnt/emojificate                                  #
 ##################################################################################
 import aiohttp
+import asyncio
 import emoji
+import re
 import unicodedata
 from grapheme import graphemes
 
-from typing import List
+from typing import Dict, Iterable, List, Optional, Pattern, Set
 
-from ..ext import cache
+from .render_context import RenderContext
+from ..ext import Lookups, cache
 
 cdn_fmt = "https://cdn.jsdelivr.net/gh/jdecked/twemoji@latest/assets/72x72/{codepoint}.png"
 
+_twemoji_starts: Optional[Pattern[str]] = None
 
-@cache()
-async def valid_src(src: str) -> bool:
+# Runs of Non-ASCII Characters (Merged Across Single ASCII Characters) with the ASCII Character
+# Either Side, which May Share a Grapheme with them - Elsewhere Each Character is a Grapheme of
+# its Own, which Can't be an Emoji
+_GRAPHEME_RUN = re.compile(r"[\x00-\x7f]?(?:[^\x00-\x7f]+[\x00-\x7f]?)+")
+
+
+def twemoji_starts() -> Pattern[str]:
+    """Matches the First Character of Every Emoji Known to the `emoji` Package"""
+
+    global _twemoji_starts
+    if _twemoji_starts is None:
+        firsts = {ord(char[0]) for char in emoji.EMOJI_DATA}
+
+        # As Ranges of Consecutive Codepoints, which Keep the Character Class Small
+        ranges: List[List[int]] = []
+        for cp in sorted(firsts):
+            if ranges and ranges[-1][1] == cp - 1:
+                ranges[-1][1] = cp
+            else:
+                ranges.append([cp, cp])
+        classes = "".join(
+            re.escape(chr(first)) + ("-" + re.escape(chr(last)) if last > first else "")
+            for first, last in ranges
+        )
+        _twemoji_starts = re.compile("[" + classes + "]")
+    return _twemoji_starts
+
+
+@cache(persist=True, maxsize=10_000)
+async def valid_src(src: str) -> Optional[bool]:
+    # None if the Check Couldn't be Made, so it isn't Persisted
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(src) as resp:
-                return resp.status == 200
-    except aiohttp.ClientConnectorError:
-        return False
+        return await RenderContext.current().http_client.status(src) == 200
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        return None
 
 
 def valid_category(char: str) -> bool:
@@ -58,35 +89,107 @@ def valid_category(char: str) -> bool:
         return False
 
 
-async def codepoint(codes: List[str]) -> str:
+def codepoint(codes: List[str]) -> str:
     # See https://github.com/twitter/twemoji/issues/419#issuecomment-637360325
     if "200d" not in codes:
         return "-".join([c for c in codes if c != "fe0f"])
     return "-".join(codes)
 
 
-async def convert(char: str) -> str:
-    if valid_category(char):
+def emoji_src(char: str) -> Optional[str]:
+    """The Twemoji URL a Grapheme is Checked Against, or None if it Can't be an Emoji"""
+
+    if not valid_category(char) and len(char) == 1:
+        return None
+    return cdn_fmt.format(codepoint=codepoint(["{cp:x}".format(cp=ord(c)) for c in char]))
+
+
+async def check_emoji(strings: Iterable[str]) -> Dict[str, Optional[bool]]:
+    """Checks Every Twemoji URL the Strings Could Render, Concurrently"""
+
+    srcs: Set[str] = set()
+    for string in strings:
+        if string.isascii():
+            continue
+
+        # Only Where `emojify` Would Look for Emoji
+        for match in _GRAPHEME_RUN.finditer(string):
+            if not twemoji_starts().search(match.group()):
+                continue
+            for ch in graphemes(match.group()):
+                src = emoji_src(ch)  # type: ignore
+                if src is not None:
+                    srcs.add(src)
+
+    checks = [valid_src(src) for src in srcs]
+    results = await asyncio.gather(*checks)
+    return dict(zip(srcs, results))
+
+
+def store_valid_srcs(results: Dict[str, Optional[bool]]) -> None:
+    """Stores Already Checked Twemoji URLs in the Cache, e.g. in a Render Worker Process"""
+
+    for src, valid in results.items():
+        valid_src.store(valid, src)  # type: ignore
+
+
+def convert(char: str, lookups: Lookups) -> str:
+    category = valid_category(char)
+    if not category and len(char) == 1:
+        return char
+
+    code = codepoint(["{cp:x}".format(cp=ord(c)) for c in char])
+    src = cdn_fmt.format(codepoint=code)
+    try:
+        valid = valid_src.cached(src)  # type: ignore
+    except KeyError:
+        lookups.add(valid_src, src)
+        return char
+
+    if not valid:
+        return char
+
+    # Only Named Once Known to be an Emoji, as `demojize` Scans the Whole Grapheme
+    if category:
         name = unicodedata.name(char).title()
     else:
-        if len(char) == 1:
-            return char
-        else:
-            shortcode = emoji.demojize(char)
-            name = shortcode.replace(":", "").replace(
-                "_", " ",
-            ).replace("selector", "").title()
-
-    src = cdn_fmt.format(codepoint=await codepoint(["{cp:x}".format(cp=ord(c)) for c in char]))
-
-    if await valid_src(src):
-        return f'<img class="emoji emoji--small" src="{src}" alt="{char}" title="{name}" aria-label="Emoji: {name}">'
-    else:
-        return char
+        shortcode = emoji.demojize(char)
+        name = shortcode.replace(":", "").replace(
+            "_", " ",
+        ).replace("selector", "").title()
+    return f'<img class="emoji emoji--small" src="{src}" alt="{char}" title="{name}" aria-label="Emoji: {name}">'
+
+
+def emojify(string: str, lookups: Lookups) -> str:
+    """Converts the Emoji of the String Already Known to be Valid, Adding the Rest to `lookups`"""
+
+    if string.isascii():
+        return string
+
+    starts = twemoji_starts()
+    parts: List[str] = []
+    end = 0
+    for match in _GRAPHEME_RUN.finditer(string):
+        run = match.group()
+        if not starts.search(run):
+            # Holds No Emoji, so Every Grapheme Would be Left As-Is
+            continue
+
+        parts.append(string[end:match.start()])
+        parts.extend([convert(ch, lookups) for ch in graphemes(run)])  # type: ignore
+        end = match.end()
+
+    if not parts:
+        return string
+    parts.append(string[end:])
+    return "".join(parts)
 
 
 async def convert_emoji(string: str) -> str:
-    x = []
-    for ch in graphemes(string):
-        x.append(await convert(ch))  # type: ignore
-    return "".join(x)
+    lookups = Lookups()
+    converted = emojify(string, lookups)
+    while lookups:
+        await lookups.resolve()
+        lookups = Lookups()
+        converted = emojify(string, lookups)
+    return converted
@@ -1,10 +1,12 @@
 import discord
 
 import os
+import re
 from enum import Enum
 
-from typing import List, Optional, Tuple, Union
+from typing import Dict, List, Optional, Tuple, Union
 
+from ..ext import Lookups
 from ..parse import ParseMarkdown, ParseMention
 
 dir_path = os.path.abspath(
@@ -24,7 +26,118 @@ class ParseMode(Enum):
     EMOJI = 6
 
 
-async def fill_out(guild: Optional[discord.Guild], base: str, replacements: List[Union[Tuple[str, str], Tuple[str, str, ParseMode]]], *, finalise: bool = False) -> str:
+class Template:
+    """A Template Compiled Once into Literal Segments & Placeholder Slots"""
+
+    PLACEHOLDER = re.compile(r"{{([A-Z0-9_]+)}}")
+
+    def __init__(self, source: str) -> None:
+        parts = Template.PLACEHOLDER.split(source)
+        self.keys: List[str] = parts[1::2]
+
+        # Slots Hold their Own Placeholder, so Unknown Keys are Left As-Is
+        self._parts: List[str] = [
+            "{{" + p + "}}" if i % 2 else p for i, p in enumerate(parts)
+        ]
+        self._slots: List[Tuple[int, str]] = [
+            (i, p) for i, p in enumerate(parts) if i % 2
+        ]
+
+    def render(self, values: Dict[str, str]) -> str:
+        """
+        Renders the Template in a Single Join
+
+        Parameters
+        ----------
+        values: Dict[:class:`str`, :class:`str`]
+            The Value of Each Placeholder
+
+        Returns
+        -------
+        :class:`str`
+            The Rendered Template
+        """
+
+        parts = self._parts[:]
+        for i, key in self._slots:
+            if key in values:
+                parts[i] = values[key]
+        return "".join(parts)
+
+
+_templates: Dict[str, Template] = {}
+
+
+def compile_template(base: str) -> Template:
+    try:
+        return _templates[base]
+    except KeyError:
+        template = _templates[base] = Template(base)
+        return template
+
+
+Replacements = List[Union[Tuple[str, str], Tuple[str, str, ParseMode]]]
+
+
+class PlainText:
+    """Recognises Values Without Any Markdown, Mentions, Links or Emoji, which are Output As-Is"""
+
+    # Everything the Mention & Markdown Parsers Act On, & Non-ASCII for Emoji (Escaped Values Hold
+    # `&lt;` & `&gt;`, & Only Lines Starting with `#`, `-` or `1.` Can be Headers or Lists)
+    TRIGGERS = re.compile(
+        r"[`*_~|<>\[@]|&[lg]t;|http|[^\x00-\x7f]|^#|^\s*(?:-|[0-9]+\.)\s", re.MULTILINE,
+    )
+
+    @staticmethod
+    def check(value: str) -> bool:
+        """
+        Whether Parsing the Value Would Leave it Unchanged (Other than Stripping Whitespace)
+
+        Parameters
+        ----------
+        value: :class:`str`
+            The Value to Check
+
+        Returns
+        -------
+        :class:`bool`
+            Whether the Value Holds None of the Trigger Characters
+        """
+
+        return PlainText.TRIGGERS.search(value) is None
+
+
+def render(
+    guild: Optional[discord.Guild],
+    base: str,
+    replacements: Replacements,
+    lookups: Lookups,
+    *,
+    finalise: bool = False,
+) -> str:
+    """
+    Fills Out the Template Synchronously, Using Only Cached Users & Emoji
+
+    Parameters
+    ----------
+    guild: Optional[:class:`discord.Guild`]
+        The Guild to Resolve Mentions Against
+    base: :class:`str`
+        The Template
+    replacements: List[Union[Tuple[:class:`str`, :class:`str`], Tuple[:class:`str`, :class:`str`, :class:`ParseMode`]]]
+        The Placeholders & their Values (Parsed as Markdown Unless Another Mode is Given)
+    lookups: :class:`Lookups`
+        Where Users & Emoji that Aren't Cached Yet are Added (Rendered Without them)
+    finalise: :class:`bool`
+        Whether to Restore the Code Blocks
+
+    Returns
+    -------
+    :class:`str`
+        The Filled Out Template
+    """
+
+    values: Dict[str, str] = {}
     for r in replacements:
         if len(r) == 2:
             k, v = r
@@ -32,21 +145,34 @@ async def fill_out(guild: Optional[discord.Guild], base: str, replacements: List
 
         k, v, mode = r
 
-        if mode != ParseMode.NONE:
-            v = await ParseMention.flow(guild, content=v)
+        if k in values:
+            # Only the First Replacement of a Placeholder is Used
+            continue
+
+        if mode is ParseMode.NONE:
+            values[k] = v.strip()
+            continue
+
+        if PlainText.check(v):
+            values[k] = v.strip()
+            continue
+
+        v = ParseMention.flow(guild, content=v, lookups=lookups)
 
         if mode == ParseMode.MARKDOWN:
-            v = await ParseMarkdown(v).standard_message_flow()
+            v = ParseMarkdown(v, lookups).standard_message_flow()
         elif mode == ParseMode.EMBED:
-            v = await ParseMarkdown(v).standard_embed_flow()
+            v = ParseMarkdown(v, lookups).standard_embed_flow()
         elif mode == ParseMode.SPECIAL_EMBED:
-            v = await ParseMarkdown(v).special_embed_flow()
+            v = ParseMarkdown(v, lookups).special_embed_flow()
         elif mode == ParseMode.REFERENCE:
-            v = await ParseMarkdown(v).message_reference_flow()
+            v = ParseMarkdown(v, lookups).message_reference_flow()
         elif mode == ParseMode.EMOJI:
-            v = await ParseMarkdown(v).special_emoji_flow()
+            v = ParseMarkdown(v, lookups).special_emoji_flow()
+
+        values[k] = v.strip()
 
-        base = base.replace("{{" + k + "}}", v.strip())
+    base = compile_template(base).render(values)
 
     if finalise:
         base = ParseMarkdown.reverse_code_block_markdown(base)
@@ -54,9 +180,23 @@ async def fill_out(guild: Optional[discord.Guild], base: str, replacements: List
     return base
 
 
+async def fill_out(guild: Optional[discord.Guild], base: str, replacements: Replacements, *, finalise: bool = False) -> str:
+    lookups = Lookups()
+    filled = render(guild, base, replacements, lookups, finalise=finalise)
+
+    # Only a Template Needing Users or Emoji that Aren't Cached Yet Waits on I/O
+    while lookups:
+        await lookups.resolve()
+        lookups = Lookups()
+        filled = render(guild, base, replacements, lookups, finalise=finalise)
+
+    return filled
+
+
 def read_file(filename: str) -> str:
     with open(filename, "r") as f:
         s = f.read()
+    compile_template(s)
     return s
 
 
@@ -115,3 +255,5 @@ total = read_file(dir_path + "/html/base.html")
 # SCRIPT
 channel_topic = read_file(dir_path + "/html/script/channel_topic.html")
 channel_subject = read_file(dir_path + "/html/script/channel_subject.html")
+channel_threads = read_file(dir_path + "/html/script/channel_threads.html")
+channel_thread = read_file(dir_path + "/html/script/channel_thread.html")
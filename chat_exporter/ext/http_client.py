@@ -0,0 +1,211 @@
+import aiohttp
+import asyncio
+
+from typing import Any, Optional, Tuple
+
+# Statuses Worth Asking Again For, as the Server May Only be Overloaded
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class HTTPClient:
+    """
+    A Pooled HTTP Session Shared by the Outbound Requests of the Exporter (Emoji Checks &
+    Attachment Downloads)
+
+    The Session is Opened on the First Request & Closed Once Every `async with` Block Using the
+    Client has Exited, so Connections are Kept Alive Across a Whole Export (or Batch of Exports).
+    """
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 10,
+        timeout: float = 30.0,
+        retries: int = 2,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        limit: :class:`int`
+            The Maximum Number of Connections Open at Once
+        limit_per_host: :class:`int`
+            The Maximum Number of Connections Open to a Single Host at Once
+        timeout: :class:`float`
+            The Number of Seconds a Request May Take in Total
+        retries: :class:`int`
+            The Number of Times a Request is Retried After a Connection Error, a Timeout or a
+            Status in :data:`RETRY_STATUSES`
+        backoff: :class:`float`
+            The Number of Seconds Waited Before the First Retry, Doubling with Each Retry
+            (Unless the Server Sends `Retry-After`)
+        max_backoff: :class:`float`
+            The Most Seconds Waited Before a Retry, Whatever `Retry-After` Asks For
+        """
+
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._users = 0
+
+    async def __aenter__(self) -> "HTTPClient":
+        self._users += 1
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        self._users -= 1
+        if self._users <= 0:
+            self._users = 0
+            await self.close()
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """The Pooled Session, Opened on the Running Event Loop if it Isn't Yet"""
+
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._drop_session()
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.limit, limit_per_host=self.limit_per_host,
+                ),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+            self._loop = loop
+        return self._session
+
+    def _drop_session(self) -> None:
+        # A Session Can Only be Closed on the Event Loop it was Opened On
+        session, loop = self._session, self._loop
+        self._session = None
+        if session is None or session.closed or loop is None:
+            return
+
+        if loop.is_running():
+            # e.g. in Another Thread
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+            return
+
+        # e.g. an Earlier `asyncio.run`, so the Connections are Closed Without Waiting (or
+        # were Already Dropped with the Loop)
+        connector = session.connector
+        session.detach()
+        if connector is not None and not loop.is_closed():
+            connector.close()
+
+    async def close(self) -> None:
+        """Closes the Session & Every Connection it Kept Alive"""
+
+        session, self._session = self._session, None
+        if session is not None and not session.closed and self._loop is asyncio.get_running_loop():
+            await session.close()
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        read: bool = True,
+        raise_for_status: bool = False,
+    ) -> Tuple[int, bytes]:
+        """
+        Sends a Request, Retrying it if it Fails in a Way that May Not Last
+
+        Parameters
+        ----------
+        method: :class:`str`
+            The HTTP Method
+        url: :class:`str`
+            The URL
+        read: :class:`bool`
+            Whether to Read the Body of the Response
+        raise_for_status: :class:`bool`
+            Whether an Unsuccessful Status is Raised
+
+        Raises
+        ------
+        :class:`aiohttp.ClientResponseError`
+            The Last Response was Unsuccessful (Only if `raise_for_status` is Set)
+        :class:`aiohttp.ClientError`
+            The Request Still Failed to Connect After Every Retry
+        :class:`asyncio.TimeoutError`
+            The Request Still Timed Out After Every Retry
+
+        Returns
+        -------
+        Tuple[:class:`int`, :class:`bytes`]
+            The Status & Body (Empty Unless `read` is Set) of the Last Response
+        """
+
+        attempt = 0
+        while True:
+            delay = min(self.backoff * 2 ** attempt, self.max_backoff)
+            try:
+                async with self.session.request(method, url) as resp:
+                    if resp.status not in RETRY_STATUSES or attempt >= self.retries:
+                        if raise_for_status:
+                            resp.raise_for_status()
+                        return resp.status, await resp.read() if read else b""
+
+                    retry_after = resp.headers.get("Retry-After", "")
+                    if retry_after.replace(".", "", 1).isdigit():
+                        delay = min(float(retry_after), self.max_backoff)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt >= self.retries:
+                    raise
+
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def status(self, url: str) -> int:
+        """
+        Checks a URL Without Downloading it
+
+        Parameters
+        ----------
+        url: :class:`str`
+            The URL
+
+        Returns
+        -------
+        :class:`int`
+            The Status of a `HEAD` Request
+        """
+
+        status, _ = await self.request("HEAD", url, read=False)
+        return status
+
+    async def read(self, url: str) -> bytes:
+        """
+        Downloads a URL
+
+        Parameters
+        ----------
+        url: :class:`str`
+            The URL
+
+        Raises
+        ------
+        :class:`aiohttp.ClientResponseError`
+            The Response Wasn't Successful
+
+        Returns
+        -------
+        :class:`bytes`
+            The Body
+        """
+
+        _, body = await self.request("GET", url, raise_for_status=True)
+        return body
+
+
+# The Client Used when an Export isn't Given its Own
+default_client = HTTPClient()
@@ -0,0 +1,86 @@
+import discord
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from typing import Any, Dict, Iterator, Optional
+
+from .http_client import HTTPClient, default_client
+
+
+class RenderContext:
+    """
+    The State a Single Export Renders With (Cached Lookups, Code Blocks, Menu IDs & Embeds)
+
+    Each Export Activates its Own, so Any Number can be Rendered at Once on the Same Event Loop.
+    The Tasks an Export Starts Inherit its Context, & Code Outside an Export Renders with a
+    Default One Shared by the Whole Process.
+    """
+
+    def __init__(
+        self,
+        bot: Optional[discord.Client] = None,
+        http_client: Optional[HTTPClient] = None,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        bot: Optional[:class:`discord.Client`]
+            The Bot Users Outside the Guild are Fetched With
+        http_client: Optional[:class:`HTTPClient`]
+            The Client the Emoji Checks are Made With (Otherwise the Default One)
+        """
+
+        self.bot = bot
+        self.http_client = http_client or default_client
+
+        # The Results of Cached Coroutines by Namespace, which Several Exports May Share (See `shared_cache`)
+        self.cache: Dict[str, Any] = {}
+
+        # Code Blocks are Swapped for Placeholders Until the Document is Complete
+        self.code_blocks: Dict[str, str] = {}
+        # The Last ID Given to a Select Menu
+        self.menu_div_id = 0
+        # Identical Embeds are Only Rendered Once
+        self.embeds: "OrderedDict[str, str]" = OrderedDict()
+        # The Number of Messages whose Content Skipped the Mention & Markdown Parsers
+        self.fast_path_messages = 0
+
+    @staticmethod
+    def current() -> "RenderContext":
+        """The Context of the Export Being Rendered (or the Default One Outside an Export)"""
+
+        return _current.get()
+
+    @contextmanager
+    def activate(self) -> Iterator["RenderContext"]:
+        """Renders with this Context Until the Block Exits (Including in the Tasks Started Within it)"""
+
+        token = _current.set(self)
+        try:
+            yield self
+        finally:
+            _current.reset(token)
+
+    def reset(self, cache: bool = True) -> None:
+        """
+        Clears the State of the Document Rendered so Far
+
+        Parameters
+        ----------
+        cache: :class:`bool`
+            Whether the Cached Lookups are Cleared Too (Not if they're Shared with Other Exports)
+        """
+
+        if cache:
+            self.cache.clear()
+        self.code_blocks = {}
+        self.menu_div_id = 0
+        self.embeds.clear()
+        self.fast_path_messages = 0
+
+
+_current: "ContextVar[RenderContext]" = ContextVar(
+    "render_context", default=RenderContext(),
+)
@@ -1,2 +1,2 @@
 from .markdown import ParseMarkdown
-from .mention import ParseMention, pass_bot
+from .mention import MentionResolver, ParseMention, pass_bot, prefetch_users
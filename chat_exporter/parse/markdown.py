@@ -1,21 +1,32 @@
-import base64
 import html
-import random
 import re
-import string
 
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Match, Optional, Pattern, Union
 
-from ..ext import convert_emoji
+from ..ext import Lookups, emojify
+from ..ext.render_context import RenderContext
+
+
+def _sub_until_stable(pattern: Pattern[str], repl: Union[str, Callable[[Match[str]], str]], content: str) -> str:
+    # A Replacement Can Complete a Match it was Nested In, so Passes Repeat Until Nothing Matches
+    count = 1
+    while count:
+        content, count = pattern.subn(repl, content)
+    return content
 
 
 class ParseMarkdown:
     """The Markdown Parser"""
 
-    CODE_BLOCK_CONTENT: Dict[str, str] = {}
+    # Code Blocks are Swapped for Numbered Placeholders Until the Document is Complete (Made of
+    # Unicode Non-Characters, so No Other Step Touches them & Messages Can't Contain them)
+    CODE_BLOCK_KEY = "\ufdd0CODEBLOCK%d\ufdd1"
+    CODE_BLOCK_REGEX = re.compile("\ufdd0CODEBLOCK[0-9]+\ufdd1")
 
-    def __init__(self, content: str) -> None:
+    def __init__(self, content: str, lookups: Optional[Lookups] = None) -> None:
         self.__content = content
+        # Emoji Not Yet Known to be Valid are Left As-Is & Added Here, to be Checked
+        self.lookups = lookups if lookups is not None else Lookups()
 
     @property
     def content(self) -> str:
@@ -25,35 +36,35 @@ class ParseMarkdown:
     def content(self, value: str) -> None:
         self.__content = value
 
-    async def standard_message_flow(self) -> str:
+    def standard_message_flow(self) -> str:
         self.parse_code_block_markdown()
         self.https_http_links()
         self.parse_embedded_links()
         self.parse_normal_markdown()
 
-        await self.parse_emoji()
+        self.parse_emoji()
         return self.content
 
-    async def standard_embed_flow(self) -> str:
+    def standard_embed_flow(self) -> str:
         self.parse_code_block_markdown()
         self.https_http_links()
         self.parse_embedded_links()
         self.parse_embed_markdown()
         self.parse_normal_markdown()
 
-        await self.parse_emoji()
+        self.parse_emoji()
         return self.content
 
-    async def special_embed_flow(self) -> str:
+    def special_embed_flow(self) -> str:
         self.parse_code_block_markdown()
         self.https_http_links()
         self.parse_embedded_links()
         self.parse_normal_markdown()
 
-        await self.parse_emoji()
+        self.parse_emoji()
         return self.content
 
-    async def message_reference_flow(self) -> str:
+    def message_reference_flow(self) -> str:
         self.strip_preserve()
         self.parse_code_block_markdown(reference=True)
         self.https_http_links()
@@ -63,151 +74,144 @@ class ParseMarkdown:
 
         return self.content
 
-    async def special_emoji_flow(self) -> str:
-        await self.parse_emoji()
+    def special_emoji_flow(self) -> str:
+        self.parse_emoji()
         return self.content
 
     def parse_br(self) -> None:
         self.__content = self.__content.replace("<br>", " ")
 
-    async def parse_emoji(self) -> None:
+    def parse_emoji(self) -> None:
         holder = (
             [
                 r"&lt;:.*?:(\d*)&gt;",
-                '<img class="emoji emoji--small" src="https://cdn.discordapp.com/emojis/%s.png">',
+                r'<img class="emoji emoji--small" src="https://cdn.discordapp.com/emojis/\1.png">',
             ],
             [
                 r"&lt;a:.*?:(\d*)&gt;",
-                '<img class="emoji emoji--small" src="https://cdn.discordapp.com/emojis/%s.gif">',
+                r'<img class="emoji emoji--small" src="https://cdn.discordapp.com/emojis/\1.gif">',
             ],
             [
                 r"<:.*?:(\d*)>",
-                '<img class="emoji emoji--small" src="https://cdn.discordapp.com/emojis/%s.png">',
+                r'<img class="emoji emoji--small" src="https://cdn.discordapp.com/emojis/\1.png">',
             ],
             [
                 r"<a:.*?:(\d*)>",
-                '<img class="emoji emoji--small" src="https://cdn.discordapp.com/emojis/%s.gif">',
+                r'<img class="emoji emoji--small" src="https://cdn.discordapp.com/emojis/\1.gif">',
             ],
         )
 
-        self.__content = await convert_emoji(self.__content)
+        self.__content = emojify(self.__content, self.lookups)
 
-        for x in holder:
-            p, r = x
-            match = re.search(p, self.__content)
-            while match is not None:
-                emoji_id = match.group(1)
-                self.__content = self.__content.replace(
-                    self.__content[match.start():match.end()],
-                    r % emoji_id,
-                )
-                match = re.search(p, self.__content)
+        if ":" not in self.__content:
+            return
+
+        for pattern, replacement in holder:
+            self.__content = re.sub(pattern, replacement, self.__content)
 
     def strip_preserve(self) -> None:
-        p = r'<span class="chatlog__markdown-preserve">(.*)</span>'
-        r = '%s'
+        pattern = re.compile(r'<span class="chatlog__markdown-preserve">(.*)</span>')
 
-        pattern = re.compile(p)
-        match = re.search(pattern, self.__content)
-        while match is not None:
-            affected_text = match.group(1)
-            self.__content = self.__content.replace(
-                self.__content[match.start():match.end()],
-                r % affected_text,
-            )
-            match = re.search(pattern, self.__content)
+        # Each Pass Strips the Outermost Span of Each Line
+        self.__content = _sub_until_stable(pattern, r"\1", self.__content)
 
     def ordered_list_markdown_to_html(self) -> None:
         lines = self.__content.split('\n')
-        html = ''
+        html: List[str] = []
         indent_stack = [0]
         started = True
+        pattern = re.compile(r'^(\s*)(\d+\.)\s+(.+)$')
 
         for line in lines:
-            match = re.match(r'^(\s*)(\d+\.)\s+(.+)$', line)
+            match = pattern.match(line)
             if match:
                 indent, bullet, content = match.groups()
                 indent = len(indent)
 
                 if started:
-                    html += '<ol class="markup" style="padding-left: 20px;margin: 0 !important">\n'
+                    html.append(
+                        '<ol class="markup" style="padding-left: 20px;margin: 0 !important">\n',
+                    )
                     started = False
                 if indent % 2 == 0:
                     while indent < indent_stack[-1]:
-                        html += '</ol>\n'
+                        html.append('</ol>\n')
                         indent_stack.pop()
                     if indent > indent_stack[-1]:
-                        html += '<ol class="markup">\n'
+                        html.append('<ol class="markup">\n')
                         indent_stack.append(indent)
                 else:
                     while indent + 1 < indent_stack[-1]:
-                        html += '</ol>\n'
+                        html.append('</ol>\n')
                         indent_stack.pop()
                     if indent + 1 > indent_stack[-1]:
-                        html += '<ol class="markup">\n'
+                        html.append('<ol class="markup">\n')
                         indent_stack.append(indent + 1)
 
-                html += f'<li class="markup">{content.strip()}</li>\n'
+                html.append(f'<li class="markup">{content.strip()}</li>\n')
             else:
                 while len(indent_stack) > 1:
-                    html += '</ol>'
+                    html.append('</ol>')
                     indent_stack.pop()
                 if not started:
-                    html += '</ol>'
+                    html.append('</ol>')
                     started = True
-                html += line + '\n'
+                html.append(line + '\n')
 
         while len(indent_stack) > 1:
-            html += '</ol>\n'
+            html.append('</ol>\n')
             indent_stack.pop()
 
-        self.__content: str = html
+        self.__content = "".join(html)
 
     def unordered_list_markdown_to_html(self) -> None:
         lines = self.__content.split('\n')
-        html = ''
+        html: List[str] = []
         indent_stack = [0]
         started = True
+        pattern = re.compile(r'^(\s*)([-*])\s+(.+)$')
 
         for line in lines:
-            match = re.match(r'^(\s*)([-*])\s+(.+)$', line)
+            match = pattern.match(line)
             if match:
                 indent, bullet, content = match.groups()
                 indent = len(indent)
 
                 if started:
-                    html += '<ul class="markup" style="padding-left: 20px;margin: 0 !important">\n'
+                    html.append(
+                        '<ul class="markup" style="padding-left: 20px;margin: 0 !important">\n',
+                    )
                     started = False
                 if indent % 2 == 0:
                     while indent < indent_stack[-1]:
-                        html += '</ul>\n'
+                        html.append('</ul>\n')
                         indent_stack.pop()
                     if indent > indent_stack[-1]:
-                        html += '<ul class="markup">\n'
+                        html.append('<ul class="markup">\n')
                         indent_stack.append(indent)
                 else:
                     while indent + 1 < indent_stack[-1]:
-                        html += '</ul>\n'
+                        html.append('</ul>\n')
                         indent_stack.pop()
                     if indent + 1 > indent_stack[-1]:
-                        html += '<ul class="markup">\n'
+                        html.append('<ul class="markup">\n')
                         indent_stack.append(indent + 1)
 
-                html += f'<li class="markup">{content.strip()}</li>\n'
+                html.append(f'<li class="markup">{content.strip()}</li>\n')
             else:
                 while len(indent_stack) > 1:
-                    html += '</ul>'
+                    html.append('</ul>')
                     indent_stack.pop()
                 if not started:
-                    html += '</ul>'
+                    html.append('</ul>')
                     started = True
-                html += line + '\n'
+                html.append(line + '\n')
 
         while len(indent_stack) > 1:
-            html += '</ul>\n'
+            html.append('</ul>\n')
             indent_stack.pop()
 
-        self.__content: str = html
+        self.__content = "".join(html)
 
     def parse_normal_markdown(self) -> None:
         self.ordered_list_markdown_to_html()
@@ -228,7 +232,7 @@ class ParseMarkdown:
             self.__content = re.sub(pattern, replacement, self.__content)
 
         # > quote
-        content = re.sub(r"\n", "<br>", self.__content).split("<br>")
+        content = self.__content.replace("\n", "<br>").split("<br>")
         pattern = re.compile(r"^&gt;\s*(.+)")
 
         if len(content) == 1:
@@ -239,7 +243,7 @@ class ParseMarkdown:
             return
 
         y = None
-        new_content = ""
+        new_content: List[str] = []
         for x in content:
             if re.search(pattern, x) and y:
                 y = y + "<br>" + x[5:]
@@ -247,32 +251,18 @@ class ParseMarkdown:
                 if re.search(pattern, x):
                     y = x[5:]
                 else:
-                    new_content = new_content + x + "<br>"
+                    new_content.append(x + "<br>")
             else:
-                new_content = new_content + f'<div class="quote">{y}</div>'
-                new_content = new_content + x
+                new_content.append(f'<div class="quote">{y}</div>')
+                new_content.append(x)
                 y = ""
 
         if y:
-            new_content = new_content + f'<div class="quote">{y}</div>'
+            new_content.append(f'<div class="quote">{y}</div>')
 
-        self.content = re.sub("<br>", "\n", new_content)
+        self.content = "".join(new_content).replace("<br>", "\n")
 
     def parse_code_block_markdown(self, reference: bool = False) -> None:
-        def _create_unique_id() -> str:
-            _id = "{{CODEBLOCK" + base64.b64encode(
-                ''.join(
-                    random.choices(
-                        string.ascii_letters +
-                        string.digits, k=16,
-                    ),
-                ).encode(),
-            ).decode() + "}}"
-            if _id in ParseMarkdown.CODE_BLOCK_CONTENT or _id in self.__content:
-                return _create_unique_id()
-            else:
-                return _id
-
         markdown_languages = [
             "asciidoc", "autohotkey", "bash",
             "coffeescript", "cpp", "cs", "css",
@@ -280,12 +270,8 @@ class ParseMarkdown:
             "md", "ml", "prolog", "py", "tex",
             "xl", "xml", "js", "html",
         ]
-        self.__content = re.sub(r"\n", "<br>", self.__content)
 
-        # ```code```
-        pattern = re.compile(r"```(.*?)```")
-        match = re.search(pattern, self.__content)
-        while match is not None:
+        def _multiline(match: Match[str]) -> str:
             language_class = "nohighlight"
             affected_text = match.group(1)
 
@@ -295,69 +281,119 @@ class ParseMarkdown:
                     _, _, affected_text = affected_text.partition('<br>')
 
             affected_text = self.return_to_markdown(affected_text)
+            affected_text = re.sub(r"^(?:<br>)+|(?:<br>)+$", '', affected_text)
+            affected_text = affected_text.replace("  ", "&nbsp;&nbsp;")
 
-            second_pattern = re.compile(r"^<br>|<br>$")
-            second_match = re.search(second_pattern, affected_text)
-            while second_match is not None:
-                affected_text = re.sub(r"^<br>|<br>$", '', affected_text)
-                second_match = re.search(second_pattern, affected_text)
+            if not reference:
+                return '<div class="pre pre--multiline %s">%s</div>' % (
+                    language_class, ParseMarkdown.store_code_block(affected_text),
+                )
+            return '<span class="pre pre-inline">%s</span>' % ParseMarkdown.store_code_block(affected_text)
 
-            affected_text = re.sub("  ", "&nbsp;&nbsp;", affected_text)
+        def _inline(match: Match[str]) -> str:
+            affected_text = self.return_to_markdown(match.group(1))
+            return '<span class="pre pre-inline">%s</span>' % ParseMarkdown.store_code_block(affected_text)
 
-            _id = _create_unique_id()
-            ParseMarkdown.CODE_BLOCK_CONTENT[_id] = affected_text
+        self.__content = self.__content.replace("\n", "<br>")
 
-            if not reference:
-                self.__content = self.__content.replace(
-                    self.__content[match.start():match.end()],
-                    '<div class="pre pre--multiline %s">%s</div>' % (
-                        language_class, _id,
-                    ),
-                )
-            else:
-                self.__content = self.__content.replace(
-                    self.__content[match.start():match.end()],
-                    '<span class="pre pre-inline">%s</span>' % _id,
-                )
+        # Each Kind of Code Block is Replaced in a Single Pass, Left to Right
+        if "`" in self.__content:
+            # ```code```
+            self.__content = re.sub(r"```(.*?)```", _multiline, self.__content)
+            # ``code``
+            self.__content = re.sub(r"``(.*?)``", _inline, self.__content)
+            # `code`
+            self.__content = re.sub(r"`(.*?)`", _inline, self.__content)
 
-            match = re.search(pattern, self.__content)
+        self.__content = self.__content.replace("<br>", "\n")
 
-        # ``code``
-        pattern = re.compile(r"``(.*?)``")
-        match = re.search(pattern, self.__content)
-        while match is not None:
-            affected_text = match.group(1)
-            affected_text = self.return_to_markdown(affected_text)
-            _id = _create_unique_id()
-            ParseMarkdown.CODE_BLOCK_CONTENT[_id] = affected_text
-            self.__content = self.__content.replace(
-                self.__content[match.start():match.end()],
-                '<span class="pre pre-inline">%s</span>' % _id,
-            )
-            match = re.search(pattern, self.__content)
+    @staticmethod
+    def store_code_block(content: str) -> str:
+        """
+        Stores the Content of a Code Block Until the Document is Complete
+
+        Parameters
+        ----------
+        content: :class:`str`
+            The Content of the Code Block
+
+        Returns
+        -------
+        :class:`str`
+            The Placeholder it's Restored From
+        """
+
+        code_blocks = RenderContext.current().code_blocks
+        key = ParseMarkdown.CODE_BLOCK_KEY % len(code_blocks)
+        code_blocks[key] = content
+        return key
 
-        # `code`
-        pattern = re.compile(r"`(.*?)`")
-        match = re.search(pattern, self.__content)
-        while match is not None:
-            affected_text = match.group(1)
-            affected_text = self.return_to_markdown(affected_text)
-            _id = _create_unique_id()
-            ParseMarkdown.CODE_BLOCK_CONTENT[_id] = affected_text
-            self.__content = self.__content.replace(
-                self.__content[match.start():match.end()],
-                '<span class="pre pre-inline">%s</span>' % _id,
+    @staticmethod
+    def import_code_blocks(code_blocks: Dict[str, str]) -> Dict[str, str]:
+        """
+        Stores Code Blocks Numbered Elsewhere (e.g. in a Render Worker or an Earlier Export)
+        Under New Placeholders
+
+        Parameters
+        ----------
+        code_blocks: Dict[:class:`str`, :class:`str`]
+            The Code Blocks, in the Order they were Stored
+
+        Returns
+        -------
+        Dict[:class:`str`, :class:`str`]
+            The New Placeholder of Each Old One, for :meth:`rename_code_blocks`
+        """
+
+        renamed: Dict[str, str] = {}
+        for key, value in code_blocks.items():
+            # A Code Block Only Holds the Placeholders of Ones Stored Before it
+            renamed[key] = ParseMarkdown.store_code_block(
+                ParseMarkdown.rename_code_blocks(value, renamed),
             )
-            match = re.search(pattern, self.__content)
+        return renamed
+
+    @staticmethod
+    def rename_code_blocks(content: str, renamed: Dict[str, str]) -> str:
+        """Swaps the Placeholders of Imported Code Blocks for their New Ones"""
 
-        self.__content = re.sub(r"<br>", "\n", self.__content)
+        if "\ufdd0" not in content:
+            return content
+        return ParseMarkdown.CODE_BLOCK_REGEX.sub(lambda match: renamed.get(match.group(), match.group()), content)
+
+    @staticmethod
+    def code_blocks_of(content: str) -> Dict[str, str]:
+        """The Code Blocks the Content Refers To (Including Nested Ones), in the Order they were Stored"""
+
+        stored = RenderContext.current().code_blocks
+        code_blocks: Dict[str, str] = {}
+        pending = []
+        if "\ufdd0" in content:
+            pending = ParseMarkdown.CODE_BLOCK_REGEX.findall(content)
+        while pending:
+            key = pending.pop()
+            if key in code_blocks or key not in stored:
+                continue
+            code_blocks[key] = stored[key]
+            pending.extend(ParseMarkdown.CODE_BLOCK_REGEX.findall(code_blocks[key]))
+
+        return {key: code_blocks[key] for key in sorted(code_blocks, key=lambda key: int(key[10:-1]))}
 
     @staticmethod
     def reverse_code_block_markdown(content: str) -> str:
-        for key, value in ParseMarkdown.CODE_BLOCK_CONTENT.items():
-            content = content.replace(key, value)
+        if "\ufdd0" in content:
+            stored = RenderContext.current().code_blocks
+
+            def _restore(match: Match[str]) -> str:
+                value = stored.get(match.group())
+                if value is None:
+                    return match.group()
+                # Code Blocks Can Hold the Placeholders of Ones Stored Before them
+                return ParseMarkdown.CODE_BLOCK_REGEX.sub(_restore, value) if "\ufdd0" in value else value
 
-        return re.sub(r"<br>", "\n", content)
+            content = ParseMarkdown.CODE_BLOCK_REGEX.sub(_restore, content)
+
+        return content.replace("<br>", "\n")
 
     def parse_embedded_links(self) -> None:
         # [Text](Link 'Title')
@@ -409,7 +445,7 @@ class ParseMarkdown:
     def parse_embed_markdown(self) -> None:
         content = self.__content.split("\n")
         y = None
-        new_content = ""
+        new_content: List[str] = []
         pattern = re.compile(r"^>\s(.+)")
 
         if len(content) == 1:
@@ -426,61 +462,60 @@ class ParseMarkdown:
                 if re.search(pattern, x):
                     y = x[2:]
                 else:
-                    new_content = new_content + x + "\n"
+                    new_content.append(x + "\n")
             else:
-                new_content = new_content + f'<div class="quote">{y}</div>'
-                new_content = new_content + x
+                new_content.append(f'<div class="quote">{y}</div>')
+                new_content.append(x)
                 y = ""
 
         if y:
-            new_content = new_content + f'<div class="quote">{y}</div>'
+            new_content.append(f'<div class="quote">{y}</div>')
 
-        self.__content = new_content
+        self.__content = "".join(new_content)
 
     def return_to_markdown(self, content: str) -> str:
         holders = (
-            [r"<strong>(.*?)</strong>", '**%s**'],
-            [r"<em>([^<>]+)</em>", '*%s*'],
-            [r"<h1>([^<>]+)</h1>", '# %s'],
-            [r"<h2>([^<>]+)</h2>", '## %s'],
-            [r"<h3>([^<>]+)</h3>", '### %s'],
-            [r'<span style="text-decoration: underline">([^<>]+)</span>', '__%s__'],
-            [r'<span style="text-decoration: line-through">([^<>]+)</span>', '~~%s~~'],
-            [r'<div class="quote">(.*?)</div>', '> %s'],
-            [r'<span class="spoiler spoiler--hidden" onclick="showSpoiler\(event, this\)"> <span class="spoiler-text">(.*?)<\/span><\/span>', '||%s||'],
-            [r'<span class="unix-timestamp" data-timestamp=".*?" data-timestamp-format=".*?" data-timestamp-raw="(.*?)">', '%s'],
+            [r"<strong>(.*?)</strong>", '**{0}**'],
+            [r"<em>([^<>]+)</em>", '*{0}*'],
+            [r"<h1>([^<>]+)</h1>", '# {0}'],
+            [r"<h2>([^<>]+)</h2>", '## {0}'],
+            [r"<h3>([^<>]+)</h3>", '### {0}'],
+            [r'<span style="text-decoration: underline">([^<>]+)</span>', '__{0}__'],
+            [r'<span style="text-decoration: line-through">([^<>]+)</span>', '~~{0}~~'],
+            [r'<div class="quote">(.*?)</div>', '> {0}'],
+            [r'<span class="spoiler spoiler--hidden" onclick="showSpoiler\(event, this\)"> <span class="spoiler-text">(.*?)<\/span><\/span>', '||{0}||'],
+            [r'<span class="unix-timestamp" data-timestamp=".*?" data-timestamp-format=".*?" data-timestamp-raw="(.*?)">', '{0}'],
             [
                 r'<a href="([^"]+)" target="_blank" title="([^"]+)">([^<]+)</a>',
-                '[%s](%s "%s")',
+                '[{2}]({0} "{1}")',
             ],
-            [r'<a href="([^"]+)" target="_blank">([^<]+)</a>', '[%s](%s)'],
-            [r'<a href="([^"]+)" target="_blank">([^<]+)</a>', '%s'],
+            [r'<a href="([^"]+)" target="_blank">([^<]+)</a>', '[{1}]({0})'],
         )
 
-        for x in holders:
-            p, r = x
-            pattern = re.compile(p)
-            match = re.search(pattern, content)
-            while match is not None:
-                affected_text = match.group(1)
-                content = content.replace(
-                    content[match.start():match.end()],
-                    r % html.escape(affected_text),
-                )
-                match = re.search(pattern, content)
+        if "<" not in content:
+            return content.strip()
+
+        for p, r in holders:
+            content = _sub_until_stable(
+                re.compile(p),
+                lambda match, r=r: r.format(  # type: ignore
+                    *[html.escape(group) for group in match.groups()],
+                ),
+                content,
+            )
 
         return content.lstrip().rstrip()
 
     def https_http_links(self) -> None:
         def remove_silent_link(url: str, raw_url: Optional[str] = None) -> str:
-            pattern = rf"`.*{raw_url}.*`"
+            pattern = rf"`.*{re.escape(str(raw_url))}.*`"
             match = re.search(pattern, self.__content)
 
             if "&lt;" in url and "&gt;" in url and not match:
                 return url.replace("&lt;", "").replace("&gt;", "")
             return url
 
-        content = re.sub("\n", "<br>", self.__content)
+        content = self.__content.replace("\n", "<br>")
         output: List[str] = []
 
         if "http://" in content or "https://" in content and "](" not in content:
@@ -527,4 +562,4 @@ class ParseMarkdown:
                     output.append(word)
 
             content = " ".join(output)
-            self.__content = re.sub("<br>", "\n", content)
+            self.__content = content.replace("<br>", "\n")
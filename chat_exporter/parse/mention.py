@@ -1,192 +1,170 @@
 import discord
 
+import asyncio
 import pytz
 import re
 from datetime import datetime
 
-from typing import Optional
+from typing import Iterable, Match, Optional, Union
 
+from ..ext import Lookups, cache
+from ..ext.render_context import RenderContext
 from ..parse import ParseMarkdown
 
-bot: Optional[discord.Client] = None
-
 
 def pass_bot(_bot: discord.Client) -> None:
-    global bot
-    bot = _bot
+    # Exports Render with their Own Bot, so this Only Applies to Rendering Outside of One
+    RenderContext.current().bot = _bot
+
+
+@cache(key=lambda user_id: user_id, maxsize=10_000, ttl=60 * 60)
+async def _fetch_user(user_id: int) -> Optional[discord.User]:
+    bot = RenderContext.current().bot
+    assert bot is not None
+    try:
+        return await bot.fetch_user(user_id)
+    except discord.HTTPException:
+        return None
+
+
+async def prefetch_users(guild: Optional[discord.Guild], user_ids: Iterable[int]) -> None:
+    """
+    Fetches the Users that Aren't in the Guild or the Bot's Cache Concurrently, so Mentions of
+    them Resolve Without Waiting
+
+    Parameters
+    ----------
+    guild: Optional[:class:`discord.Guild`]
+        The Guild the Users are Mentioned In
+    user_ids: Iterable[:class:`int`]
+        The IDs of the Users
+    """
+
+    bot = RenderContext.current().bot
+    if not bot:
+        return
+
+    fetches = [
+        _fetch_user(user_id) for user_id in set(user_ids)
+        if not (guild and guild.get_member(user_id)) and not bot.get_user(user_id)
+    ]
+    await asyncio.gather(*fetches)
+
+
+class MentionResolver:
+    """Resolves the Channels, Members & Roles Mentioned in Content Against a Guild"""
+
+    def __init__(self, guild: Optional[discord.Guild], lookups: Lookups) -> None:
+        self.guild = guild
+        # Users Outside the Guild that Still Have to be Fetched are Added Here
+        self.lookups = lookups
+
+    def find_channel(self, channel_id: int) -> Optional[discord.abc.GuildChannel]:
+        return self.guild.get_channel(channel_id) if self.guild else None
+
+    def find_member(self, member_id: int) -> Optional[Union[discord.Member, discord.User]]:
+        member = self.guild.get_member(member_id) if self.guild else None
+
+        bot = RenderContext.current().bot
+        if (not member) and (bot):
+            member = bot.get_user(member_id)
+            if not member:
+                try:
+                    member = _fetch_user.cached(member_id)  # type: ignore
+                except KeyError:
+                    self.lookups.add(_fetch_user, member_id)
+
+        return member
+
+    def find_role(self, role_id: int) -> Optional[discord.Role]:
+        return self.guild.get_role(role_id) if self.guild else None
+
+    def channel(self, channel_id: int) -> str:
+        channel = self.find_channel(channel_id)
+        if channel is None:
+            return "#deleted-channel"
+        return f'<span class="mention" title="{channel.id}">#{channel.name}</span>'
+
+    def member(self, member_id: int) -> str:
+        member = self.find_member(member_id)
+        member_name = member.display_name if member else str(member_id)
+        return f'<span class="mention" title="{member_id}">@{member_name}</span>'
+
+    def role(self, role_id: int) -> str:
+        role = self.find_role(role_id)
+        if role is None:
+            return "@deleted-role"
+
+        colour = f"#{role.color.value:06x}"
+        return f'<span style="color: {colour};">@{role.name}</span>'
+
+    @staticmethod
+    def everyone(role_name: str) -> str:
+        return f'<span class="mention" title="{role_name}">@{role_name}</span>'
+
+    @staticmethod
+    def timestamp(timestamp: int, match: str) -> str:
+        timestamp = timestamp - 1
+        original = match.replace("&lt;", "<").replace("&gt;", ">")
+        tooltip_time = datetime.fromtimestamp(
+            timestamp, tz=pytz.utc,
+        ).isoformat()
+        key = original[-2]
+        if key.isdigit():
+            key = "f"
+
+        return f'<span class="unix-timestamp" data-timestamp="{tooltip_time}" data-timestamp-format="{key}" data-timestamp-raw="{original}">{original}</span>'
+
+    @staticmethod
+    def slash_command(slash_command_name: str) -> str:
+        return f'<span class="mention" title="{slash_command_name}">/{slash_command_name}</span>'
+
+    def replace(self, match: Match[str]) -> str:
+        kind = match.lastgroup
+        value = match.group(kind)  # type: ignore
+
+        if kind in ("channel", "channel_2"):
+            return self.channel(int(value))
+        if kind in ("member", "member_2"):
+            return self.member(int(value))
+        if kind in ("role", "role_2"):
+            return self.role(int(value))
+        if kind == "everyone":
+            return self.everyone(value)
+        if kind == "timestamp":
+            return self.timestamp(int(value), match.group())
+        return self.slash_command(value)
 
 
 class ParseMention:
     """The Mention Parser"""
 
-    REGEX_ROLES = r"(?<!\\)&lt;@&amp;([0-9]+)&gt;"
-    REGEX_ROLES_2 = r"(?<!\\)<@&([0-9]+)>"
-    REGEX_EVERYONE = r"(?<!\\)@(everyone)(?:[$\s\t\n\f\r\0]|$)"
-    REGEX_HERE = r"(?<!\\)@(here)(?:[$\s\t\n\f\r\0]|$)"
-    REGEX_MEMBERS = r"(?<!\\)&lt;@!?([0-9]+)&gt;"
-    REGEX_MEMBERS_2 = r"(?<!\\)<@!?([0-9]+)>"
-    REGEX_CHANNELS = r"(?<!\\)&lt;#([0-9]+)&gt;"
-    REGEX_CHANNELS_2 = r"(?<!\\)<#([0-9]+)>"
-    REGEX_EMOJIS = r"(?<!\\)&lt;a?(:[^\n:]+:)[0-9]+&gt;"
-    REGEX_EMOJIS_2 = r"(?<!\\)<a?(:[^\n:]+:)[0-9]+>"
-    REGEX_TIME_HOLDER = (
-        [r"(?<!\\)&lt;t:([0-9]{1,13}):t&gt;"],
-        [r"(?<!\\)&lt;t:([0-9]{1,13}):T&gt;"],
-        [r"(?<!\\)&lt;t:([0-9]{1,13}):d&gt;"],
-        [r"(?<!\\)&lt;t:([0-9]{1,13}):D&gt;"],
-        [r"(?<!\\)&lt;t:([0-9]{1,13}):f&gt;"],
-        [r"(?<!\\)&lt;t:([0-9]{1,13}):F&gt;"],
-        [r"(?<!\\)&lt;t:([0-9]{1,13}):R&gt;"],
-        [r"(?<!\\)&lt;t:([0-9]{1,13})&gt;"],
+    # Every Kind of Mention, so they're All Replaced in a Single Pass
+    REGEX_MENTIONS = re.compile(
+        r"(?<!\\)(?:"
+        r"&lt;#(?P<channel>[0-9]+)&gt;|<#(?P<channel_2>[0-9]+)>"
+        r"|&lt;@!?(?P<member>[0-9]+)&gt;|<@!?(?P<member_2>[0-9]+)>"
+        r"|@(?P<everyone>everyone|here)(?:[$\s\t\n\f\r\0]|$)"
+        r"|&lt;@&amp;(?P<role>[0-9]+)&gt;|<@&(?P<role_2>[0-9]+)>"
+        r"|&lt;t:(?P<timestamp>[0-9]{1,13})(?::[tTdDfFR])?&gt;"
+        r"|&lt;\/(?P<slash_command>[\w\s-]+):[0-9]+&gt;"
+        r")",
     )
-    REGEX_SLASH_COMMAND = r"(?<!\\)&lt;\/([\w\s-]+):[0-9]+&gt;"
-
-    ESCAPE_LT = "______lt______"
-    ESCAPE_GT = "______gt______"
-    ESCAPE_AMP = "______amp______"
 
     @staticmethod
-    async def flow(guild: Optional[discord.Guild], *, content: str) -> str:
+    def flow(guild: Optional[discord.Guild], *, content: str, lookups: Lookups) -> str:
+        """
+        Replaces the Mentions, Timestamps & Slash Commands of the Content
+
+        Users Outside the Guild that Still Have to be Fetched are Added to `lookups` &
+        Rendered as their ID.
+        """
+
         markdown = ParseMarkdown(content)
         markdown.parse_code_block_markdown()
         content = markdown.content
 
-        for match in re.finditer(
-            "(%s|%s|%s|%s|%s|%s|%s|%s)" % (
-                ParseMention.REGEX_ROLES,
-                ParseMention.REGEX_MEMBERS,
-                ParseMention.REGEX_CHANNELS,
-                ParseMention.REGEX_EMOJIS,
-                ParseMention.REGEX_ROLES_2,
-                ParseMention.REGEX_MEMBERS_2,
-                ParseMention.REGEX_CHANNELS_2,
-                ParseMention.REGEX_EMOJIS_2,
-            ), content,
-        ):
-            pre_content = content[:match.start()]
-            post_content = content[match.end():]
-            match_content = content[match.start():match.end()]
-
-            match_content = match_content.replace("<", ParseMention.ESCAPE_LT)
-            match_content = match_content.replace(">", ParseMention.ESCAPE_GT)
-            match_content = match_content.replace("&", ParseMention.ESCAPE_AMP)
-
-            content = pre_content + match_content + post_content
-
-        content = content.replace(ParseMention.ESCAPE_LT, "<")
-        content = content.replace(ParseMention.ESCAPE_GT, ">")
-        content = content.replace(ParseMention.ESCAPE_AMP, "&")
-
-        for regex in (ParseMention.REGEX_CHANNELS, ParseMention.REGEX_CHANNELS_2):
-            match = re.search(regex, content)
-            while match is not None:
-                if guild:
-                    channel_id = int(match.group(1))
-                    channel = guild.get_channel(channel_id)
-                else:
-                    channel = None
-
-                if channel is None:
-                    replacement = "#deleted-channel"
-                else:
-                    replacement = f'<span class="mention" title="{channel.id}">#{channel.name}</span>'
-
-                content = content.replace(
-                    content[match.start():match.end()],
-                    replacement,
-                )
-                match = re.search(regex, content)
-
-        for regex in (ParseMention.REGEX_MEMBERS, ParseMention.REGEX_MEMBERS_2):
-            match = re.search(regex, content)
-            while match is not None:
-                member_id = int(match.group(1))
-                if guild:
-                    member = guild.get_member(member_id)
-                else:
-                    member = None
-
-                if (not member) and (bot):
-                    try:
-                        member = bot.get_user(member_id) or await bot.fetch_user(member_id)
-                    except discord.HTTPException:
-                        pass
-
-                member_name = member.display_name if member else str(member_id)
-
-                replacement = f'<span class="mention" title="{member_id}">@{member_name}</span>'
-                content = content.replace(
-                    content[match.start():match.end()],
-                    replacement,
-                )
-                match = re.search(regex, content)
-
-        for regex in (ParseMention.REGEX_EVERYONE, ParseMention.REGEX_HERE):
-            match = re.search(regex, content)
-            while match is not None:
-                role_name = match.group(1)
-                replacement = f'<span class="mention" title="{role_name}">@{role_name}</span>'
-                content = content.replace(
-                    content[match.start():match.end()],
-                    replacement,
-                )
-                match = re.search(regex, content)
-
-        for regex in (ParseMention.REGEX_ROLES, ParseMention.REGEX_ROLES_2):
-            match = re.search(regex, content)
-            while match is not None:
-                if guild:
-                    role_id = int(match.group(1))
-                    role = guild.get_role(role_id)
-                else:
-                    role = None
-
-                if role is None:
-                    replacement = "@deleted-role"
-                else:
-                    colour = f"#{role.color.value:06x}"
-                    replacement = f'<span style="color: {colour};">@{role.name}</span>'
-
-                content = content.replace(
-                    content[match.start():match.end()],
-                    replacement,
-                )
-                match = re.search(regex, content)
-
-        for regex in ParseMention.REGEX_TIME_HOLDER:
-            r = regex[0]
-            match = re.search(r, content)
-            while match is not None:
-                timestamp = int(match.group(1)) - 1
-                tooltip_time = datetime.fromtimestamp(
-                    timestamp, tz=pytz.utc,
-                ).isoformat()
-                original = match.group().replace("&lt;", "<").replace("&gt;", ">")
-                key = original[-2]
-                if key.isdigit():
-                    key = "f"
-                else:
-                    key = original[-2]
-
-                replacement = f'<span class="unix-timestamp" data-timestamp="{tooltip_time}" data-timestamp-format="{key}" data-timestamp-raw="{original}">{original}</span>'
-
-                content = content.replace(
-                    content[match.start():match.end()],
-                    replacement,
-                )
-                match = re.search(r, content)
-
-        for regex in (ParseMention.REGEX_SLASH_COMMAND,):
-            match = re.search(regex, content)
-            while match is not None:
-                slash_command_name = match.group(1)
-                replacement = f'<span class="mention" title="{slash_command_name}">/{slash_command_name}</span>'
-                content = content.replace(
-                    content[match.start():match.end()],
-                    replacement,
-                )
-                match = re.search(regex, content)
-
-        markdown.content = content
-        content = markdown.content
-        return content
+        if "@" not in content and "&lt;" not in content and "<" not in content:
+            return content
+
+        return ParseMention.REGEX_MENTIONS.sub(MentionResolver(guild, lookups).replace, content)
@@ -0,0 +1,105 @@
+"""
+Times Converting the Emoji of Message Text by Segmenting Every Grapheme Against Only Segmenting Around Possible Emoji
+
+    python scripts/bench_emoji_scan.py --messages 2000
+
+Every Emoji's Image is Taken to Exist (No Requests are Made), & the Output of Both is Checked to be
+Identical.
+"""
+
+import argparse
+import emoji
+import os
+import random
+import sys
+import time
+from grapheme import graphemes
+
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chat_exporter.ext import Lookups, emojify  # noqa: E402
+from chat_exporter.ext.emoji_convert import (  # noqa: E402
+    convert,
+    emoji_src,
+    store_valid_srcs,
+)
+
+WORDS = "the quick brown fox jumps over the lazy dog lol ok yeah sure thing tomorrow at 5".split()
+NON_LATIN = ["привет", "мир", "你好", "世界", "ok"]
+
+
+def every_grapheme(string: str) -> str:
+    lookups = Lookups()
+    chars = graphemes(string)
+    return "".join([convert(char, lookups) for char in chars])  # type: ignore
+
+
+def only_possible_emoji(string: str) -> str:
+    return emojify(string, Lookups())
+
+
+def corpora(messages: int, seed: int) -> Dict[str, List[str]]:
+    rnd = random.Random(seed)
+    status = emoji.STATUS["fully_qualified"]
+    fully_qualified = [
+        char for char, data in emoji.EMOJI_DATA.items() if data["status"] == status
+    ]
+
+    def sentence(share: float) -> str:
+        return " ".join(
+            rnd.choice(fully_qualified) if rnd.random() < share else rnd.choice(WORDS)
+            for _ in range(rnd.randint(5, 30))
+        )
+
+    return {
+        "ascii": [sentence(0) for _ in range(messages)],
+        "ascii + 2% emoji": [sentence(0.02) for _ in range(messages)],
+        "emoji-heavy (50%)": [sentence(0.5) for _ in range(messages)],
+        "cyrillic & cjk": [" ".join(rnd.choices(NON_LATIN, k=20)) for _ in range(messages)],
+    }
+
+
+def best_of(repeat: int, func: Callable[[str], str], texts: List[str]) -> Tuple[float, List[str]]:
+    best = float("inf")
+    converted: List[str] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        converted = [func(text) for text in texts]
+        best = min(best, time.perf_counter() - start)
+    return best, converted
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--messages", type=int, default=2000,
+        help="The Messages per Corpus",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3,
+        help="The Runs per Corpus (the Fastest is Kept)",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=2,
+        help="The Seed the Corpora are Generated With",
+    )
+    args = parser.parse_args()
+
+    srcs = {emoji_src(char) for char in emoji.EMOJI_DATA}
+    store_valid_srcs({src: True for src in srcs if src is not None})
+    for name, texts in corpora(args.messages, args.seed).items():
+        segmented, expected = best_of(args.repeat, every_grapheme, texts)
+        scanned, converted = best_of(args.repeat, only_possible_emoji, texts)
+        assert converted == expected, f"The Conversions of the {name} Corpus Differ"
+
+        size = sum(map(len, texts)) / 2 ** 20
+        print(
+            f"{name:18s} {size:5.2f} MiB   every grapheme {segmented * 1e3:8.1f} ms   "
+            f"only possible emoji {scanned * 1e3:7.1f} ms   x{segmented / scanned:.1f}",
+        )
+
+
+if __name__ == "__main__":
+    main()
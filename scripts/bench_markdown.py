@@ -0,0 +1,96 @@
+"""
+Times the Markdown Parser's Flows on Generated Corpora, in MB of Message Text per Second
+
+    python scripts/bench_markdown.py --messages 2000
+
+Unicode Emoji are Left As-Is, as Converting them is Timed by `bench_emoji_scan.py`.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chat_exporter.ext import Lookups  # noqa: E402
+from chat_exporter.ext.render_context import RenderContext  # noqa: E402
+from chat_exporter.parse import ParseMarkdown, markdown  # noqa: E402
+
+TOKENS = [
+    "word", "text", " ", " ", "\n", "\n\n", "*", "**", "_", "__", "~~", "||", "`", "```",
+    "```py\n", "# ", "## ", "1. ", "  1. ", "- ", "  - ", "&gt; ", "&lt;:smile:1234&gt;",
+    "&lt;a:dance:987&gt;", "https://example.com/path", "&lt;https://silent.io&gt;",
+    "[text](https://link.com)", "\\*", "&amp;", "123", ":", "(", ")",
+]
+FLOWS: Dict[str, Callable[[str], str]] = {
+    "message": lambda text: ParseMarkdown(text, Lookups()).standard_message_flow(),
+    "embed": lambda text: ParseMarkdown(text, Lookups()).standard_embed_flow(),
+    "reference": lambda text: ParseMarkdown(text, Lookups()).message_reference_flow(),
+}
+
+
+def corpora(messages: int, seed: int) -> Dict[str, List[str]]:
+    rnd = random.Random(seed)
+    prose = "the quick brown fox jumps over the lazy dog ".split()
+
+    def tokens() -> str:
+        return "".join(rnd.choice(TOKENS) for _ in range(rnd.randint(5, 60)))
+
+    quoted_list = "".join(
+        f"&gt; quote line {i} with **bold** & `code {i}`\n- item {i}\n" for i in range(400)
+    )
+    code = " ".join(f"`x{i}`" for i in range(1000)) + "\n" + "".join(
+        f"```py\nprint({i})\n```" for i in range(300)
+    )
+    return {
+        "plain prose": [" ".join(rnd.choices(prose, k=30)) for _ in range(messages)],
+        "random markdown": [tokens() for _ in range(messages)],
+        "400-line quoted list": [quoted_list] * 5,
+        "1300 code spans & blocks": [code] * 2,
+    }
+
+
+def best_of(repeat: int, flow: Callable[[str], str], texts: List[str]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        # Code Blocks are Numbered Per Export, so Each Run Starts Afresh
+        with RenderContext().activate():
+            start = time.perf_counter()
+            for text in texts:
+                flow(text)
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--messages", type=int, default=2000,
+        help="The Messages per Generated Corpus",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3,
+        help="The Runs per Corpus & Flow (the Fastest is Kept)",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=2,
+        help="The Seed the Corpora are Generated With",
+    )
+    args = parser.parse_args()
+
+    markdown.emojify = lambda string, lookups: string  # type: ignore
+    for name, texts in corpora(args.messages, args.seed).items():
+        size = sum(map(len, texts)) / 1e6
+        timings = [
+            f"{flow_name} {size / best_of(args.repeat, flow, texts):6.2f} MB/s"
+            for flow_name, flow in FLOWS.items()
+        ]
+        print(f"{name:24s} {size:5.2f} MB   " + "   ".join(timings))
+
+
+if __name__ == "__main__":
+    main()
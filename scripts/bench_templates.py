@@ -0,0 +1,117 @@
+"""
+Times Filling Out the Templates with a Compiled `Template` Against Replacing Each Placeholder in Turn
+
+    python scripts/bench_templates.py --repeat 20000
+
+The Values are Output As-Is (`ParseMode.NONE`), so Only the Templating Itself is Measured.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+from typing import Callable, Dict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chat_exporter.ext import (  # noqa: E402
+    ParseMode,
+    fill_out,
+    message_body,
+    start_message,
+    total,
+)
+from chat_exporter.ext.html_generator import compile_template  # noqa: E402
+
+START_MESSAGE_VALUES = {
+    "REFERENCE_SYMBOL": "",
+    "REFERENCE": "",
+    "AVATAR_URL": "https://cdn.discordapp.com/embed/avatars/0.png",
+    "NAME_TAG": "alice",
+    "USER_ID": "1001",
+    "USER_COLOUR": "color: #ffffff;",
+    "USER_ICON": "",
+    "NAME": "alice",
+    "APP_TAG": "",
+    "TIMESTAMP": "2024-01-01T00:00:00",
+    "MESSAGE_ID": "123456789012345678",
+    "MESSAGE_CONTENT": "hello world " * 10,
+    "EMBEDS": "",
+    "ATTACHMENTS": "",
+    "COMPONENTS": "",
+    "EMOJI": "",
+}
+
+MESSAGE_BODY_KEYS = [
+    "MESSAGE_ID", "MESSAGE_CONTENT", "EMBEDS", "ATTACHMENTS", "COMPONENTS", "EMOJI", "TIMESTAMP",
+]
+
+TOTAL_KEYS = [
+    "TITLE", "CONTEXT", "SERVER_NAME", "GUILD_ID", "SERVER_AVATAR_URL", "MESSAGE_COUNT",
+    "META_DATA", "DATE_TIME", "SUBJECT", "CHANNEL_TITLE", "CHANNEL_NAME", "CHANNEL_CREATED_AT",
+    "CHANNEL_TOPIC", "CHANNEL_THREADS", "CHANNEL_ID", "CHANNEL_ICON", "CHANNEL_TYPE",
+    "MESSAGE_PARTICIPANTS", "TIME_FORMAT",
+]
+
+
+def replace_each(base: str, values: Dict[str, str]) -> str:
+    for key, value in values.items():
+        base = base.replace("{{" + key + "}}", value)
+    return base
+
+
+def timed(repeat: int, func: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+async def fill_out_time(repeat: int, base: str, values: Dict[str, str]) -> float:
+    replacements = [(key, value, ParseMode.NONE) for key, value in values.items()]
+    start = time.perf_counter()
+    for _ in range(repeat):
+        await fill_out(None, base, replacements)  # type: ignore
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--repeat", type=int, default=20000,
+        help="The Renders per Message Template",
+    )
+    parser.add_argument(
+        "--messages-mb", type=float, default=5,
+        help="The Size of the Messages in base.html",
+    )
+    args = parser.parse_args()
+
+    body_values = {key: START_MESSAGE_VALUES[key] for key in MESSAGE_BODY_KEYS}
+    total_values = {key: "value" for key in TOTAL_KEYS}
+    total_values["MESSAGES"] = "x" * int(args.messages_mb * 2 ** 20)
+    total_repeat = max(1, args.repeat // 1000)
+
+    cases = [
+        ("start_message", start_message, START_MESSAGE_VALUES, args.repeat, 1e6, "us"),
+        ("message_body", message_body, body_values, args.repeat, 1e6, "us"),
+        (
+            f"base.html ({args.messages_mb:g} MiB of messages)",
+            total, total_values, total_repeat, 1e3, "ms",
+        ),
+    ]
+    for name, base, values, repeat, scale, unit in cases:
+        template = compile_template(base)
+        replaced = timed(repeat, lambda: replace_each(base, values))
+        compiled = timed(repeat, lambda: template.render(values))
+        filled = asyncio.run(fill_out_time(repeat, base, values))
+        print(
+            f"{name:36s} replace each {replaced * scale:8.1f} {unit}   "
+            f"compiled {compiled * scale:8.1f} {unit}   fill_out {filled * scale:8.1f} {unit}",
+        )
+
+
+if __name__ == "__main__":
+    main()
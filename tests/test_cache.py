@@ -0,0 +1,205 @@
+import asyncio
+import sqlite3
+import time
+
+from typing import Any, Callable, List
+
+from chat_exporter.ext import PersistentCache, cache, use_persistent_cache
+from chat_exporter.ext.render_context import RenderContext
+
+
+def _run(test: Callable[[], Any]) -> None:
+    async def run() -> None:
+        # Each Test Holds its Results Apart, as Each Export Does
+        with RenderContext().activate():
+            await test()
+
+    asyncio.run(run())
+
+
+def _slow(calls: List[str], delay: float = 0.05, **kwargs: Any):
+    @cache(**kwargs)
+    async def lookup(name: str) -> str:
+        calls.append(name)
+        await asyncio.sleep(delay)
+        return name.upper()
+
+    return lookup
+
+
+def test_concurrent_callers_share_one_call():
+    calls: List[str] = []
+    lookup = _slow(calls)
+
+    async def test() -> None:
+        results = await asyncio.gather(*(lookup("a") for _ in range(10)))
+        assert results == ["A"] * 10
+        assert await lookup("a") == "A"
+
+    _run(test)
+    assert calls == ["a"]
+
+
+def test_failures_are_not_cached():
+    calls: List[str] = []
+
+    @cache()
+    async def lookup(name: str) -> str:
+        calls.append(name)
+        await asyncio.sleep(0.01)
+        if len(calls) == 1:
+            raise RuntimeError("offline")
+        return name
+
+    async def test() -> None:
+        failures = await asyncio.gather(lookup("a"), lookup("a"), return_exceptions=True)
+        assert [type(failure) for failure in failures] == [RuntimeError, RuntimeError]
+        assert await lookup("a") == "a"
+
+    _run(test)
+    assert calls == ["a", "a"]
+
+
+def test_the_least_recently_used_result_is_evicted():
+    calls: List[str] = []
+    lookup = _slow(calls, delay=0, maxsize=2)
+
+    async def test() -> None:
+        for name in ("a", "b", "a", "c", "a", "b"):
+            await lookup(name)
+
+    _run(test)
+    assert calls == ["a", "b", "c", "b"]
+    assert lookup.namespace.evictions == 2  # type: ignore
+
+
+def test_results_expire_after_the_ttl():
+    calls: List[str] = []
+    lookup = _slow(calls, delay=0, ttl=0.05)
+
+    async def test() -> None:
+        await lookup("a")
+        await lookup("a")
+        await asyncio.sleep(0.1)
+        await lookup("a")
+
+    _run(test)
+    assert calls == ["a", "a"]
+    assert lookup.namespace.expirations == 1  # type: ignore
+
+
+def test_calls_in_flight_are_not_evicted_by_other_results():
+    calls: List[str] = []
+
+    @cache(maxsize=1)
+    async def lookup(name: str) -> str:
+        calls.append(name)
+        await asyncio.sleep(0.2 if name == "slow" else 0)
+        return name.upper()
+
+    async def test() -> None:
+        first = asyncio.ensure_future(lookup("slow"))
+        await asyncio.sleep(0)
+        # Filling the Namespace Past its Bound while the Slow Call is Still Being Made
+        for name in ("b", "c"):
+            await lookup(name)
+        assert not first.done()
+        assert await asyncio.gather(lookup("slow"), first) == ["SLOW", "SLOW"]
+
+    _run(test)
+    assert calls == ["slow", "b", "c"]
+
+
+def test_calls_in_flight_do_not_expire():
+    calls: List[str] = []
+    lookup = _slow(calls, delay=0.1, ttl=0.01)
+
+    async def test() -> None:
+        first = asyncio.ensure_future(lookup("slow"))
+        await asyncio.sleep(0.05)
+        assert await asyncio.gather(lookup("slow"), first) == ["SLOW", "SLOW"]
+
+    _run(test)
+    assert calls == ["slow"]
+
+
+def test_persisted_results_are_written_in_batches(tmp_path):
+    persistent_cache = PersistentCache(tmp_path / "lookups.db", commit_interval=3)
+    other = sqlite3.connect(tmp_path / "lookups.db")
+
+    def written() -> int:
+        return other.execute("SELECT COUNT(*) FROM lookups").fetchone()[0]
+
+    async def test() -> None:
+        persistent_cache.set("a", 1)
+        persistent_cache.set("b", 2)
+        assert written() == 0
+        assert await persistent_cache.get("a") == (True, 1)
+
+        persistent_cache.set("c", 3)
+        await persistent_cache.flush()
+        assert written() == 3
+
+        persistent_cache.set("d", 4)
+        await persistent_cache.flush()
+        assert written() == 4
+
+    _run(test)
+    persistent_cache.set("e", 5)
+    persistent_cache.close()
+    assert written() == 5
+    other.close()
+
+
+def test_a_locked_persistent_cache_does_not_block_the_event_loop(tmp_path):
+    persistent_cache = PersistentCache(tmp_path / "lookups.db", busy_timeout=0.3)
+    ticks: List[float] = []
+
+    async def tick() -> None:
+        while True:
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.01)
+
+    async def test() -> None:
+        persistent_cache.set("key", 1)
+        await persistent_cache.flush()
+
+        # Another Process Writing
+        other = sqlite3.connect(tmp_path / "lookups.db", isolation_level=None)
+        other.execute("BEGIN IMMEDIATE")
+
+        ticker = asyncio.ensure_future(tick())
+        persistent_cache.set("other", 2)
+        await persistent_cache.flush()
+        # Readers Never Wait on the Writer
+        found = await persistent_cache.get("key")
+        ticker.cancel()
+        other.rollback()
+        other.close()
+
+        assert len(ticks) > 10
+        assert persistent_cache.skipped_writes == 1
+        assert found == (True, 1)
+        assert await persistent_cache.get("other") == (False, None)
+
+    _run(test)
+    persistent_cache.close()
+
+
+def test_persisted_results_are_shared_across_exports(tmp_path):
+    persistent_cache = PersistentCache(tmp_path / "lookups.db")
+    calls: List[str] = []
+    lookup = _slow(calls, persist=True)
+
+    async def test() -> None:
+        assert await asyncio.gather(*(lookup("a") for _ in range(5))) == ["A"] * 5
+
+    use_persistent_cache(persistent_cache)
+    try:
+        _run(test)
+        _run(test)
+    finally:
+        use_persistent_cache(None)
+        persistent_cache.close()
+    assert calls == ["a"]
+    assert persistent_cache.hits == 1
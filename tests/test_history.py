@@ -0,0 +1,110 @@
+import discord
+
+import asyncio
+import pytest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from typing import List, Optional
+
+from chat_exporter.construct.history import partition_window, partitioned_history
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+END = START + timedelta(days=30)
+
+
+class FakeChannel:
+    """A Messageable Serving its History from a List, Like `discord.abc.Messageable.history`"""
+
+    def __init__(self, message_ids: List[int]) -> None:
+        self.id = discord.utils.time_snowflake(START)
+        self.message_ids = sorted(message_ids)
+        self.fail_after: Optional[int] = None
+
+    async def history(
+        self,
+        *,
+        limit: Optional[int] = None,
+        before: discord.abc.Snowflake,
+        after: discord.abc.Snowflake,
+        oldest_first: bool = True,
+    ):
+        ids = [i for i in self.message_ids if after.id < i < before.id]
+        if not oldest_first:
+            ids.reverse()
+        for message_id in ids:
+            # Gives the Other Slices a Chance to Run, as a Request Would
+            await asyncio.sleep(0)
+            if self.fail_after is not None and message_id > self.fail_after:
+                raise discord.DiscordException("History Failed")
+            yield SimpleNamespace(id=message_id)
+
+
+def _boundary_ids(partitions: int) -> List[int]:
+    """Messages On, Just Before & Just After Every Slice Boundary"""
+
+    lower = discord.utils.time_snowflake(START) - 1
+    upper = discord.utils.time_snowflake(END, high=False)
+    ids = set()
+    for slice_after, slice_before in partition_window(lower, upper, partitions):
+        for edge in (slice_after, slice_before):
+            ids.update(i for i in (edge - 1, edge, edge + 1) if lower < i < upper)
+    return sorted(ids)
+
+
+async def _collect(channel: FakeChannel, **kwargs) -> List[int]:
+    history = partitioned_history(channel, before=END, **kwargs)  # type: ignore
+    return [message.id async for message in history]
+
+
+@pytest.mark.parametrize("partitions", [1, 2, 3, 7, 16])
+@pytest.mark.parametrize("oldest_first", [True, False])
+def test_no_gaps_or_duplicates_at_slice_boundaries(partitions: int, oldest_first: bool):
+    ids = _boundary_ids(partitions)
+    channel = FakeChannel(ids)
+
+    collected = asyncio.run(
+        _collect(
+            channel,
+            oldest_first=oldest_first,
+            partitions=partitions,
+            max_concurrency=3,
+            buffer_size=2,
+        ),
+    )
+
+    assert collected == (ids if oldest_first else ids[::-1])
+
+
+def test_partition_window_covers_every_snowflake_once():
+    lower, upper = 1000, 1100
+    covered = [
+        i for slice_after, slice_before in partition_window(lower, upper, 7)
+        for i in range(slice_after + 1, slice_before)
+    ]
+
+    assert covered == list(range(lower + 1, upper))
+
+
+def test_stopping_early_cancels_the_running_slices():
+    channel = FakeChannel(_boundary_ids(8))
+
+    async def consume_first() -> int:
+        history = partitioned_history(
+            channel, before=END, partitions=8, buffer_size=1,  # type: ignore
+        )
+        first = await history.__anext__()
+        await history.aclose()
+        assert asyncio.all_tasks() == {asyncio.current_task()}
+        return first.id
+
+    assert asyncio.run(consume_first()) == channel.message_ids[0]
+
+
+def test_a_failed_slice_raises():
+    ids = _boundary_ids(4)
+    channel = FakeChannel(ids)
+    channel.fail_after = ids[len(ids) // 2]
+
+    with pytest.raises(discord.DiscordException):
+        asyncio.run(_collect(channel, partitions=4, buffer_size=1))
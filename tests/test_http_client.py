@@ -0,0 +1,224 @@
+import discord
+
+import aiohttp
+import asyncio
+import pytest
+import time
+import types
+from aiohttp import web
+
+from typing import Dict, List, Tuple
+
+from chat_exporter.construct import (
+    AttachmentHandler,
+    AttachmentToDiscordChannelHandler,
+    AttachmentToLocalFileHostHandler,
+    Transcript,
+)
+from chat_exporter.ext import HTTPClient
+
+
+class StandInServer:
+    """A Local Server Answering the Way a CDN Might, Counting the Requests & Connections it Gets"""
+
+    def __init__(self) -> None:
+        self.requests: List[str] = []
+        self.peers: set = set()
+        self.runner: web.AppRunner
+        self.url = ""
+
+        self.app = web.Application()
+        self.app.router.add_route("*", "/ok", self.ok)
+        self.app.router.add_route("*", "/missing", self.missing)
+        self.app.router.add_route("*", "/flaky/{failures}", self.flaky)
+        self.app.router.add_route("*", "/throttled", self.throttled)
+
+    async def __aenter__(self) -> "StandInServer":
+        self.runner = web.AppRunner(self.app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        host, port = site._server.sockets[0].getsockname()[:2]  # type: ignore
+        self.url = f"http://{host}:{port}"
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.runner.cleanup()
+
+    def _seen(self, request: web.Request) -> None:
+        self.requests.append(request.path)
+        self.peers.add(request.transport.get_extra_info("peername"))  # type: ignore
+
+    async def ok(self, request: web.Request) -> web.Response:
+        self._seen(request)
+        return web.Response(body=b"image")
+
+    async def missing(self, request: web.Request) -> web.Response:
+        self._seen(request)
+        return web.Response(status=404)
+
+    async def flaky(self, request: web.Request) -> web.Response:
+        self._seen(request)
+        if self.requests.count(request.path) <= int(request.match_info["failures"]):
+            return web.Response(status=503, headers={"Retry-After": "0"})
+        return web.Response(body=b"recovered")
+
+    async def throttled(self, request: web.Request) -> web.Response:
+        self._seen(request)
+        return web.Response(status=429, headers={"Retry-After": "3600"})
+
+
+def _serve(test) -> None:
+    async def run() -> None:
+        async with StandInServer() as server:
+            await test(server)
+
+    asyncio.run(run())
+
+
+def test_connections_are_reused_until_the_last_user_exits():
+    client = HTTPClient()
+
+    async def test(server: StandInServer) -> None:
+        async with client:
+            async with client:
+                statuses = [await client.status(server.url + "/ok") for _ in range(5)]
+            assert client._session is not None
+        assert client._session is None
+
+        assert statuses == [200] * 5
+        assert len(server.peers) == 1
+
+    _serve(test)
+
+
+def test_retries_until_the_server_recovers():
+    client = HTTPClient(retries=2, backoff=0)
+
+    async def test(server: StandInServer) -> None:
+        async with client:
+            body = await client.read(server.url + "/flaky/2")
+
+        assert body == b"recovered"
+        assert server.requests == ["/flaky/2"] * 3
+
+    _serve(test)
+
+
+def test_gives_up_after_the_retries():
+    client = HTTPClient(retries=1, backoff=0)
+
+    async def test(server: StandInServer) -> None:
+        async with client:
+            status = await client.status(server.url + "/flaky/5")
+            with pytest.raises(aiohttp.ClientResponseError):
+                await client.read(server.url + "/missing")
+
+        assert status == 503
+        assert server.requests == ["/flaky/5"] * 2 + ["/missing"]
+
+    _serve(test)
+
+
+def test_retry_after_is_clamped_to_the_max_backoff():
+    client = HTTPClient(retries=2, max_backoff=0.05)
+
+    async def test(server: StandInServer) -> None:
+        start = time.perf_counter()
+        async with client:
+            status = await client.status(server.url + "/throttled")
+
+        assert status == 429
+        assert len(server.requests) == 3
+        assert time.perf_counter() - start < 5
+
+    _serve(test)
+
+
+def test_the_session_of_another_event_loop_is_closed():
+    client = HTTPClient()
+    sessions: List[aiohttp.ClientSession] = []
+
+    async def test(server: StandInServer) -> None:
+        # Outside `async with`, so the Session Outlives the Loop
+        assert await client.status(server.url + "/ok") == 200
+        sessions.append(client.session)
+
+    async def close(server: StandInServer) -> None:
+        await client.status(server.url + "/ok")
+        await client.close()
+
+    _serve(test)
+    _serve(test)
+    first, second = sessions
+    assert first is not second
+    assert first.closed
+    assert not second.closed
+
+    _serve(close)
+    assert second.closed
+
+
+def test_exports_keep_the_attachment_handlers_client_open(tmp_path):
+    client, handler_client = HTTPClient(), HTTPClient()
+    handler = AttachmentToLocalFileHostHandler(tmp_path, "https://a.io", handler_client)
+    transcript = Transcript(
+        channel=None,  # type: ignore
+        limit=None,
+        messages=[],
+        military_time=False,
+        before=None,
+        after=None,
+        bot=None,
+        attachment_handler=handler,
+        http_client=client,
+    )
+    users: Dict[str, Tuple[int, int]] = {}
+
+    async def export() -> None:
+        handler_client.session
+        users["during"] = (client._users, handler_client._users)
+
+    transcript._export = export  # type: ignore
+
+    async def run() -> None:
+        await transcript.export()
+        users["after"] = (client._users, handler_client._users)
+        assert handler_client._session is None
+
+    asyncio.run(run())
+
+    assert transcript.http_clients == [client, handler_client]
+    assert users == {"during": (1, 1), "after": (0, 0)}
+
+
+def _attachment(url: str) -> discord.Attachment:
+    data = {"id": 1, "filename": "a.png", "size": 5, "url": url, "proxy_url": url}
+    state = types.SimpleNamespace(http=None)
+    return discord.Attachment(data=data, state=state)  # type: ignore
+
+
+@pytest.mark.parametrize("handler_type", ["local", "channel"])
+def test_failed_downloads_are_raised_as_discord_errors(tmp_path, handler_type: str):
+    client = HTTPClient(retries=0)
+    handler: AttachmentHandler
+    if handler_type == "local":
+        handler = AttachmentToLocalFileHostHandler(tmp_path, "https://a.io", client)
+    else:
+        handler = AttachmentToDiscordChannelHandler(None, client)  # type: ignore
+
+    async def test(server: StandInServer) -> None:
+        async with client:
+            with pytest.raises(discord.NotFound) as missing:
+                await handler.process_asset(_attachment(server.url + "/missing"))
+            with pytest.raises(discord.HTTPException) as unavailable:
+                await handler.process_asset(_attachment(server.url + "/flaky/5"))
+            with pytest.raises(discord.HTTPException) as unreachable:
+                await handler.process_asset(_attachment("http://127.0.0.1:1/a.png"))
+
+        assert missing.value.status == 404
+        assert unavailable.value.status == 503
+        assert unreachable.value.status == 0
+        assert isinstance(unreachable.value.__cause__, aiohttp.ClientError)
+
+    _serve(test)
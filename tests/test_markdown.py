@@ -0,0 +1,54 @@
+import json
+import pathlib
+import pytest
+
+from typing import Any, Dict, List
+
+from chat_exporter.ext import Lookups
+from chat_exporter.ext.render_context import RenderContext
+from chat_exporter.parse import ParseMarkdown, markdown
+
+# Every Flow's Output for a Corpus of Hand-Written & Randomly Assembled Markdown, Recorded Before the
+# Parser's Search-&-Replace Loops were Removed (Leaving Out the Outputs it Got Wrong: where it
+# Raised, or Left a Code Block Nested in Another Unrestored)
+GOLDEN_PATH = pathlib.Path(__file__).with_name("data") / "markdown_golden.json"
+FLOWS = [
+    "standard_message_flow",
+    "standard_embed_flow",
+    "special_embed_flow",
+    "message_reference_flow",
+    "special_emoji_flow",
+    "return_to_markdown",
+]
+
+with open(GOLDEN_PATH, "r", encoding="utf-8") as f:
+    CASES: List[Dict[str, Any]] = json.load(f)
+
+
+@pytest.fixture(autouse=True)
+def _no_twemoji(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Unicode Emoji Depend on the Twemoji Index, Not the Parser, so they're Left As-Is
+    monkeypatch.setattr(markdown, "emojify", lambda string, lookups: string)
+
+
+def _render(text: str, flow: str) -> str:
+    # Each Text Numbers its Code Blocks Afresh
+    with RenderContext().activate():
+        if flow == "return_to_markdown":
+            content = ParseMarkdown(text).return_to_markdown(text)
+        else:
+            content = getattr(ParseMarkdown(text, Lookups()), flow)()
+        return ParseMarkdown.reverse_code_block_markdown(content)
+
+
+@pytest.mark.parametrize("case", CASES, ids=[f"case-{i}" for i in range(len(CASES))])
+def test_matches_the_golden_output(case: Dict[str, Any]):
+    rendered = {flow: _render(case["text"], flow) for flow in case["html"]}
+
+    assert rendered == case["html"]
+
+
+@pytest.mark.parametrize("flow", FLOWS)
+def test_restores_every_code_block(flow: str):
+    for case in CASES:
+        assert "{{CODEBLOCK" not in _render(case["text"], flow)